@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+BLIP CPU 추론 백엔드 정확도/속도 비교
+고정 이미지 폴더로 기존 load_blip_model() 결과(fp32)를 기준 삼아 int8 동적 양자화 모델의
+이미지당 추론 시간과 캡션 일치도를 비교한다 (배치 1 / 배치 N 모두 측정).
+
+사용법:
+    python benchmarks/bench_blip_backends.py image_dir --batch-size 8 --threads 0
+    # 기준 캡션 저장 (다음 실행 때 같은 기준과 비교)
+    python benchmarks/bench_blip_backends.py image_dir --save-reference reference.json
+    python benchmarks/bench_blip_backends.py image_dir --reference reference.json
+"""
+
+import os
+import sys
+import json
+import time
+import copy
+import argparse
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blip_service import configure_cpu_threads, quantize_blip_model
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+
+def load_images(image_dir):
+    from PIL import Image
+
+    images = []
+    for name in sorted(os.listdir(image_dir)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            with Image.open(os.path.join(image_dir, name)) as image:
+                images.append((name, image.convert("RGB")))
+    return images
+
+
+def caption_all(torch, processor, model, images, batch_size, max_new_tokens):
+    """이미지 전체 캡션 생성, (캡션 dict, 이미지당 ms) 반환"""
+    captions = {}
+    started = time.perf_counter()
+    with torch.inference_mode():
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            inputs = processor(images=[image for _, image in chunk], return_tensors="pt")
+            output = model.generate(**inputs, max_new_tokens=max_new_tokens)
+            for (name, _), text in zip(chunk, processor.batch_decode(output, skip_special_tokens=True)):
+                captions[name] = text.strip()
+    return captions, (time.perf_counter() - started) * 1000 / len(images)
+
+
+def word_f1(a, b):
+    """캡션 단어 F1 (순서 무관 일치도)"""
+    words_a, words_b = a.lower().split(), b.lower().split()
+    if not words_a or not words_b:
+        return float(words_a == words_b)
+    common = sum(min(words_a.count(w), words_b.count(w)) for w in set(words_a))
+    if not common:
+        return 0.0
+    precision, recall = common / len(words_b), common / len(words_a)
+    return 2 * precision * recall / (precision + recall)
+
+
+def compare(reference, captions):
+    names = list(reference)
+    exact = sum(reference[n] == captions[n] for n in names) / len(names)
+    ratio = sum(SequenceMatcher(None, reference[n], captions[n]).ratio() for n in names) / len(names)
+    f1 = sum(word_f1(reference[n], captions[n]) for n in names) / len(names)
+    return exact, ratio, f1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BLIP fp32 / int8 CPU 추론 정확도·속도 비교")
+    parser.add_argument("image_dir", help="비교용 이미지 폴더 (고정 이미지 세트)")
+    parser.add_argument("--batch-size", type=int, default=8, help="배치 측정 시 배치 크기 (기본 8)")
+    parser.add_argument("--threads", type=int, default=0, help="CPU 스레드 수 (기본 0: 자동)")
+    parser.add_argument("--max-new-tokens", type=int, default=30, help="캡션 최대 토큰 (기본 30)")
+    parser.add_argument("--reference", help="기준 캡션 JSON (없으면 이번 fp32 결과를 기준으로 사용)")
+    parser.add_argument("--save-reference", help="fp32 캡션을 기준 JSON으로 저장")
+    args = parser.parse_args()
+
+    import torch
+    from full_screenshot.full_screenshot_gpu import load_blip_model
+
+    images = load_images(args.image_dir)
+    if not images:
+        print(f"❌ {args.image_dir} 에 이미지가 없습니다")
+        return
+    reference = None
+    if args.reference:
+        with open(args.reference, 'r', encoding='utf-8') as f:
+            names = {name for name, _ in images}
+            reference = {name: text for name, text in json.load(f).items() if name in names}
+        if not reference:
+            print(f"❌ 기준 캡션 {args.reference} 에 {args.image_dir} 의 이미지와 같은 파일 이름이 없습니다")
+            return
+    threads = configure_cpu_threads(torch, args.threads)
+    print(f"📦 이미지 {len(images)}장, CPU 스레드 {threads}개, 배치 {args.batch_size}")
+
+    processor, model = load_blip_model()
+    model = model.to("cpu").eval()
+    backends = [("fp32", model)]
+    started = time.perf_counter()
+    backends.append(("int8", quantize_blip_model(copy.deepcopy(model), torch).eval()))
+    print(f"✅ int8 동적 양자화 완료 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    # 예열 (첫 실행의 메모리 할당/커널 선택 시간 제외)
+    for _, backend_model in backends:
+        caption_all(torch, processor, backend_model, images[:1], 1, 5)
+
+    results = {}
+    for label, backend_model in backends:
+        captions, single_ms = caption_all(torch, processor, backend_model, images, 1, args.max_new_tokens)
+        _, batch_ms = caption_all(torch, processor, backend_model, images, args.batch_size, args.max_new_tokens)
+        results[label] = (captions, single_ms, batch_ms)
+
+    if args.save_reference:
+        with open(args.save_reference, 'w', encoding='utf-8') as f:
+            json.dump(results["fp32"][0], f, ensure_ascii=False, indent=2)
+        print(f"💾 기준 캡션 저장: {args.save_reference}")
+
+    if reference is None:
+        reference = results["fp32"][0]
+
+    baseline_ms = results["fp32"][1]
+    print(f"\n{'백엔드':<8}{'배치1(ms)':>11}{'배치N(ms)':>11}{'배속':>7}{'완전일치':>9}{'유사도':>8}{'단어F1':>8}")
+    for label, (captions, single_ms, batch_ms) in results.items():
+        exact, ratio, f1 = compare(reference, captions)
+        speedup = baseline_ms / single_ms if single_ms else 0.0
+        print(f"{label:<8}{single_ms:>11.1f}{batch_ms:>11.1f}{speedup:>6.1f}x{exact:>9.0%}{ratio:>8.0%}{f1:>8.0%}")
+
+    # 캡션이 달라진 이미지 예시
+    changed = [n for n in reference if results["int8"][0][n] != reference[n]][:5]
+    for name in changed:
+        print(f"   {name}: '{reference[name]}' → '{results['int8'][0][name]}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+HTML 본문 추출 마이크로벤치마크
+저장해 둔 HTML 코퍼스(예: 한국어 뉴스 기사 페이지)로 기존 BeautifulSoup(html.parser) 구현과
+html_extract 백엔드(selectolax/lxml/bs4)의 처리 시간과 추출 결과 일치도를 비교한다.
+
+사용법:
+    # 코퍼스 저장 (URL 목록 파일, 한 줄에 하나)
+    python benchmarks/bench_html_extract.py corpus_dir --save urls.txt
+    # 벤치마크 실행
+    python benchmarks/bench_html_extract.py corpus_dir --repeat 5 --max-length 1000
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import hashlib
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_extract import CONTENT_SELECTORS, available_backends, extract_main_text
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+
+def legacy_extract(html, max_length=1000):
+    """기존 utils.extract_text_from_html 구현 (비교 기준)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
+        element.decompose()
+    content_text = ""
+    for selector in CONTENT_SELECTORS:
+        elements = soup.select(selector)
+        if elements:
+            for element in elements:
+                text = element.get_text(separator=' ', strip=True)
+                if len(text) > len(content_text):
+                    content_text = text
+    if not content_text:
+        content_text = soup.get_text(separator=' ', strip=True)
+    content_text = re.sub(r'\s+', ' ', content_text).strip()
+    if len(content_text) > max_length:
+        content_text = content_text[:max_length] + "..."
+    return content_text
+
+
+def save_corpus(corpus_dir, url_file):
+    """URL 목록의 페이지를 원본 바이트 그대로 저장"""
+    from http_client import get_http_session
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    session = get_http_session()
+    with open(url_file, 'r', encoding='utf-8') as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    for url in urls:
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + ".html"
+        try:
+            response = session.get(url, timeout=10)
+            response.raise_for_status()
+            with open(os.path.join(corpus_dir, name), 'wb') as out:
+                out.write(response.content)
+            print(f"✅ 저장: {url} → {name} ({len(response.content) / 1024:.0f}KB)")
+        except Exception as e:
+            print(f"❌ 저장 실패: {url} ({e})")
+
+
+def load_corpus(corpus_dir):
+    documents = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(corpus_dir, name), 'rb') as f:
+                documents.append((name, f.read()))
+    return documents
+
+
+def run_benchmark(documents, extractors, repeat, max_length):
+    """각 추출기의 문서당 평균 시간(ms)과 추출 결과 반환"""
+    results = {}
+    for label, fn in extractors:
+        outputs = {}
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for name, html in documents:
+                outputs[name] = fn(html, max_length)
+        elapsed = time.perf_counter() - started
+        results[label] = (elapsed * 1000 / (repeat * len(documents)), outputs)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 본문 추출 백엔드 성능 비교")
+    parser.add_argument("corpus_dir", help="HTML 파일이 들어 있는 폴더")
+    parser.add_argument("--save", metavar="URL_FILE", help="URL 목록을 받아 코퍼스 폴더에 저장")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (기본 5)")
+    parser.add_argument("--max-length", type=int, default=1000, help="추출 최대 길이 (기본 1000)")
+    args = parser.parse_args()
+
+    if args.save:
+        save_corpus(args.corpus_dir, args.save)
+        return
+
+    documents = load_corpus(args.corpus_dir)
+    if not documents:
+        print(f"❌ {args.corpus_dir} 에 HTML 파일이 없습니다 (--save 로 먼저 저장)")
+        return
+    total_kb = sum(len(html) for _, html in documents) / 1024
+    print(f"📦 코퍼스: {len(documents)}개 문서, {total_kb:.0f}KB, 반복 {args.repeat}회")
+
+    extractors = []
+    if BeautifulSoup is not None:
+        extractors.append(("legacy(bs4 html.parser)", legacy_extract))
+    for backend in available_backends():
+        extractors.append((backend, lambda html, n, b=backend: extract_main_text(html, n, backend=b)))
+
+    results = run_benchmark(documents, extractors, args.repeat, args.max_length)
+    baseline_label = extractors[0][0]
+    baseline_ms, baseline_outputs = results[baseline_label]
+
+    print(f"\n{'백엔드':<26}{'문서당(ms)':>12}{'배속':>8}{'결과 일치도':>12}")
+    for label, (per_doc_ms, outputs) in results.items():
+        similarity = sum(
+            SequenceMatcher(None, baseline_outputs[name], outputs[name]).ratio() for name, _ in documents
+        ) / len(documents)
+        speedup = baseline_ms / per_doc_ms if per_doc_ms else 0.0
+        print(f"{label:<26}{per_doc_ms:>12.2f}{speedup:>7.1f}x{similarity:>11.0%}")
+
+
+if __name__ == "__main__":
+    main()
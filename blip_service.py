@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+"""
+BLIP 모델 상주 서비스
+- 앱 시작 후 백그라운드 스레드에서 BLIP을 로드하고 더미 이미지로 예열해, 첫 글의 이미지 단계에서
+  모델 로딩을 기다리지 않도록 한다 (프로세스당 1회 로드 후 계속 상주)
+- 모델 호출(generate/forward)은 전용 추론 스레드 하나가 처리하며, 여러 섹션/글 스레드에서 동시에 들어온
+  요청을 모아 한 번의 forward로 실행한다 (동적 배칭: 앞 배치 실행 중 쌓인 요청을 다음 배치로 묶고,
+  다른 호출자가 요청을 넣는 중이거나 다른 세션(session(), 섹션 이미지 매칭 1회 등)이 진행 중일 때만
+  최대 대기 시간까지 기다림 → 호출자가 하나면 추가 지연 없음)
+- GPU가 없으면 CPU 코어 수에 맞춰 torch 스레드 수를 자동 설정
+- CPU 추론 백엔드 선택: "fp32"(원본) 또는 "int8"(Linear 층 동적 양자화, 정확도/속도 비교는
+  benchmarks/bench_blip_backends.py)
+- 기존 download_top_bing_images_grid_match(processor, model)에는 배칭 프록시 모델을 그대로 넘겨 사용
+  (processor는 매칭 함수가 디코딩한 이미지를 보관하는 프록시로 감싸 이미지 이력 지문 계산에 재사용)
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+DEFAULT_MAX_BATCH_SIZE = 8      # 한 번의 forward에 묶을 최대 이미지 수
+DEFAULT_MAX_WAIT_MS = 20        # 다른 호출자의 요청이 큐에 들어오는 중일 때 기다리는 최대 시간
+WARMUP_IMAGE_SIZE = 384
+CPU_BACKENDS = ("fp32", "int8")
+
+
+def auto_cpu_threads():
+    """
+    CPU 추론용 torch intra-op 스레드 수
+    물리 코어 수(psutil이 있으면 정확히, 없으면 사용 가능한 논리 코어의 절반) 기준
+    """
+    try:
+        import psutil
+        physical = psutil.cpu_count(logical=False)
+        if physical:
+            return max(1, physical)
+    except ImportError:
+        pass
+    try:
+        logical = len(os.sched_getaffinity(0))
+    except AttributeError:
+        logical = os.cpu_count() or 1
+    return max(1, logical // 2 if logical >= 4 else logical)
+
+
+def configure_cpu_threads(torch, num_threads=None):
+    """torch CPU 스레드 설정 (num_threads가 0/None이면 자동), 적용된 스레드 수 반환"""
+    threads = int(num_threads) if num_threads else auto_cpu_threads()
+    torch.set_num_threads(threads)
+    try:
+        # inter-op 스레드는 첫 병렬 작업 전에만 바꿀 수 있음
+        torch.set_num_interop_threads(1 if threads <= 2 else 2)
+    except RuntimeError:
+        pass
+    return threads
+
+
+def quantize_blip_model(model, torch):
+    """
+    BLIP 모델의 Linear 층을 int8 동적 양자화 (CPU 전용, 가중치는 int8 / 활성값은 실행 시 양자화)
+    비전 인코더·텍스트 디코더 연산 대부분이 Linear라 CPU 추론 시간이 크게 줄고 메모리도 약 1/4로 감소
+
+    Returns:
+        양자화된 모델 (원본 모델은 변경하지 않음)
+    """
+    quantization = getattr(torch, "ao", torch).quantization
+    return quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _batch_size(inputs, torch):
+    """요청 입력의 배치 크기 (첫 번째 텐서의 0번 차원)"""
+    for value in inputs.values():
+        if isinstance(value, torch.Tensor) and value.dim() > 0:
+            return int(value.shape[0])
+    return None
+
+
+def _batch_key(method, inputs, torch):
+    """같은 키의 요청끼리만 묶음 (생성 옵션과 텐서의 배치 외 차원이 같아야 이어붙일 수 있음)"""
+    key = [method]
+    for name in sorted(inputs):
+        value = inputs[name]
+        if isinstance(value, torch.Tensor):
+            key.append((name, str(value.dtype), str(value.device), tuple(value.shape[1:])))
+        else:
+            key.append((name, repr(value)))
+    return tuple(key)
+
+
+def _split_output(output, sizes, total, torch):
+    """배치 출력을 요청별로 분리 (텐서/ModelOutput/튜플/리스트 재귀 처리, 배치 차원이 아닌 값은 공유)"""
+    if isinstance(output, torch.Tensor):
+        if output.dim() > 0 and output.shape[0] == total:
+            return list(torch.split(output, sizes, dim=0))
+        return [output] * len(sizes)
+    if hasattr(output, "keys") and hasattr(output, "__getitem__"):
+        parts = {key: _split_output(output[key], sizes, total, torch) for key in output.keys()}
+        return [type(output)(**{key: parts[key][i] for key in parts}) for i in range(len(sizes))]
+    if isinstance(output, (tuple, list)):
+        parts = [_split_output(item, sizes, total, torch) for item in output]
+        return [type(output)(part[i] for part in parts) for i in range(len(sizes))]
+    return [output] * len(sizes)
+
+
+class _InferenceRequest:
+    def __init__(self, method, args, inputs, key, size):
+        self.method = method
+        self.args = args
+        self.inputs = inputs
+        self.key = key
+        self.size = size
+        self.future = Future()
+
+
+class BatchedBlipModel:
+    """
+    BLIP 모델 프록시
+    generate()/호출(forward)은 서비스의 동적 배칭 큐를 거치고, 나머지 속성(device, config 등)은 원본 모델을 그대로 사용
+    """
+
+    def __init__(self, service, model):
+        self._service = service
+        self._model = model
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def generate(self, *args, **kwargs):
+        return self._service.submit("generate", args, kwargs)
+
+    def __call__(self, *args, **kwargs):
+        return self._service.submit("forward", args, kwargs)
+
+
+class ImageCapturingProcessor:
+    """
+    BLIP processor 프록시
+    호출 때 넘어온 이미지(PIL)를 순서대로 images에 보관 (매칭 함수가 이미 디코딩한 이미지를 다시 받지 않고 재사용)
+    """
+
+    def __init__(self, processor):
+        self._processor = processor
+        self.images = []
+
+    def __getattr__(self, name):
+        return getattr(self._processor, name)
+
+    def __call__(self, *args, **kwargs):
+        images = kwargs.get("images", args[0] if args else None)
+        if images is not None:
+            self.images.extend(images if isinstance(images, (list, tuple)) else [images])
+        return self._processor(*args, **kwargs)
+
+
+class BlipService:
+    """BLIP 모델 상주/동적 배칭 추론 서비스"""
+
+    def __init__(self, loader=None, use_gpu=True, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, cpu_threads=None, cpu_backend="fp32"):
+        self._loader = loader
+        self.use_gpu = bool(use_gpu)
+        self.cpu_backend = cpu_backend if cpu_backend in CPU_BACKENDS else "fp32"
+        self.backend = None
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms) / 1000.0)
+        self.cpu_threads = cpu_threads
+        self.device = None
+        self.processor = None
+        self.model = None
+        self.load_error = None
+        self.load_ms = None
+        self._torch = None
+        self._queue = queue.Queue()
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._incoming = 0             # 큐에 넣었거나 넣는 중이지만 아직 추론 스레드가 꺼내지 않은 요청 수
+        self._sessions = 0             # 진행 중인 session() 수 (추론을 여러 번 요청하는 작업)
+        self._incoming_lock = threading.Lock()
+        self.request_count = 0
+        self.batch_count = 0
+        self.batched_items = 0
+
+    def start(self):
+        """백그라운드에서 모델 로드/예열 후 추론 스레드 시작 (이미 시작했으면 무시, 즉시 반환)"""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="blip-service", daemon=True)
+                self._thread.start()
+        return self
+
+    @property
+    def ready(self):
+        return self._ready.is_set() and self.model is not None
+
+    def get_model(self, timeout=None):
+        """
+        (processor, 배칭 프록시 모델) 반환 (로드 중이면 완료까지 대기)
+
+        Raises:
+            RuntimeError: 모델 로드 실패 또는 대기 시간 초과
+        """
+        self.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("BLIP 모델 로딩 대기 시간 초과")
+        if self.model is None:
+            raise RuntimeError(f"BLIP 모델 로드 실패: {self.load_error}")
+        return self.processor, BatchedBlipModel(self, self.model)
+
+    def submit(self, method, args, kwargs):
+        """추론 요청을 큐에 넣고 결과를 기다림 (같은 시점의 다른 요청과 한 배치로 실행될 수 있음)"""
+        if not self.ready:
+            self.get_model()
+        torch = self._torch
+        size = None if args or kwargs.get("return_dict_in_generate") else _batch_size(kwargs, torch)
+        # 위치 인자/딕셔너리 출력 요청은 묶지 않고 단독 실행
+        key = _batch_key(method, kwargs, torch) if size else object()
+        request = _InferenceRequest(method, args, kwargs, key, size)
+        with self._incoming_lock:
+            self._incoming += 1
+        self._queue.put(request)
+        return request.future.result()
+
+    @contextmanager
+    def session(self):
+        """
+        추론을 여러 번 요청하는 작업 구간 (섹션 이미지 매칭 1회 등)
+        다른 세션이 진행 중이면 추론 스레드가 그 세션의 다음 요청을 최대 대기 시간까지 기다려 한 배치로 묶는다
+        """
+        with self._incoming_lock:
+            self._sessions += 1
+        try:
+            yield self
+        finally:
+            with self._incoming_lock:
+                self._sessions -= 1
+
+    def caption_images(self, images, max_new_tokens=30):
+        """이미지(PIL) 목록 캡션 생성 (다른 스레드 요청과 함께 배칭)"""
+        processor, model = self.get_model()
+        inputs = processor(images=list(images), return_tensors="pt").to(self.device)
+        output = model.generate(**inputs, max_new_tokens=max_new_tokens)
+        return [text.strip() for text in processor.batch_decode(output, skip_special_tokens=True)]
+
+    def stats(self):
+        return {
+            "ready": self.ready,
+            "device": self.device,
+            "backend": self.backend,
+            "load_ms": self.load_ms,
+            "requests": self.request_count,
+            "batches": self.batch_count,
+            "avg_batch_size": self.batched_items / self.batch_count if self.batch_count else 0.0,
+        }
+
+    def close(self):
+        self._closed = True
+        self._queue.put(None)
+
+    # ----- 추론 스레드 -----
+
+    def _run(self):
+        self._load()
+        if self.model is None:
+            # 로드 실패: 대기 중인 요청에 오류 전달
+            while True:
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                if request is not None:
+                    request.future.set_exception(RuntimeError(f"BLIP 모델 로드 실패: {self.load_error}"))
+        while not self._closed:
+            request = self._take(self._queue.get())
+            if request is None:
+                break
+            batch = [request]
+            items = request.size or 0
+            deadline = time.monotonic() + self.max_wait
+            while request.size and items < self.max_batch_size:
+                try:
+                    # 이미 큐에 있는 요청은 바로 가져옴
+                    extra = self._take(self._queue.get_nowait())
+                except queue.Empty:
+                    # 다른 호출자가 요청을 넣는 중이거나 배치에 아직 없는 세션이 진행 중일 때만 기다림
+                    # (호출자 1개면 지연 없음)
+                    with self._incoming_lock:
+                        others_incoming = self._incoming > 0 or self._sessions > len(batch)
+                    remaining = deadline - time.monotonic()
+                    if not others_incoming or remaining <= 0:
+                        break
+                    try:
+                        extra = self._take(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                if extra is None:
+                    self._closed = True
+                    break
+                batch.append(extra)
+                items += extra.size or 0
+            # 같은 키끼리 묶어서 실행 (도착 순서 유지)
+            groups = {}
+            for item in batch:
+                groups.setdefault(item.key, []).append(item)
+            for group in groups.values():
+                self._execute(group)
+
+    def _take(self, request):
+        """큐에서 꺼낸 요청을 대기 수에서 제외"""
+        if request is not None:
+            with self._incoming_lock:
+                self._incoming -= 1
+        return request
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            import torch
+            self._torch = torch
+            loader = self._loader
+            if loader is None:
+                from full_screenshot.full_screenshot_gpu import load_blip_model as loader
+            print("📦 BLIP 모델 백그라운드 로딩 중...")
+            processor, model = loader()
+            if self.use_gpu and torch.cuda.is_available():
+                try:
+                    os.environ.setdefault("CUDA_DEVICE_ORDER", "PCI_BUS_ID")
+                    model = model.to("cuda")
+                    self.device = "cuda"
+                except Exception as move_e:
+                    print(f"⚠️ BLIP CUDA 이동 실패, CPU 사용: {move_e}")
+            self.backend = "fp32"
+            if self.device is None:
+                self.device = "cpu"
+                threads = configure_cpu_threads(torch, self.cpu_threads)
+                print(f"🧵 BLIP CPU 추론 스레드: {threads}개")
+                model.eval()
+                if self.cpu_backend == "int8":
+                    try:
+                        model = quantize_blip_model(model, torch)
+                        self.backend = "int8"
+                        print("✅ BLIP int8 동적 양자화 적용")
+                    except Exception as quant_e:
+                        print(f"⚠️ BLIP int8 양자화 실패, fp32 사용: {quant_e}")
+            model.eval()
+            self.processor, self.model = processor, model
+            self._warm_up()
+            self.load_ms = (time.perf_counter() - started) * 1000
+            print(f"✅ BLIP 모델 상주 준비 완료 ({self.device}/{self.backend}, {self.load_ms:.0f}ms)")
+        except Exception as e:
+            self.load_error = e
+            self.model = None
+            print(f"❌ BLIP 모델 로드 실패: {e}")
+        finally:
+            self._ready.set()
+
+    def _warm_up(self):
+        """더미 이미지로 1회 추론해 커널/메모리 할당을 미리 끝냄 (실패해도 서비스는 사용 가능)"""
+        try:
+            from PIL import Image
+            image = Image.new("RGB", (WARMUP_IMAGE_SIZE, WARMUP_IMAGE_SIZE), (127, 127, 127))
+            inputs = self.processor(images=image, return_tensors="pt").to(self.device)
+            with self._torch.inference_mode():
+                self.model.generate(**inputs, max_new_tokens=5)
+        except Exception as e:
+            print(f"⚠️ BLIP 예열 생략: {e}")
+
+    def _execute(self, group):
+        torch = self._torch
+        target = self.model.generate if group[0].method == "generate" else self.model
+        self.request_count += len(group)
+        self.batch_count += 1
+        self.batched_items += sum(item.size or 1 for item in group)
+        try:
+            with torch.inference_mode():
+                if len(group) == 1:
+                    group[0].future.set_result(target(*group[0].args, **group[0].inputs))
+                    return
+                inputs = {}
+                for name, value in group[0].inputs.items():
+                    if isinstance(value, torch.Tensor) and value.dim() > 0:
+                        inputs[name] = torch.cat([item.inputs[name] for item in group], dim=0)
+                    else:
+                        inputs[name] = value
+                sizes = [item.size for item in group]
+                output = target(**inputs)
+            for item, part in zip(group, _split_output(output, sizes, sum(sizes), torch)):
+                item.future.set_result(part)
+        except Exception as e:
+            for item in group:
+                if not item.future.done():
+                    item.future.set_exception(e)
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_blip_service(use_gpu=True, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                     cpu_threads=None, cpu_backend="fp32"):
+    """
+    프로세스 공용 BLIP 서비스 (처음 호출한 설정으로 생성, 로드는 start()/get_model() 시점에 시작)
+
+    Returns:
+        BlipService: 서비스
+    """
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = BlipService(
+                use_gpu=use_gpu,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+                cpu_threads=cpu_threads,
+                cpu_backend=cpu_backend,
+            )
+        return _shared_service
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+헤드리스 배치 실행기 (PyQt5 없이 BlogGeneratorGPTStyle 구동)
+서버/컨테이너에서 GUI 없이 글을 생성하고 결과를 JSONL로 한 줄씩 내보낸다.
+BlogGeneratorGPTStyle(openai 등)은 첫 작업을 처리할 때 불러오므로 실행 자체는 바로 시작된다.
+
+사용법:
+    # 키워드 직접 지정 / 키워드 파일(한 줄에 하나) / JSONL 작업 파일
+    python -m blog_html_generator.batch_runner run --keywords "키워드1" "키워드2" --concurrency 2
+    python -m blog_html_generator.batch_runner run --keywords-file keywords.txt --output results.jsonl
+    python -m blog_html_generator.batch_runner run --jobs jobs.jsonl
+
+    # 로컬 HTTP/JSON 엔드포인트
+    python -m blog_html_generator.batch_runner serve --port 8765 --concurrency 2
+    curl -X POST localhost:8765/generate -d '{"keyword": "키워드1"}'
+    curl -X POST localhost:8765/generate -d '{"jobs": [{"keyword": "키워드1"}, {"keyword": "키워드2"}]}'
+
+작업 형식 (JSONL 한 줄 / HTTP 요청 본문):
+    {"id": "선택", "keyword": "주제", "product_url": "선택", "coupang_product": {...선택}}
+결과 형식 (완료되는 순서대로 한 줄씩):
+    {"id", "keyword", "ok", "title", "content", "category", "error", "elapsed_sec"}
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_package_dir = os.path.dirname(os.path.abspath(__file__))
+_parent_dir = os.path.dirname(_package_dir)
+for _path in (_parent_dir, _package_dir):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+DEFAULT_CONFIG_PATH = os.path.join(_parent_dir, "gpt_blog_config.json")
+DEFAULT_PORT = 8765
+
+
+def load_config(path=None):
+    """GUI와 같은 설정 파일(gpt_blog_config.json) 로드 (없으면 빈 설정)"""
+    path = path or DEFAULT_CONFIG_PATH
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ 설정 로드 실패 (기본값 사용): {e}", file=sys.stderr)
+        return {}
+
+
+def normalize_job(job, index):
+    """문자열/딕셔너리 작업을 공통 형식으로 변환"""
+    if isinstance(job, str):
+        job = {"keyword": job}
+    keyword = (job.get("keyword") or "").strip()
+    if not keyword:
+        raise ValueError(f"{index}번째 작업에 keyword가 없습니다")
+    return {
+        "id": job.get("id", str(index)),
+        "keyword": keyword,
+        "product_url": job.get("product_url"),
+        "coupang_product": job.get("coupang_product"),
+    }
+
+
+def read_jobs(keywords=None, keywords_file=None, jobs_file=None):
+    """명령줄 키워드 / 키워드 파일 / JSONL 작업 파일에서 작업 목록 생성"""
+    raw_jobs = list(keywords or [])
+    if keywords_file:
+        with open(keywords_file, 'r', encoding='utf-8') as f:
+            raw_jobs.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    if jobs_file:
+        with open(jobs_file, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    raw_jobs.append(json.loads(line))
+                except ValueError as e:
+                    raise ValueError(f"{jobs_file}:{line_no} JSON 형식 오류: {e}")
+    return [normalize_job(job, i) for i, job in enumerate(raw_jobs, 1)]
+
+
+class BatchRunner:
+    """
+    작업 목록을 동시에 처리하는 실행기
+    BlogGeneratorGPTStyle은 글 단위 상태(수집 데이터, 문단 인덱스 등)를 인스턴스에 두므로
+    작업 스레드마다 생성기를 하나씩 만들어 재사용한다.
+    """
+
+    def __init__(self, config=None, concurrency=1):
+        self.config = dict(config or {})
+        self.concurrency = max(1, int(concurrency))
+        self._local = threading.local()
+        self._import_lock = threading.Lock()
+        self._generator_class = None
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch-post")
+
+    def _get_generator(self):
+        generator = getattr(self._local, "generator", None)
+        if generator is None:
+            with self._import_lock:
+                if self._generator_class is None:
+                    started = time.monotonic()
+                    from blog_generator_gpt_style import BlogGeneratorGPTStyle
+                    self._generator_class = BlogGeneratorGPTStyle
+                    print(f"📦 생성기 로드 완료 ({(time.monotonic() - started) * 1000:.0f}ms)", file=sys.stderr)
+            config = {"chat_model": "gpt-4o-mini", "image_source": "bing"}
+            config.update(self.config)
+            generator = self._generator_class(config)
+            self._local.generator = generator
+        return generator
+
+    def run_job(self, job):
+        """작업 1개 실행 후 결과 dict 반환 (예외도 결과로 기록)"""
+        started = time.monotonic()
+        result = {"id": job["id"], "keyword": job["keyword"], "ok": False,
+                  "title": None, "content": None, "category": None, "error": None}
+        try:
+            generated = self._get_generator().generate_blog_post(
+                job["keyword"], product_url=job.get("product_url"), coupang_product=job.get("coupang_product")
+            )
+            if generated:
+                result["title"], result["content"], result["category"] = generated
+                result["ok"] = True
+            else:
+                result["error"] = "생성 실패"
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["elapsed_sec"] = round(time.monotonic() - started, 2)
+        return result
+
+    def iter_results(self, jobs):
+        """작업을 동시에 실행하며 끝나는 순서대로 결과 반환"""
+        futures = [self._executor.submit(self.run_job, job) for job in jobs]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def write_jsonl(stream, record):
+    stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+    stream.flush()
+
+
+# ----------------------------------------------------------------------
+# run: 명령줄 배치
+# ----------------------------------------------------------------------
+def run_batch(args):
+    try:
+        jobs = read_jobs(args.keywords, args.keywords_file, args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"❌ 작업 목록 읽기 실패: {e}", file=sys.stderr)
+        return 2
+    if not jobs:
+        print("❌ 실행할 작업이 없습니다 (--keywords / --keywords-file / --jobs)", file=sys.stderr)
+        return 2
+
+    # 생성기 로그(print)가 결과 JSONL과 섞이지 않도록 stdout은 stderr로 돌리고 결과만 원래 stdout에 씀
+    output = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    real_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    runner = BatchRunner(load_config(args.config), args.concurrency)
+    failed = 0
+    try:
+        print(f"🚀 배치 시작: {len(jobs)}개 작업, 동시 {runner.concurrency}개", file=sys.stderr)
+        for result in runner.iter_results(jobs):
+            failed += 0 if result["ok"] else 1
+            write_jsonl(output, result)
+            print(f"{'✅' if result['ok'] else '❌'} [{result['id']}] {result['keyword']} ({result['elapsed_sec']}초)",
+                  file=sys.stderr)
+    except KeyboardInterrupt:
+        print("⏹️ 중지 요청 - 남은 작업 취소", file=sys.stderr)
+        return 130
+    finally:
+        runner.close()
+        sys.stdout = real_stdout
+        if output is not sys.stdout and output is not real_stdout:
+            output.close()
+    print(f"🏁 배치 완료: 성공 {len(jobs) - failed} / 실패 {failed}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+# ----------------------------------------------------------------------
+# serve: 로컬 HTTP/JSON 엔드포인트
+# ----------------------------------------------------------------------
+class _BatchRequestHandler(BaseHTTPRequestHandler):
+    runner = None
+    protocol_version = "HTTP/1.0"   # 응답 본문을 스트리밍한 뒤 연결 종료로 끝을 알림
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == "/health":
+            self._send_json(200, {"ok": True, "concurrency": self.runner.concurrency})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != "/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length).decode('utf-8') or "{}")
+            raw_jobs = payload.get("jobs") if isinstance(payload, dict) and "jobs" in payload else [payload]
+            jobs = [normalize_job(job, i) for i, job in enumerate(raw_jobs, 1)]
+        except (ValueError, AttributeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.end_headers()
+        try:
+            for result in self.runner.iter_results(jobs):
+                self.wfile.write((json.dumps(result, ensure_ascii=False) + "\n").encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            print("⚠️ 클라이언트 연결 종료 - 남은 작업 취소", file=sys.stderr)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}", file=sys.stderr)
+
+
+def serve(args):
+    runner = BatchRunner(load_config(args.config), args.concurrency)
+    handler = type("BatchRequestHandler", (_BatchRequestHandler,), {"runner": runner})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"🌐 배치 서버 시작: http://{args.host}:{args.port} (POST /generate, GET /health, 동시 {runner.concurrency}개)",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("⏹️ 배치 서버 종료", file=sys.stderr)
+    finally:
+        server.server_close()
+        runner.close()
+    return 0
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", help=f"설정 파일 경로 (기본: {DEFAULT_CONFIG_PATH})")
+    common.add_argument("--concurrency", type=int, default=1, help="동시에 생성할 글 수 (기본 1)")
+
+    parser = argparse.ArgumentParser(description="BlogGeneratorGPTStyle 헤드리스 배치 실행기 (PyQt5 불필요)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", parents=[common], help="키워드/작업 파일 배치 실행 (결과 JSONL 출력)")
+    run_parser.add_argument("--keywords", nargs="+", help="키워드 목록")
+    run_parser.add_argument("--keywords-file", help="키워드 파일 (한 줄에 하나)")
+    run_parser.add_argument("--jobs", help="JSONL 작업 파일")
+    run_parser.add_argument("--output", help="결과 JSONL 파일 (기본: 표준 출력, 기존 파일에는 이어서 씀)")
+    run_parser.set_defaults(handler=run_batch)
+
+    serve_parser = subparsers.add_parser("serve", parents=[common], help="로컬 HTTP/JSON 엔드포인트 실행")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본 {DEFAULT_PORT})")
+    serve_parser.set_defaults(handler=serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,6 +27,42 @@ if not api_key:
         pass
 client = OpenAI(api_key=api_key) if api_key else None
 
+# 프로젝트 루트 공용 모듈 (section_scheduler, llm_cache 등) import 경로
+_parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent_dir not in sys.path:
+    sys.path.insert(0, _parent_dir)
+
+try:
+    from llm_cache import get_llm_cache
+except ImportError:
+    get_llm_cache = None
+    print("⚠️ llm_cache 모듈 로드 실패 - LLM 캐시 없이 실행")
+
+try:
+    from llm_capabilities import get_capability_registry
+except ImportError:
+    get_capability_registry = None
+    print("⚠️ llm_capabilities 모듈 로드 실패 - 모델 호환성 기록 없이 실행")
+
+try:
+    from llm_gateway import get_llm_gateway
+except ImportError:
+    get_llm_gateway = None
+    print("⚠️ llm_gateway 모듈 로드 실패 - 동기 OpenAI 클라이언트 사용")
+
+try:
+    from text_dedup import dedupe_text_blocks
+except ImportError:
+    dedupe_text_blocks = None
+    print("⚠️ text_dedup 모듈 로드 실패 - 유사 중복 문단 제거 없이 실행")
+
+try:
+    from passage_index import PassageIndex, pack_context
+except ImportError:
+    PassageIndex = None
+    pack_context = None
+    print("⚠️ passage_index 모듈 로드 실패 - 수집 데이터 앞부분만 사용")
+
 
 class BlogGeneratorGPTStyle:
     """gpt_chat_interface.py와 완전히 동일한 블로그 생성 방식"""
@@ -39,10 +75,53 @@ class BlogGeneratorGPTStyle:
         }
         self.collected_web_data = ""
         self.collected_urls = []
+        self.post_passage_index = None
         self._current_coupang_product = None
     
-    def call_chat_with_fallback(self, messages, primary_model="gpt-4o-mini", temperature=0.3, max_tokens=500):
-        """모델/파라미터 호환성 처리"""
+    def _llm_cache_for(self, cacheable):
+        """캐시 대상 호출이면 공용 LLM 캐시를 반환 (설정값 반영), 아니면 None
+        - cacheable: 호출부에서 명시적으로 허용한 호출만 캐시 (검색어/카테고리/이미지 검색어처럼
+          결과가 짧고 입력이 같으면 같아도 되는 호출). 섹션 본문 등 창의적 생성은 매번 호출
+        - llm_cache_enabled: 캐시 사용 여부
+        """
+        if get_llm_cache is None or not self.config.get("llm_cache_enabled", True):
+            return None
+        if not cacheable:
+            return None
+        try:
+            return get_llm_cache(
+                ttl_hours=self.config.get("llm_cache_ttl_hours", 72),
+                max_entries=self.config.get("llm_cache_max_entries", 5000),
+            )
+        except Exception as e:
+            print(f"⚠️ LLM 캐시 사용 불가: {e}")
+            return None
+
+    def _create_chat_completion(self, **params):
+        """chat.completions 호출 창구: 공용 LLM 게이트웨이(연결 풀/동시 요청 제한/RPM·TPM 제한) 우선,
+        사용할 수 없으면 기존 동기 client 사용"""
+        gateway = None
+        if get_llm_gateway is not None:
+            gateway = get_llm_gateway(
+                api_key,
+                max_in_flight=self.config.get("llm_max_in_flight", 8),
+                rpm_limit=self.config.get("llm_rpm_limit", 500),
+                tpm_limit=self.config.get("llm_tpm_limit", 200000),
+                max_retries=self.config.get("llm_max_retries", 5),
+            )
+        if gateway is not None:
+            return gateway.create(**params)
+        return client.chat.completions.create(**params)
+
+    def call_chat_with_fallback(self, messages, primary_model="gpt-4o-mini", temperature=0.3, max_tokens=500,
+                                cacheable=False, cache_validator=None):
+        """모델/파라미터 호환성 처리 (cacheable=True 호출만 LLM 디스크 캐시에서 먼저 조회)"""
+        cache = self._llm_cache_for(cacheable)
+        if cache is not None:
+            cached = cache.get(primary_model, messages, temperature, max_tokens)
+            if cached is not None:
+                print(f"📦 LLM 캐시 적중 ({primary_model})")
+                return cached
         model_candidates = [primary_model]
         token_param_candidates = [None, "max_tokens", "max_completion_tokens"]
         temperature_modes = [
@@ -50,9 +129,17 @@ class BlogGeneratorGPTStyle:
             ("one", 1),
             ("omit", None),
         ]
+        registry = get_capability_registry() if get_capability_registry else None
         for model_name in model_candidates:
-            for token_param in token_param_candidates:
-                for temp_mode, temp_value in temperature_modes:
+            # 이전에 성공한 토큰 파라미터/temperature 조합을 먼저 시도
+            if registry is not None:
+                model_token_params, model_temperature_modes = registry.order_candidates(
+                    model_name, token_param_candidates, temperature_modes
+                )
+            else:
+                model_token_params, model_temperature_modes = token_param_candidates, temperature_modes
+            for token_param in model_token_params:
+                for temp_mode, temp_value in model_temperature_modes:
                     try:
                         params = {
                             "model": model_name,
@@ -62,7 +149,16 @@ class BlogGeneratorGPTStyle:
                             params["temperature"] = temp_value
                         if token_param is not None and max_tokens is not None:
                             params[token_param] = max_tokens
-                        return client.chat.completions.create(**params)
+                        response = self._create_chat_completion(**params)
+                        if registry is not None:
+                            registry.record(model_name, token_param, temp_mode, temperature)
+                        if cache is not None:
+                            # 빈 응답/형식이 맞지 않는 응답은 저장하지 않음 (cache_validator: 응답 텍스트 검증 함수)
+                            content = (response.choices[0].message.content or "").strip()
+                            if content and (cache_validator is None or cache_validator(content)):
+                                cache.put(primary_model, messages, temperature, max_tokens,
+                                          response.choices[0].message.content)
+                        return response
                     except Exception as e:
                         err = str(e)
                         if (
@@ -87,7 +183,8 @@ class BlogGeneratorGPTStyle:
         raise Exception("사용 가능한 모델이 없습니다. 허용 모델 및 권한을 확인하세요.")
     
     def gpt(self, user_content: str, system_content: str = None, temperature: float = 0.3,
-            max_tokens: int = 500, primary_model: str = None) -> str:
+            max_tokens: int = 500, primary_model: str = None, cacheable: bool = False,
+            cache_validator=None) -> str:
         """단일 GPT 호출 함수: system/user를 받아 텍스트 응답(content)만 반환"""
         messages = []
         if system_content:
@@ -100,6 +197,8 @@ class BlogGeneratorGPTStyle:
             primary_model=primary_model,
             temperature=temperature,
             max_tokens=max_tokens,
+            cacheable=cacheable,
+            cache_validator=cache_validator,
         )
         return (resp.choices[0].message.content or "").strip()
     
@@ -377,7 +476,9 @@ class BlogGeneratorGPTStyle:
                 ],
                 primary_model=self.config.get("chat_model", "gpt-4o-mini"),
                 temperature=0.3,
-                max_tokens=50
+                max_tokens=50,
+                cacheable=True,
+                cache_validator=lambda text: len(re.sub(r'[^\w가-힣]', '', text)) >= 2,
             )
             
             generated_keywords = response.choices[0].message.content.strip()
@@ -403,11 +504,45 @@ class BlogGeneratorGPTStyle:
             fallback_keywords = ' '.join(fallback_keywords.split()[:3])
             return fallback_keywords
     
-    def organize_collected_data_with_gpt(self, keyword, collected_data):
-        """수집된 데이터를 GPT로 정리하는 함수"""
+    def dedupe_collected_data(self, collected_data):
+        """수집 데이터에서 유사 중복 문단 제거 (실패 시 원본 그대로)"""
+        if dedupe_text_blocks is None:
+            return collected_data
+        try:
+            deduped, removed = dedupe_text_blocks(collected_data)
+            if removed:
+                print(f"🧹 유사 중복 문단 {removed}개 제거: {len(collected_data)}자 → {len(deduped)}자")
+            return deduped
+        except Exception as e:
+            print(f"⚠️ 중복 문단 제거 실패 (원본 사용): {e}")
+            return collected_data
+    
+    def pack_collected_data(self, keyword, collected_data, queries=None):
+        """수집 데이터를 키워드/추가 질의와 관련 있는 문단 위주로 토큰 예산에 맞게 압축 (실패 시 앞에서부터 8000자)"""
+        if pack_context is None:
+            return collected_data[:8000]
+        try:
+            token_budget = self.config.get("organize_context_token_budget", 4000)
+            # 사용자 키워드를 가장 중요하게, 검색어/섹션 제목은 보조 질의로 사용
+            weighted_queries = [(keyword, 2.0)] + [(q, 1.0) for q in (queries or []) if q]
+            packed, stats = pack_context(collected_data, weighted_queries, token_budget=token_budget)
+            message = (f"📦 컨텍스트 압축: {stats['original_tokens']}토큰 → {stats['packed_tokens']}토큰 "
+                       f"({stats['ratio']:.0%}, 문단 {stats['selected']}/{stats['passages']}개, 관련 {stats['relevant']}개)")
+            print(message)
+            return packed
+        except Exception as e:
+            print(f"⚠️ 컨텍스트 압축 실패 (앞부분 사용): {e}")
+            return collected_data[:8000]
+
+    def organize_collected_data_with_gpt(self, keyword, collected_data, queries=None):
+        """수집된 데이터를 GPT로 정리하는 함수 (queries: 관련 문단 선별에 함께 쓸 검색어/섹션 제목)"""
         try:
             print(f"🤖 수집된 데이터 정리 중: {len(collected_data)}자")
             
+            # 여러 출처에 반복된 거의 같은 문단 제거 (같은 글자 수 안에 더 많은 정보가 들어가도록)
+            collected_data = self.dedupe_collected_data(collected_data)
+            packed_data = self.pack_collected_data(keyword, collected_data, queries)
+            
             prompt = f"""
 다음은 웹에서 수집된 원본 데이터입니다. 이 데이터를 사용자 요청 사항 중심으로 정리해주세요.
 
@@ -421,7 +556,7 @@ class BlogGeneratorGPTStyle:
 - 문단별로 구분하여 정리
 
 📄 **수집된 원본 데이터**:
-{collected_data[:8000]}
+{packed_data}
 
 정리된 데이터만 출력해주세요 (설명 없이):
 """
@@ -444,6 +579,33 @@ class BlogGeneratorGPTStyle:
             print(f"❌ 데이터 정리 실패: {e}")
             return collected_data[:2000] if len(collected_data) > 2000 else collected_data
     
+    def build_post_passage_index(self, organized_data, collected_data):
+        """글 1개 분량의 섹션 검색용 문단 인덱스 생성 (정리된 데이터 + 수집 원문, 실패 시 None)"""
+        if PassageIndex is None or (not organized_data and not collected_data):
+            return None
+        try:
+            index = PassageIndex.from_text(f"{organized_data or ''}\n\n{collected_data or ''}")
+            print(f"📚 섹션 검색용 문단 인덱스 생성: {len(index)}개 문단")
+            return index if len(index) else None
+        except Exception as e:
+            print(f"⚠️ 문단 인덱스 생성 실패 (정리된 데이터만 사용): {e}")
+            return None
+    
+    def retrieve_section_passages(self, section_title, keyword):
+        """섹션 제목(가중치 2)과 키워드로 상위 문단 검색 (section_context_top_k개, section_context_token_budget 토큰 이내)"""
+        index = getattr(self, 'post_passage_index', None)
+        if index is None:
+            return []
+        try:
+            return index.select_texts(
+                [(section_title, 2.0), (keyword, 1.0)],
+                token_budget=self.config.get("section_context_token_budget", 120),
+                top_k=self.config.get("section_context_top_k", 2),
+            )
+        except Exception as e:
+            print(f"⚠️ 섹션 문단 검색 실패: {e}")
+            return []
+    
     def collect_web_data_for_section(self, section_title, keyword, clean_trimmed_text):
         """섹션별 데이터 제공 (이미 정리된 데이터 사용)"""
         try:
@@ -451,6 +613,19 @@ class BlogGeneratorGPTStyle:
             
             organized_data = getattr(self, 'collected_web_data', '')
             
+            # 섹션 제목과 관련된 문단을 글 단위 인덱스에서 검색 (섹션별 토큰 예산 이내)
+            passages = self.retrieve_section_passages(section_title, keyword)
+            if passages:
+                result = {
+                    "search_keywords": keyword,
+                    "web_contents": passages,
+                    "budgeted": True,
+                    "urls": getattr(self, 'collected_urls', [f"https://www.bing.com/search?q={keyword}"]),
+                    "titles": [f"{section_title} 관련 정보"]
+                }
+                print(f"✅ 섹션 데이터 준비 완료: 관련 문단 {len(passages)}개 ({sum(len(p) for p in passages)}자)")
+                return result
+            
             if organized_data:
                 result = {
                     "search_keywords": keyword,
@@ -504,9 +679,14 @@ class BlogGeneratorGPTStyle:
         web_data_section = ""
         if collected_data["web_contents"]:
             web_data_section = "참고할 웹 정보:\n"
-            for i, content in enumerate(collected_data["web_contents"][:2], 1):
-                limited_content = content[:100] + "..." if len(content) > 100 else content
-                web_data_section += f"{i}. {limited_content}\n"
+            if collected_data.get("budgeted"):
+                # 섹션 관련 문단 검색 결과 (이미 섹션별 토큰 예산에 맞춰 선택됨)
+                for i, content in enumerate(collected_data["web_contents"], 1):
+                    web_data_section += f"{i}. {content}\n"
+            else:
+                for i, content in enumerate(collected_data["web_contents"][:2], 1):
+                    limited_content = content[:100] + "..." if len(content) > 100 else content
+                    web_data_section += f"{i}. {limited_content}\n"
         
         url_section = ""
         if collected_data.get("urls"):
@@ -761,6 +941,98 @@ class BlogGeneratorGPTStyle:
         except Exception as e:
             raise Exception(f"섹션 내용 생성 실패: {e}")
     
+    def generate_all_sections(self, section_titles, final_title, keyword, clean_trimmed_text):
+        """섹션 스케줄러로 모든 섹션 내용을 생성 (gpt_chat_interface.py와 동일)"""
+        from section_scheduler import (
+            SECTION_MODES, build_section_dependencies, run_section_schedule, build_outline_context
+        )
+
+        mode = self.config.get("section_generation_mode", "sequential")
+        if mode not in SECTION_MODES:
+            print(f"⚠️ 알 수 없는 섹션 생성 모드 '{mode}' → sequential 사용")
+            mode = "sequential"
+        max_workers = max(1, int(self.config.get("section_max_workers", 5)))
+        dependencies = build_section_dependencies(len(section_titles), mode)
+        print(f"🧩 섹션 생성 모드: {mode} ({len(section_titles)}개 섹션, 최대 동시 {max_workers}개)")
+
+        def generate(i, dep_results):
+            previous_sections_content = ""
+            for j in sorted(dep_results):
+                clean_text = re.sub(r'<[^>]+>', '', dep_results[j].get("content", ""))
+                previous_sections_content += f"\n\n{clean_text}"
+            if mode != "sequential":
+                outline = build_outline_context(final_title, section_titles, i)
+                previous_sections_content = f"{outline}{previous_sections_content}"
+            return self.generate_section_content(section_titles[i], final_title, keyword, clean_trimmed_text, i, previous_sections_content)
+
+        def on_done(i, section_data, error):
+            if error is not None:
+                print(f"❌ 섹션 {i+1} 내용 생성 실패: {error}")
+            else:
+                print(f"✅ 섹션 {i+1} 내용 생성 완료")
+
+        results, errors = run_section_schedule(
+            len(section_titles), generate, dependencies,
+            max_workers=1 if mode == "sequential" else max_workers,
+            on_section_done=on_done,
+        )
+
+        section_data_list = [
+            results[i] if results[i] is not None else {"section_title": section_title, "content": "오류 발생"}
+            for i, section_title in enumerate(section_titles)
+        ]
+
+        if mode != "sequential" and self.config.get("section_coherence_pass", False):
+            self.apply_section_coherence_pass(section_data_list, final_title, errors)
+
+        content_parts = []
+        for i, section_data in enumerate(section_data_list):
+            if results[i] is not None:
+                content_parts.append(self.create_section_html_without_image(section_data))
+            else:
+                content_parts.append(f"<h2>{section_titles[i]}</h2>\n<p>이 섹션의 내용을 생성하는 중 오류가 발생했습니다.</p>")
+        return section_data_list, content_parts
+
+    def apply_section_coherence_pass(self, section_data_list, final_title, errors=None):
+        """병렬 생성된 섹션들 사이에 짧은 연결 문장을 추가 (gpt_chat_interface.py와 동일)"""
+        try:
+            targets = [
+                i for i in range(1, len(section_data_list))
+                if not (errors and errors[i] is not None)
+            ]
+            if not targets:
+                return
+            summaries = []
+            for i, section_data in enumerate(section_data_list):
+                plain = re.sub(r'<[^>]+>', '', section_data.get("content", "")).strip()
+                summaries.append(f"{i+1}. {section_data.get('section_title', '')}: {plain[:150]}")
+
+            prompt = f"""
+'{final_title}' 블로그 글의 섹션들이 따로 작성되었습니다. 아래 섹션 요약을 보고,
+섹션 {', '.join(str(i+1) for i in targets)}의 맨 앞에 붙일 자연스러운 연결 문장을 한 문장씩 작성하세요.
+
+{chr(10).join(summaries)}
+
+- 각 문장은 60자 이내, 경어체
+- 앞 섹션 내용을 반복하지 말고 흐름만 이어주세요
+- JSON만 출력: {{"transitions": {{"섹션번호": "연결 문장"}}}}
+"""
+            response_text = self.gpt(user_content=prompt, temperature=0.3, max_tokens=400)
+            json_block = self.extract_json_from_text(response_text)
+            if not json_block:
+                print("⚠️ 섹션 연결 보정 응답에서 JSON을 찾지 못해 건너뜁니다")
+                return
+            transitions = json5.loads(json_block).get("transitions", {})
+            applied = 0
+            for i in targets:
+                sentence = str(transitions.get(str(i + 1), "")).strip()
+                if sentence:
+                    section_data_list[i]["content"] = f"<p>{sentence}</p>\n" + section_data_list[i]["content"]
+                    applied += 1
+            print(f"✅ 섹션 연결 보정 완료: {applied}개 섹션")
+        except Exception as e:
+            print(f"⚠️ 섹션 연결 보정 실패 (원문 유지): {e}")
+
     def create_section_html_without_image(self, section_data):
         """이미지 없이 섹션 HTML을 생성하는 함수"""
         section_title = section_data["section_title"]
@@ -794,6 +1066,7 @@ class BlogGeneratorGPTStyle:
                 print(f"🛒 쿠팡 상품 정보 사용: {product_name}")
             
             print(f"🔍 웹 데이터 수집을 시작합니다...")
+            self.post_passage_index = None
             
             try:
                 import sys
@@ -828,11 +1101,12 @@ class BlogGeneratorGPTStyle:
                 
                 if collected_data and len(collected_data) >= 100:
                     print("🤖 수집된 데이터를 GPT로 정리합니다...")
-                    organized_data = self.organize_collected_data_with_gpt(product_keyword, collected_data)
+                    organized_data = self.organize_collected_data_with_gpt(product_keyword, collected_data, queries=[search_keywords])
                     self.collected_web_data = organized_data
                 else:
                     organized_data = collected_data
                     self.collected_web_data = organized_data
+                self.post_passage_index = self.build_post_passage_index(organized_data, collected_data)
                 
                 clean_trimmed_text = product_keyword
                 
@@ -1027,14 +1301,16 @@ class BlogGeneratorGPTStyle:
 예시: GameNews
 """
                 
+                valid_ca_names = [item["ca_name"] for item in category_list]
                 recommended_category = self.gpt(
                     user_content=category_prompt,
                     system_content="블로그 포스트의 내용을 분석하여 가장 적합한 카테고리를 추천하는 전문가입니다.",
                     temperature=0.3,
                     max_tokens=50,
+                    cacheable=True,
+                    cache_validator=lambda text: text in valid_ca_names,
                 )
                 
-                valid_ca_names = [item["ca_name"] for item in category_list]
                 if recommended_category in valid_ca_names:
                     category = recommended_category
                     print(f"🤖 GPT 카테고리 추천: {category}")
@@ -1050,30 +1326,10 @@ class BlogGeneratorGPTStyle:
             print(f"📂 카테고리: {category}")
             print(f"🏷️ 키워드: {', '.join(keywords)}")
 
-            # 1단계: 모든 섹션 내용을 먼저 완성
-            content_parts = []
-            section_data_list = []
-            previous_sections_content = ""
-            
-            for i, section_title in enumerate(section_titles):
-                try:
-                    section_data = self.generate_section_content(section_title, final_title, keyword, clean_trimmed_text, i, previous_sections_content)
-                    section_data_list.append(section_data)
-                    
-                    html = self.create_section_html_without_image(section_data)
-                    content_parts.append(html)
-                    
-                    if section_data and "content" in section_data:
-                        current_section_text = section_data["content"]
-                        import re
-                        clean_text = re.sub(r'<[^>]+>', '', current_section_text)
-                        previous_sections_content += f"\n\n{clean_text}"
-                    
-                    print(f"✅ 섹션 {i+1} 내용 생성 완료")
-                except Exception as e:
-                    print(f"❌ 섹션 {i+1} 내용 생성 실패: {e}")
-                    content_parts.append(f"<h2>{section_titles[i]}</h2>\n<p>이 섹션의 내용을 생성하는 중 오류가 발생했습니다.</p>")
-                    section_data_list.append({"section_title": section_titles[i], "content": "오류 발생"})
+            # 1단계: 모든 섹션 내용을 먼저 완성 (섹션 스케줄러: 순차/병렬 모드)
+            section_data_list, content_parts = self.generate_all_sections(
+                section_titles, final_title, keyword, clean_trimmed_text
+            )
             
             content = "\n\n".join(content_parts)
             
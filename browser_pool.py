@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""
+Playwright 브라우저 풀
+URL마다 Chromium을 새로 띄우지 않고, 전용 이벤트 루프 스레드에서 브라우저 1개와
+재사용 가능한 컨텍스트/페이지 슬롯을 유지한다.
+- 유휴 시간이 길어지면 브라우저를 닫아 메모리 반환 (다음 요청 시 다시 실행)
+- 브라우저 크래시/연결 끊김 감지 시 자동 재실행
+- 고정 대기 대신 DOMContentLoaded + 본문 영역에 실제 텍스트가 채워지는 시점까지만 대기,
+  이미지/폰트/미디어/광고 요청은 차단
+- 동기 코드는 fetch_html(), 비동기 코드는 afetch_html() 사용
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from importlib.util import find_spec
+
+# playwright는 설치 여부만 확인하고, 브라우저를 처음 실행할 때 import
+PLAYWRIGHT_ASYNC_AVAILABLE = find_spec("playwright") is not None
+if not PLAYWRIGHT_ASYNC_AVAILABLE:
+    print("⚠️ playwright 모듈이 없습니다. 브라우저 풀을 사용할 수 없습니다.")
+
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+# 본문 추출에 필요 없는 리소스 유형 (요청 자체를 차단)
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# 광고/트래커 호스트 (부분 문자열 일치)
+BLOCKED_HOST_KEYWORDS = (
+    "doubleclick.net", "googlesyndication.com", "googletagmanager.com",
+    "google-analytics.com", "adservice.google", "facebook.net", "criteo",
+    "taboola", "outbrain", "scorecardresearch", "adnxs.com", "amazon-adsystem",
+    "adfit", "ad.naver.com", "wcs.naver.net", "nstat", "mobon",
+)
+
+# 본문 iframe 안에서 기다릴 선택자 (네이버 블로그 스마트에디터 등)
+DEFAULT_FRAME_READY_SELECTORS = (".se-main-container", "#postViewArea", ".post-view", "article")
+
+
+async def _route_filter(route):
+    """이미지/폰트/미디어/광고 요청 차단, 나머지는 통과"""
+    request = route.request
+    try:
+        if request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+            return
+        url = request.url
+        if any(keyword in url for keyword in BLOCKED_HOST_KEYWORDS):
+            await route.abort()
+            return
+        await route.continue_()
+    except Exception:
+        # 페이지가 이미 닫힌 경우 등은 무시
+        pass
+
+
+# 선택자에 맞는 요소 중 하나라도 텍스트가 min_length자 이상이면 true
+_CONTENT_READY_SCRIPT = """([selector, minLength]) => Array.from(document.querySelectorAll(selector))
+    .some(el => (el.innerText || el.textContent || "").trim().length >= minLength)"""
+
+
+async def _wait_for_any_selector(target, selectors, timeout_ms, min_text_length=1):
+    """
+    선택자 중 하나라도 텍스트가 min_text_length자 이상 채워지면 True (시간 초과 시 False)
+    JS 렌더링 페이지는 article/main 같은 빈 틀이 DOMContentLoaded 시점에 이미 있으므로 요소 존재가 아닌 내용을 기다림
+    """
+    if not selectors:
+        return False
+    try:
+        await target.wait_for_function(
+            _CONTENT_READY_SCRIPT,
+            arg=[", ".join(selectors), max(1, int(min_text_length))],
+            polling=100,
+            timeout=timeout_ms,
+        )
+        return True
+    except Exception:
+        return False
+
+
+class _PageSlot:
+    """브라우저 컨텍스트 1개 + 재사용 페이지 1개"""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.last_used = time.monotonic()
+
+    async def close(self):
+        try:
+            await self.context.close()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """장기 실행 Chromium + 컨텍스트/페이지 풀"""
+
+    def __init__(self, max_pages=4, idle_timeout=180.0, headless=True):
+        if not PLAYWRIGHT_ASYNC_AVAILABLE:
+            raise ImportError("playwright 패키지가 필요합니다")
+        self.max_pages = int(max_pages)
+        self.idle_timeout = float(idle_timeout)
+        self.headless = headless
+        self.launch_count = 0
+        self._playwright = None
+        self._browser = None
+        self._idle_slots = []
+        self._in_use = 0
+        self._last_activity = time.monotonic()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="browser-pool", daemon=True)
+        self._thread.start()
+        self._submit(self._setup()).result()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _setup(self):
+        self._slot_semaphore = asyncio.Semaphore(self.max_pages)
+        self._browser_lock = asyncio.Lock()
+        self._reaper_task = asyncio.ensure_future(self._reap_idle())
+
+    # ------------------------------------------------------------------
+    # 브라우저 수명 관리
+    # ------------------------------------------------------------------
+    async def _ensure_browser(self):
+        """브라우저가 없거나 죽었으면 (재)실행"""
+        async with self._browser_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._browser is not None:
+                print("⚠️ 브라우저 연결 끊김 감지 - 재실행합니다")
+                await self._discard_all_slots()
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+            started = time.monotonic()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._browser.on("disconnected", lambda _: self._on_disconnected())
+            self.launch_count += 1
+            print(f"✅ Chromium 실행 완료 ({(time.monotonic() - started) * 1000:.0f}ms, 누적 {self.launch_count}회)")
+            return self._browser
+
+    def _on_disconnected(self):
+        # 크래시 시 남은 슬롯은 더 이상 쓸 수 없으므로 버림 (다음 요청에서 재실행)
+        self._idle_slots = []
+
+    async def _discard_all_slots(self):
+        slots, self._idle_slots = self._idle_slots, []
+        for slot in slots:
+            await slot.close()
+
+    async def _close_browser(self):
+        await self._discard_all_slots()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+    async def _reap_idle(self):
+        """유휴 슬롯 정리, 전체가 오래 유휴 상태면 브라우저 종료"""
+        while True:
+            await asyncio.sleep(min(30.0, max(5.0, self.idle_timeout / 4)))
+            try:
+                now = time.monotonic()
+                # 만료 슬롯은 await 전에 목록에서 먼저 빼서, 닫는 도중 대여되거나 그 사이 반납된 슬롯이 유실되지 않게 함
+                expired = [slot for slot in self._idle_slots if now - slot.last_used > self.idle_timeout]
+                if expired:
+                    self._idle_slots = [slot for slot in self._idle_slots if slot not in expired]
+                    for slot in expired:
+                        await slot.close()
+                if (self._browser is not None and self._in_use == 0
+                        and now - self._last_activity > self.idle_timeout):
+                    async with self._browser_lock:
+                        # 락을 기다리는 동안 새 요청이 들어왔으면 종료하지 않음
+                        if (self._browser is not None and self._in_use == 0
+                                and time.monotonic() - self._last_activity > self.idle_timeout):
+                            await self._close_browser()
+                            print("💤 브라우저 유휴 시간 초과 - 종료 (다음 요청 시 재실행)")
+            except Exception as e:
+                print(f"⚠️ 브라우저 풀 정리 중 오류: {e}")
+
+    # ------------------------------------------------------------------
+    # 슬롯 대여/반납
+    # ------------------------------------------------------------------
+    async def _acquire_slot(self):
+        browser = await self._ensure_browser()
+        while self._idle_slots:
+            slot = self._idle_slots.pop()
+            if not slot.page.is_closed():
+                return slot
+            await slot.close()
+        context = await browser.new_context(user_agent=DEFAULT_USER_AGENT, locale="ko-KR")
+        await context.route("**/*", _route_filter)
+        page = await context.new_page()
+        return _PageSlot(context, page)
+
+    async def _release_slot(self, slot, healthy):
+        slot.last_used = time.monotonic()
+        if healthy and self._browser is not None and self._browser.is_connected() and not slot.page.is_closed():
+            try:
+                # 다음 요청에 이전 페이지 상태가 남지 않도록 비워둠
+                await slot.page.goto("about:blank")
+                self._idle_slots.append(slot)
+                return
+            except Exception:
+                pass
+        await slot.close()
+
+    # ------------------------------------------------------------------
+    # 페이지 가져오기
+    # ------------------------------------------------------------------
+    async def afetch_html(self, url, timeout_ms=15000, ready_selectors=None, ready_timeout_ms=2000,
+                          idle_cap_ms=1500, frame_selector=None, frame_name=None,
+                          frame_ready_selectors=DEFAULT_FRAME_READY_SELECTORS, settle_ms=0, ready_min_text=1):
+        """
+        페이지를 열고 렌더링된 HTML 반환 (준비 상태 기반 대기)
+        1) DOMContentLoaded까지 이동
+        2) 본문 선택자(ready_selectors) 요소에 텍스트가 ready_min_text자 이상 채워지면 즉시 반환
+        3) 없으면 network-idle을 idle_cap_ms까지만 기다린 후 반환
+
+        Args:
+            url (str): 페이지 URL
+            timeout_ms (int): 페이지 이동 타임아웃
+            ready_selectors (list): 본문 영역 선택자 (하나라도 텍스트가 채워지면 준비 완료)
+            ready_timeout_ms (int): 본문 선택자 대기 상한
+            idle_cap_ms (int): 선택자가 없을 때 network-idle 대기 상한
+            frame_selector (str): 본문이 iframe 안에 있을 때 기다릴 iframe 선택자 (예: 네이버 블로그)
+            frame_name (str): 본문 iframe 이름
+            frame_ready_selectors (tuple): iframe 안에서 기다릴 본문 선택자
+            settle_ms (int): 추가 고정 대기 (기본 0, 특수한 페이지용)
+            ready_min_text (int): 본문 영역을 준비 완료로 볼 최소 텍스트 길이 (iframe 본문에도 적용)
+
+        Returns:
+            str: HTML (iframe을 찾으면 iframe HTML)
+        """
+        async with self._slot_semaphore:
+            self._in_use += 1
+            self._last_activity = time.monotonic()
+            slot = None
+            healthy = False
+            try:
+                slot = await self._acquire_slot()
+                page = slot.page
+                await page.goto(url, timeout=timeout_ms, wait_until="domcontentloaded")
+
+                html = None
+                if frame_selector:
+                    try:
+                        await page.wait_for_selector(frame_selector, timeout=5000)
+                        frame = page.frame(name=frame_name) if frame_name else None
+                        if frame:
+                            await _wait_for_any_selector(frame, frame_ready_selectors, ready_timeout_ms, ready_min_text)
+                            html = await frame.content()
+                    except Exception:
+                        html = None
+
+                if html is None:
+                    ready = await _wait_for_any_selector(
+                        page, ready_selectors, ready_timeout_ms if ready_selectors else 0, ready_min_text
+                    )
+                    if not ready:
+                        try:
+                            await page.wait_for_load_state("networkidle", timeout=idle_cap_ms)
+                        except Exception:
+                            pass  # 상한 도달 시 현재 DOM 그대로 사용
+                    if settle_ms:
+                        await page.wait_for_timeout(settle_ms)
+                    html = await page.content()
+                healthy = True
+                return html
+            finally:
+                if slot is not None:
+                    await self._release_slot(slot, healthy)
+                self._in_use -= 1
+                self._last_activity = time.monotonic()
+
+    def fetch_html(self, url, timeout=None, **kwargs):
+        """동기 호출 (작업 스레드용)"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("브라우저 풀 스레드에서는 afetch_html()을 await 하세요")
+        future = self._submit(self.afetch_html(url, **kwargs))
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # 기다리는 쪽이 포기하면 페이지 작업도 취소 (슬롯을 계속 붙잡고 아무도 읽지 않을 페이지를 받지 않도록)
+            future.cancel()
+            raise
+
+    def stats(self):
+        """풀 상태 (브라우저 실행 횟수, 유휴/사용 중 슬롯 수)"""
+        return {
+            "launch_count": self.launch_count,
+            "idle_slots": len(self._idle_slots),
+            "in_use": self._in_use,
+            "browser_running": self._browser is not None,
+        }
+
+    def close(self):
+        """브라우저와 Playwright 종료"""
+        async def _shutdown():
+            self._reaper_task.cancel()
+            await self._close_browser()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+        try:
+            self._submit(_shutdown()).result(timeout=10)
+        except Exception as e:
+            print(f"⚠️ 브라우저 풀 종료 중 오류: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_browser_pool(max_pages=4, idle_timeout=180.0):
+    """
+    프로세스 공용 브라우저 풀
+
+    Returns:
+        BrowserPool: 브라우저 풀 (playwright가 없거나 생성 실패 시 None)
+    """
+    global _shared_pool
+    if not PLAYWRIGHT_ASYNC_AVAILABLE:
+        return None
+    with _shared_lock:
+        if _shared_pool is None:
+            try:
+                _shared_pool = BrowserPool(max_pages=max_pages, idle_timeout=idle_timeout)
+                atexit.register(_shared_pool.close)
+            except Exception as e:
+                print(f"⚠️ 브라우저 풀 생성 실패: {e}")
+                return None
+        return _shared_pool
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+도메인별 웹 페이지 추출 전략 기록
+정적 HTTP 추출(static)로 충분한 도메인과 헤드리스 브라우저(browser)가 필요한 도메인을
+결과를 보며 학습하고 JSON 파일에 저장하여, 다음 수집부터 실패할 단계를 건너뛴다.
+"""
+
+import os
+import json
+import atexit
+import threading
+from urllib.parse import urlparse
+
+
+DEFAULT_STRATEGY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extraction_strategies.json")
+
+# 자바스크립트 렌더링이 필요한 것으로 알려진 호스트 (처음부터 브라우저 사용)
+JS_REQUIRED_HOSTS = (
+    "blog.naver.com", "m.blog.naver.com", "post.naver.com", "cafe.naver.com",
+    "m.post.naver.com", "brunch.co.kr", "velog.io",
+)
+
+# 정적 추출 실패가 이 횟수 이상이고 성공보다 많으면 브라우저로 바로 시작
+STATIC_FAILURE_THRESHOLD = 2
+
+# 정적 추출 결과가 이 길이 미만이면 품질 부족으로 판단
+MIN_STATIC_TEXT_LENGTH = 200
+
+# 정적 HTML에 이런 문구만 있으면 자바스크립트 렌더링이 필요한 페이지
+JS_REQUIRED_MARKERS = (
+    "enable javascript", "javascript를 활성화", "자바스크립트를 활성화",
+    "please turn on javascript", "javascript is disabled",
+)
+
+
+def normalize_host(url):
+    """URL에서 비교용 호스트 추출 (www. 제거)"""
+    host = urlparse(url).netloc.lower().split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def is_static_text_sufficient(text):
+    """정적 추출 결과가 본문으로 쓸 만한지 판단"""
+    if not text or len(text) < MIN_STATIC_TEXT_LENGTH:
+        return False
+    lowered = text[:500].lower()
+    return not any(marker in lowered for marker in JS_REQUIRED_MARKERS)
+
+
+class DomainStrategyTable:
+    """호스트별 static/browser 성공·실패 횟수 기록"""
+
+    def __init__(self, path=DEFAULT_STRATEGY_PATH, save_every=10):
+        self.path = path
+        self.save_every = int(save_every)
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._dirty = 0
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._hosts = data
+        except Exception as e:
+            print(f"⚠️ 도메인 추출 전략 로드 실패 (새로 기록): {e}")
+            self._hosts = {}
+
+    def _save_locked(self):
+        self._dirty = 0
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._hosts, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ 도메인 추출 전략 저장 실패: {e}")
+
+    def preferred_tier(self, url):
+        """이 URL을 처음 시도할 단계 ("static" 또는 "browser")"""
+        host = normalize_host(url)
+        if any(host == h or host.endswith("." + h) for h in JS_REQUIRED_HOSTS):
+            return "browser"
+        with self._lock:
+            entry = self._hosts.get(host)
+        if not entry:
+            return "static"
+        static_fail = entry.get("static_fail", 0)
+        if static_fail >= STATIC_FAILURE_THRESHOLD and static_fail > entry.get("static_ok", 0):
+            return "browser"
+        return "static"
+
+    def record(self, url, tier, success):
+        """추출 결과 기록 (선호 단계가 바뀌거나 일정 횟수마다 파일에 저장)"""
+        host = normalize_host(url)
+        if not host:
+            return
+        key = f"{tier}_{'ok' if success else 'fail'}"
+        before = self.preferred_tier(url)
+        with self._lock:
+            entry = self._hosts.setdefault(host, {})
+            entry[key] = entry.get(key, 0) + 1
+            self._dirty += 1
+        after = self.preferred_tier(url)
+        with self._lock:
+            if before != after or self._dirty >= self.save_every:
+                if before != after:
+                    print(f"📝 '{host}' 추출 전략 변경: {before} → {after}")
+                self._save_locked()
+
+    def flush(self):
+        """변경 사항 즉시 저장"""
+        with self._lock:
+            if self._dirty:
+                self._save_locked()
+
+
+_shared_table = None
+_shared_lock = threading.Lock()
+
+
+def get_strategy_table(path=None):
+    """프로세스 공용 도메인 추출 전략 기록"""
+    global _shared_table
+    with _shared_lock:
+        if _shared_table is None:
+            _shared_table = DomainStrategyTable(path or DEFAULT_STRATEGY_PATH)
+            atexit.register(_shared_table.flush)
+        return _shared_table
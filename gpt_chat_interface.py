@@ -1,9 +1,10 @@
 import sys
 import os
 import json
-import openai
-import requests
 import time
+_startup_started = time.perf_counter()
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, FIRST_COMPLETED, wait as wait_futures
 from datetime import datetime, timedelta
 import re
 from PyQt5.QtWidgets import (
@@ -11,22 +12,32 @@ from PyQt5.QtWidgets import (
     QLineEdit, QPushButton, QLabel, QHBoxLayout,
     QCheckBox, QGroupBox, QRadioButton, QComboBox,
     QSpinBox, QGridLayout, QButtonGroup, QScrollArea,
-    QFrame
+    QFrame, QProgressBar
 )
-from PyQt5.QtCore import QThread, pyqtSignal, QTimer, Qt
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, QTimer, Qt
 import json5
-import time
 import random
 from prompt_utils import build_article_from_existing_structure, build_paragraph_prompt
+from post_context import (
+    post_scope, current_post_state, current_post_tag, submit_with_context,
+    PostStateAttribute, ServiceLimiter
+)
+from llm_cache import get_llm_cache
+from llm_capabilities import get_capability_registry
+from llm_gateway import get_llm_gateway, warm_up_llm_gateway
+from blip_service import ImageCapturingProcessor
+from page_cache import get_page_cache
+from html_extract import set_default_backend as set_html_extract_backend
+from text_dedup import dedupe_text_blocks
+from passage_index import PassageIndex, pack_context
+from lazy_imports import get_lazy_registry
+from image_fingerprint import configure_image_history, get_image_fingerprint_store, ImageUrlReservations
 
 # OpenAI API 키 설정 (환경 변수 또는 설정 파일에서 로드)
-import os
-from openai import OpenAI
 api_key = os.getenv("OPENAI_API_KEY", "")
 if not api_key:
     # 설정 파일에서 로드 시도
     try:
-        import json
         config_path = os.path.join(os.path.dirname(__file__), "openai_config.json")
         if os.path.exists(config_path):
             with open(config_path, 'r', encoding='utf-8') as f:
@@ -34,52 +45,54 @@ if not api_key:
                 api_key = config.get("api_key", "")
     except:
         pass
-client = OpenAI(api_key=api_key) if api_key else None
 
-# 조건부 import (지연 로딩)
-def import_modules_on_demand():
-    """필요할 때만 모듈을 import하는 함수"""
-    global tistory_auto_writer, image_search, utils, mysql_handler, full_screenshot_gpu
-    
-    try:
-        from tistory_auto_writer import open_tistory_new_post_page, write_post_on_tistory, get_best_category_id_from_gpt, build_category_prompt_with_system
-        tistory_auto_writer = True
-        print("✅ tistory_auto_writer 모듈 로드 완료")
-    except ImportError:
-        tistory_auto_writer = False
-        print("⚠️ tistory_auto_writer 모듈 로드 실패")
-    
-    try:
-        from image_search import naver_image_search_with_rotation, download_image_with_timestamp, upload_image_to_github, google_image_search_safe
-        image_search = True
-        print("✅ image_search 모듈 로드 완료")
-    except ImportError:
-        image_search = False
-        print("⚠️ image_search 모듈 로드 실패")
-    
-    try:
-        from utils import collect_google_trends
-        utils = True
-        print("✅ utils 모듈 로드 완료")
-    except ImportError:
-        utils = False
-        print("⚠️ utils 모듈 로드 실패")
-    
-    try:
-        from mysql_handler import insert_to_mysql
-        mysql_handler = True
-        print("✅ mysql_handler 모듈 로드 완료")
-    except ImportError:
-        mysql_handler = False
-        print("⚠️ mysql_handler 모듈 로드 실패")
-    
-    try:
-        from full_screenshot.full_screenshot_gpu import download_top_bing_images_grid_match, load_blip_model
-        full_screenshot_gpu = True
-        print("✅ full_screenshot_gpu 모듈 로드 완료")
-    except ImportError:
-        full_screenshot_gpu = False
-        print("⚠️ full_screenshot_gpu 모듈 로드 실패")
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """동기 OpenAI 클라이언트 (openai 패키지는 처음 사용할 때 import)"""
+    global _openai_client
+    if _openai_client is None and api_key:
+        with _openai_client_lock:
+            if _openai_client is None:
+                from openai import OpenAI
+                _openai_client = OpenAI(api_key=api_key)
+    return _openai_client
+
+
+# 무거운 선택 모듈 지연 로딩 (torch/BLIP, 브라우저 자동화 등)
+# 처음 사용할 때 import되며, 창이 뜬 뒤 백그라운드에서 병렬로 미리 로드된다.
+# 기존 `'모듈명' in globals() and 모듈명` 검사는 그대로 동작 (bool 평가 시 import 완료를 기다림)
+lazy_modules = get_lazy_registry()
+lazy_modules.record_startup("gpt_chat_interface(기본)", (time.perf_counter() - _startup_started) * 1000)
+tistory_auto_writer = lazy_modules.register(
+    "tistory_auto_writer",
+    attrs=("open_tistory_new_post_page", "write_post_on_tistory",
+           "get_best_category_id_from_gpt", "build_category_prompt_with_system"),
+)
+image_search = lazy_modules.register(
+    "image_search",
+    attrs=("naver_image_search_with_rotation", "download_image_with_timestamp",
+           "upload_image_to_github", "google_image_search_safe"),
+)
+utils = lazy_modules.register("utils", attrs=("collect_google_trends",))
+mysql_handler = lazy_modules.register("mysql_handler", attrs=("insert_to_mysql",))
+full_screenshot_gpu = lazy_modules.register(
+    "full_screenshot_gpu", "full_screenshot.full_screenshot_gpu",
+    attrs=("download_top_bing_images_grid_match", "load_blip_model"),
+)
+# openai SDK/토큰 인코딩도 첫 GPT 호출 전에 미리 로드
+lazy_modules.register("llm_gateway", warmup=warm_up_llm_gateway)
+
+
+# Bing 그리드가 이전 글과 같은 이미지를 고른 경우 다시 매칭하는 최대 횟수
+GRID_HISTORY_RETRIES = 2
+
+
+def import_modules_on_demand(on_done=None):
+    """지연 로딩 모듈을 백그라운드 스레드에서 병렬로 미리 import (즉시 반환)"""
+    return lazy_modules.prewarm(on_done=on_done)
 
 class GoogleTrendsAutoThread(QThread):
     trends_collected = pyqtSignal(str)
@@ -479,7 +492,151 @@ class CoupangProductAutoThread(QThread):
         except Exception as e:
             print(f"⚠️ 다음 수집 시간 설정 실패: {e}")
 
+class ChatLogBridge(QObject):
+    """작업 스레드에서도 안전하게 대화 로그를 추가하기 위한 브리지.
+    append()는 시그널을 통해 UI 스레드의 QTextEdit.append로 전달되고,
+    그 외 속성 접근은 원본 위젯으로 위임한다.
+    """
+    append_requested = pyqtSignal(str)
+
+    def __init__(self, widget):
+        super().__init__()
+        self._widget = widget
+        self.append_requested.connect(widget.append)
+
+    def append(self, text):
+        self.append_requested.emit(str(text))
+
+    def __getattr__(self, name):
+        if name == "_widget":
+            raise AttributeError(name)
+        return getattr(self._widget, name)
+
+class KeywordPipelineThread(QThread):
+    """키워드 목록을 순서대로 send_to_gpt로 처리하는 파이프라인 작업 스레드.
+    UI는 시그널로 전달되는 진행 상황만 표시하고, 일시정지/중지는 GPTChatUI의
+    제어 이벤트(threading.Event)를 통해 즉시 반영된다.
+    """
+    progress_updated = pyqtSignal(int, int, str)  # (현재 순번, 전체 개수, 키워드)
+    pipeline_finished = pyqtSignal(bool)  # 중지 요청으로 끝났는지 여부
+
+    def __init__(self, ui, keywords, item_label="키워드"):
+        super().__init__()
+        self.ui = ui
+        self.keywords = list(keywords)
+        self.item_label = item_label
+
+    def run(self):
+        stopped = False
+        try:
+            concurrency = max(1, int(self.ui.config.get("batch_concurrency", 1)))
+            if concurrency > 1 and len(self.keywords) > 1:
+                stopped = self._run_concurrent(concurrency)
+            else:
+                stopped = self._run_sequential()
+        except Exception as e:
+            self.ui.chat_log.append(f"❌ 파이프라인 실행 중 오류: {str(e)}\n")
+            print(f"❌ 파이프라인 실행 중 오류: {str(e)}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self.pipeline_finished.emit(stopped or self.ui.should_stop)
+
+    def _run_sequential(self):
+        """키워드를 한 개씩 준비 → 업로드 (게시물 간 post_interval_minutes 대기)"""
+        total = len(self.keywords)
+        for i, keyword in enumerate(self.keywords, 1):
+            if not self.ui.wait_if_paused():
+                return True
+
+            self.progress_updated.emit(i, total, keyword)
+            self.ui.chat_log.append(f"📝 [{i}/{total}] {self.item_label} '{keyword}' 처리 중...\n")
+            print(f"📝 [{i}/{total}] {self.item_label} '{keyword}' 처리 중...")
+            self.ui.send_to_gpt(keyword)
+
+            if self.ui.should_stop:
+                return True
+
+            # 키워드 간 간격 (설정된 분 단위, 일시정지/중지 반영)
+            if i < total:
+                self.ui.sleep_with_controls(minutes=self.ui.config.get("post_interval_minutes", 1))
+        return False
+
+    def _prepare_post(self, index, keyword):
+        """배치 작업 스레드에서 글 1개 준비 (글별 상태는 post_scope로 분리)"""
+        if not self.ui.wait_if_paused():
+            return None
+        total = len(self.keywords)
+        self.ui.chat_log.append(f"📝 [{index}/{total}] {self.item_label} '{keyword}' 글 준비 시작...\n")
+        print(f"📝 [{index}/{total}] {self.item_label} '{keyword}' 글 준비 시작...")
+        with post_scope(tag=f"p{index}_", batch=True):
+            return self.ui.prepare_post(keyword)
+
+    def _run_concurrent(self, concurrency):
+        """여러 키워드의 글을 동시에 준비하고, 업로드만 post_interval_minutes 간격으로 진행"""
+        total = len(self.keywords)
+        interval_sec = float(self.ui.config.get("post_interval_minutes", 1)) * 60.0
+        self.ui.service_limiter.update_limits(self.ui.config.get("service_limits", {}))
+        self.ui.reset_used_media_urls()
+        self.ui.chat_log.append(f"⚡ 동시 배치 모드: {total}개 {self.item_label}, 동시 {min(concurrency, total)}개 준비\n")
+        print(f"⚡ 동시 배치 모드: {total}개 {self.item_label}, 동시 {min(concurrency, total)}개 준비")
+
+        processed = 0
+        last_publish = None
+        # 중지 시 실행 중인 글 준비를 기다리지 않도록 executor를 직접 관리 (with 블록은 종료 시 전부 기다림)
+        executor = ThreadPoolExecutor(max_workers=min(concurrency, total), thread_name_prefix="post-prepare")
+        try:
+            futures = {
+                executor.submit(self._prepare_post, i, keyword): (i, keyword)
+                for i, keyword in enumerate(self.keywords, 1)
+            }
+            pending = set(futures)
+            while pending:
+                if self.ui.should_stop or self.ui._stop_event.is_set():
+                    return True
+                done, pending = wait_futures(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+
+                # 먼저 준비된 글부터 업로드 (같은 시점에 끝난 글은 키워드 순서대로)
+                for future in sorted(done, key=lambda f: futures[f][0]):
+                    i, keyword = futures[future]
+                    processed += 1
+                    self.progress_updated.emit(processed, total, keyword)
+                    try:
+                        post = future.result()
+                    except Exception as e:
+                        print(f"❌ [{i}/{total}] '{keyword}' 글 준비 중 오류: {e}")
+                        post = None
+                    if not post:
+                        self.ui.chat_log.append(f"⚠️ [{i}/{total}] '{keyword}' 글 준비 실패 또는 중지 - 업로드 건너뜀\n")
+                        continue
+
+                    # 업로드 간격만 제한 (대기 중에도 다른 글 준비는 계속 진행)
+                    if last_publish is not None:
+                        remaining = interval_sec - (time.monotonic() - last_publish)
+                        if remaining > 0:
+                            self.ui.sleep_with_controls(minutes=remaining / 60.0)
+                    if not self.ui.wait_if_paused():
+                        return True
+
+                    self.ui.chat_log.append(f"📤 [{i}/{total}] '{keyword}' 업로드 중...\n")
+                    print(f"📤 [{i}/{total}] '{keyword}' 업로드 중...")
+                    self.ui.publish_post(post)
+                    last_publish = time.monotonic()
+        finally:
+            # 중지/오류 시 대기 중인 글은 취소하고, 실행 중인 글 준비는 기다리지 않음 (각자 중지 플래그를 보고 종료)
+            executor.shutdown(wait=False, cancel_futures=True)
+        stats = self.ui.get_blip_service().stats()
+        if stats["batches"]:
+            print(f"🧮 BLIP 배칭: 요청 {stats['requests']}건 → forward {stats['batches']}회 (평균 배치 {stats['avg_batch_size']:.2f})")
+        return False
+
 class GPTChatUI(QWidget):
+    # 글 단위 상태 (동시 배치 실행 시 글마다 분리됨, post_context 참고)
+    collected_web_data = PostStateAttribute()
+    collected_urls = PostStateAttribute()
+    post_passage_index = PostStateAttribute()
+    _current_coupang_product = PostStateAttribute()
+
     def __init__(self):
         super().__init__()
         self.messages = []
@@ -489,7 +646,17 @@ class GPTChatUI(QWidget):
         self.is_running = False
         self.is_paused = False
         self.should_stop = False
-        self.used_image_urls = set()
+        # 섹션/글 간 이미지 URL 예약 목록 (BLIP 매칭은 동시에 실행, URL 예약/확정만 직렬화)
+        self.used_image_urls = ImageUrlReservations()
+        # 동시 배치 실행 시 서비스별 동시 실행 수 제한 (config["service_limits"])
+        self.service_limiter = ServiceLimiter()
+        # 작업 스레드용 제어 이벤트 (중지/일시정지를 ms 단위로 반영)
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self.pipeline_thread = None
+        self._pipeline_on_complete = None
+        self.pipeline_user_prompt = ""
 
         # 설정 초기화
         self.config = {
@@ -521,7 +688,30 @@ class GPTChatUI(QWidget):
             "coupang_link_enabled": False,
             "auto_coupang_enabled": False,
             "coupang_interval": 60,
-            "search_engine": "bing"
+            "search_engine": "bing",
+            "section_generation_mode": "sequential",
+            "section_max_workers": 5,
+            "section_coherence_pass": False,
+            "batch_concurrency": 1,
+            "service_limits": {"web_search": 2, "image": 2},
+            "llm_cache_enabled": True,
+            "llm_cache_ttl_hours": 72,
+            "llm_cache_max_entries": 5000,
+            "llm_max_in_flight": 8,
+            "llm_rpm_limit": 500,
+            "llm_tpm_limit": 200000,
+            "llm_max_retries": 5,
+            "html_extract_backend": "auto",
+            "organize_context_token_budget": 4000,
+            "section_context_token_budget": 120,   # 기존 섹션 프롬프트의 웹 정보(100자 발췌) 크기 수준
+            "section_context_top_k": 2,
+            "blip_preload": True,
+            "blip_max_batch_size": 8,
+            "blip_max_wait_ms": 20,
+            "blip_cpu_threads": 0,
+            "blip_cpu_backend": "fp32",
+            "image_history_dedup": True,
+            "image_history_max_distance": 8
         }
         self.config_path = os.path.join(os.path.dirname(__file__), "gpt_blog_config.json")
         self.load_config()
@@ -533,8 +723,8 @@ class GPTChatUI(QWidget):
         # UI 생성
         self.init_ui()
         
-        # 모듈 지연 로딩
-        self.load_modules_async()
+        # 모듈 지연 로딩: 창이 표시된 뒤(이벤트 루프 시작 후) 백그라운드에서 예열
+        QTimer.singleShot(0, self.load_modules_async)
         
         # 자동 수집은 기본/저장 모두 비활성화 상태 유지
         print("⏹️ 자동 트렌드 수집은 기본적으로 비활성화되어 있습니다.")
@@ -561,11 +751,85 @@ class GPTChatUI(QWidget):
         except Exception:
             return "file"
 
-    def call_chat_with_fallback(self, messages, primary_model="gpt-5-mini", temperature=0.3, max_tokens=500):
+    def _llm_cache_for(self, cacheable):
+        """캐시 대상 호출이면 공용 LLM 캐시를 반환 (설정값 반영), 아니면 None
+        - cacheable: 호출부에서 명시적으로 허용한 호출만 캐시 (검색어/카테고리/이미지 검색어처럼
+          결과가 짧고 입력이 같으면 같아도 되는 호출). 섹션 본문 등 창의적 생성은 매번 호출
+        - llm_cache_enabled: 캐시 사용 여부
+        """
+        if not self.config.get("llm_cache_enabled", True):
+            return None
+        if not cacheable:
+            return None
+        try:
+            return get_llm_cache(
+                ttl_hours=self.config.get("llm_cache_ttl_hours", 72),
+                max_entries=self.config.get("llm_cache_max_entries", 5000),
+            )
+        except Exception as e:
+            print(f"⚠️ LLM 캐시 사용 불가: {e}")
+            return None
+
+    def log_llm_cache_stats(self):
+        """LLM 캐시 적중/미스 카운터를 로그로 출력"""
+        if not self.config.get("llm_cache_enabled", True):
+            return
+        try:
+            stats = get_llm_cache().stats()
+            message = (f"📦 LLM 캐시: 적중 {stats['hits']} / 미스 {stats['misses']} "
+                       f"(적중률 {stats['hit_rate']:.0%}, 저장 {stats['entries']}건)")
+            self.chat_log.append(message + "\n")
+            print(message)
+        except Exception as e:
+            print(f"⚠️ LLM 캐시 통계 조회 실패: {e}")
+
+    def log_page_cache_stats(self):
+        """웹 페이지 캐시 적중/재검증/미스 카운터를 로그로 출력"""
+        cache = get_page_cache()
+        if cache is None:
+            return
+        try:
+            stats = cache.stats()
+            message = (f"📦 페이지 캐시: 적중 {stats['hits']} / 재검증(304) {stats['revalidated']} / "
+                       f"미스 {stats['misses']} (저장 {stats['entries']}건, {stats['bytes'] / 1024 / 1024:.1f}MB)")
+            self.chat_log.append(message + "\n")
+            print(message)
+        except Exception as e:
+            print(f"⚠️ 페이지 캐시 통계 조회 실패: {e}")
+
+    def _create_chat_completion(self, **params):
+        """chat.completions 호출 창구: 공용 LLM 게이트웨이(연결 풀/동시 요청 제한/RPM·TPM 제한) 우선,
+        사용할 수 없으면 기존 동기 client 사용"""
+        gateway = None
+        if get_llm_gateway is not None:
+            gateway = get_llm_gateway(
+                api_key,
+                max_in_flight=self.config.get("llm_max_in_flight", 8),
+                rpm_limit=self.config.get("llm_rpm_limit", 500),
+                tpm_limit=self.config.get("llm_tpm_limit", 200000),
+                max_retries=self.config.get("llm_max_retries", 5),
+            )
+        if gateway is not None:
+            return gateway.create(**params)
+        client = get_openai_client()
+        if client is None:
+            raise RuntimeError("OpenAI API 키가 설정되지 않았습니다")
+        return client.chat.completions.create(**params)
+
+    def call_chat_with_fallback(self, messages, primary_model="gpt-5-mini", temperature=0.3, max_tokens=500,
+                                cacheable=False, cache_validator=None):
         """모델/파라미터 호환성 처리. 모델은 gpt-5-mini만 사용(폴백 제거).
         - 토큰 파라미터: (생략) → max_tokens → max_completion_tokens 순 시도
         - temperature: 요청값 → 1 → 생략 순 시도
+        - cacheable=True로 허용한 호출만 LLM 디스크 캐시에서 먼저 조회 (cache_validator를 통과한 응답만 저장)
+        - 성공한 조합은 모델별로 기록(llm_capabilities.json)하여 다음 호출부터 바로 사용
         """
+        cache = self._llm_cache_for(cacheable)
+        if cache is not None:
+            cached = cache.get(primary_model, messages, temperature, max_tokens)
+            if cached is not None:
+                print(f"📦 LLM 캐시 적중 ({primary_model})")
+                return cached
         model_candidates = [primary_model]
         token_param_candidates = [None, "max_tokens", "max_completion_tokens"]
         temperature_modes = [
@@ -573,9 +837,17 @@ class GPTChatUI(QWidget):
             ("one", 1),
             ("omit", None),
         ]
+        registry = get_capability_registry() if get_capability_registry else None
         for model_name in model_candidates:
-            for token_param in token_param_candidates:
-                for temp_mode, temp_value in temperature_modes:
+            # 이전에 성공한 토큰 파라미터/temperature 조합을 먼저 시도
+            if registry is not None:
+                model_token_params, model_temperature_modes = registry.order_candidates(
+                    model_name, token_param_candidates, temperature_modes
+                )
+            else:
+                model_token_params, model_temperature_modes = token_param_candidates, temperature_modes
+            for token_param in model_token_params:
+                for temp_mode, temp_value in model_temperature_modes:
                     try:
                         params = {
                             "model": model_name,
@@ -585,7 +857,16 @@ class GPTChatUI(QWidget):
                             params["temperature"] = temp_value
                         if token_param is not None and max_tokens is not None:
                             params[token_param] = max_tokens
-                        return client.chat.completions.create(**params)
+                        response = self._create_chat_completion(**params)
+                        if registry is not None:
+                            registry.record(model_name, token_param, temp_mode, temperature)
+                        if cache is not None:
+                            # 빈 응답/형식이 맞지 않는 응답은 저장하지 않음 (cache_validator: 응답 텍스트 검증 함수)
+                            content = (response.choices[0].message.content or "").strip()
+                            if content and (cache_validator is None or cache_validator(content)):
+                                cache.put(primary_model, messages, temperature, max_tokens,
+                                          response.choices[0].message.content)
+                        return response
                     except Exception as e:
                         err = str(e)
                         # 파라미터 미지원: 동일 모델에서 대체 파라미터/모드 시도
@@ -613,7 +894,8 @@ class GPTChatUI(QWidget):
         raise Exception("사용 가능한 모델이 없습니다. 허용 모델 및 권한을 확인하세요.")
 
     def gpt(self, user_content: str, system_content: str = None, temperature: float = 0.3,
-            max_tokens: int = 500, primary_model: str = None) -> str:
+            max_tokens: int = 500, primary_model: str = None, cacheable: bool = False,
+            cache_validator=None) -> str:
         """단일 GPT 호출 함수: system/user를 받아 텍스트 응답(content)만 반환"""
         messages = []
         if system_content:
@@ -627,12 +909,32 @@ class GPTChatUI(QWidget):
             primary_model=primary_model,
             temperature=temperature,
             max_tokens=max_tokens,
+            cacheable=cacheable,
+            cache_validator=cache_validator,
         )
         return (resp.choices[0].message.content or "").strip()
 
     def load_modules_async(self):
-        """비동기로 모듈들을 로드"""
-        import_modules_on_demand()
+        """비동기로 모듈들을 로드 (백그라운드 병렬 import, 완료 후 모듈별 import 시간 출력)"""
+        print(f"🪟 창 표시까지 {(time.perf_counter() - _startup_started) * 1000:.0f}ms")
+        def _on_prewarmed(registry):
+            registry.print_import_report()
+            # 이미지 매칭용 BLIP 모델도 백그라운드에서 미리 로드해 상주 (첫 글의 이미지 단계 대기 제거)
+            if self.config.get("blip_preload", True) and registry.is_available("full_screenshot_gpu"):
+                self.get_blip_service().start()
+
+        import_modules_on_demand(on_done=_on_prewarmed)
+
+    def get_blip_service(self):
+        """공용 BLIP 서비스 (모델 상주 + 섹션/글 간 동적 배칭)"""
+        from blip_service import get_blip_service
+        return get_blip_service(
+            use_gpu=self.config.get("use_gpu_for_images", True),
+            max_batch_size=self.config.get("blip_max_batch_size", 8),
+            max_wait_ms=self.config.get("blip_max_wait_ms", 20),
+            cpu_threads=self.config.get("blip_cpu_threads", 0),
+            cpu_backend=self.config.get("blip_cpu_backend", "fp32"),
+        )
 
     def init_ui(self):
         self.setWindowTitle("🧠 GPT 블로그 작성기 (최적화 버전)")
@@ -742,12 +1044,14 @@ class GPTChatUI(QWidget):
         layout.setContentsMargins(15, 15, 15, 15)  # 여백 설정
 
         # 상단 대화 로그 (높이 줄임)
-        self.chat_log = QTextEdit()
-        self.chat_log.setMaximumHeight(100)  # 높이 제한
-        self.chat_log.setReadOnly(True)
-        self.chat_log.setStyleSheet("background-color: #f9f9f9; font-size: 11px; line-height: 1.2;")
+        self.chat_log_view = QTextEdit()
+        self.chat_log_view.setMaximumHeight(100)  # 높이 제한
+        self.chat_log_view.setReadOnly(True)
+        self.chat_log_view.setStyleSheet("background-color: #f9f9f9; font-size: 11px; line-height: 1.2;")
         layout.addWidget(QLabel("📋 대화 로그"))
-        layout.addWidget(self.chat_log)
+        layout.addWidget(self.chat_log_view)
+        # 작업 스레드에서도 append 가능하도록 시그널 브리지로 감싸기
+        self.chat_log = ChatLogBridge(self.chat_log_view)
 
         # input-keyword 입력창 추가 (검색어 옆에 붙일 주석)
         self.input_keyword = QLineEdit()
@@ -817,10 +1121,10 @@ class GPTChatUI(QWidget):
         input_layout = QHBoxLayout()
         self.input_box = QLineEdit()
         self.input_box.setPlaceholderText("✍️ GPT에게 블로그 주제를 입력하세요...")
-        self.input_box.returnPressed.connect(lambda: self.send_to_gpt(self.input_box.text().strip()))
+        self.input_box.returnPressed.connect(self.handle_single_keyword_send)
 
         self.send_button = QPushButton("📤 전송")
-        self.send_button.clicked.connect(lambda: self.send_to_gpt(self.input_box.text().strip()))
+        self.send_button.clicked.connect(self.handle_single_keyword_send)
 
         input_layout.addWidget(self.input_box)
         input_layout.addWidget(self.send_button)
@@ -876,6 +1180,16 @@ class GPTChatUI(QWidget):
         multi_button_layout.addWidget(self.mysql_test_button)
         
         layout.addLayout(multi_button_layout)
+
+        # 파이프라인 진행 상황 (작업 스레드 시그널로만 갱신)
+        progress_layout = QHBoxLayout()
+        self.pipeline_progress_bar = QProgressBar()
+        self.pipeline_progress_bar.setRange(0, 1)
+        self.pipeline_progress_bar.setValue(0)
+        self.pipeline_status_label = QLabel("진행 상태: 대기 중")
+        progress_layout.addWidget(self.pipeline_progress_bar)
+        progress_layout.addWidget(self.pipeline_status_label)
+        layout.addLayout(progress_layout)
         
         # 설정 옵션들
         settings_group = QGroupBox("설정 옵션")
@@ -1090,24 +1404,33 @@ class GPTChatUI(QWidget):
         self.post_interval_combo.currentTextChanged.connect(self.save_config)
         trends_auto_layout.addWidget(post_interval_label, 4, 0)
         trends_auto_layout.addWidget(self.post_interval_combo, 4, 1)
+
+        # 동시 배치 준비 개수 (1이면 기존처럼 한 개씩 처리, 업로드 간격은 항상 유지)
+        batch_concurrency_label = QLabel("⚡ 동시 준비 글 수:")
+        self.batch_concurrency_spinbox = QSpinBox()
+        self.batch_concurrency_spinbox.setRange(1, 10)
+        self.batch_concurrency_spinbox.setValue(self.config.get("batch_concurrency", 1))
+        self.batch_concurrency_spinbox.valueChanged.connect(self.save_config)
+        trends_auto_layout.addWidget(batch_concurrency_label, 5, 0)
+        trends_auto_layout.addWidget(self.batch_concurrency_spinbox, 5, 1)
         
         # 부하 제어 옵션
         load_control_label = QLabel("⚡ 부하 제어:")
         self.load_control_checkbox = QCheckBox("🛡️ 부하 제어 활성화 (권장)")
         self.load_control_checkbox.setChecked(self.config.get("load_control_enabled", True))
         self.load_control_checkbox.stateChanged.connect(self.save_config)
-        trends_auto_layout.addWidget(load_control_label, 5, 0)
-        trends_auto_layout.addWidget(self.load_control_checkbox, 5, 1)
+        trends_auto_layout.addWidget(load_control_label, 6, 0)
+        trends_auto_layout.addWidget(self.load_control_checkbox, 6, 1)
         
         # 다음 수집 시간 표시
         self.next_collection_label = QLabel("⏳ 다음 수집: --:--")
         self.next_collection_label.setStyleSheet("color: #4CAF50; font-weight: bold;")
-        trends_auto_layout.addWidget(self.next_collection_label, 6, 0, 1, 2)
+        trends_auto_layout.addWidget(self.next_collection_label, 7, 0, 1, 2)
         
         # 자동화 상태 표시
         self.auto_status_label = QLabel("상태: 대기 중")
         self.auto_status_label.setStyleSheet("color: #FF9800; font-weight: bold;")
-        trends_auto_layout.addWidget(self.auto_status_label, 7, 0, 1, 2)
+        trends_auto_layout.addWidget(self.auto_status_label, 8, 0, 1, 2)
         
         trends_auto_group.setLayout(trends_auto_layout)
         layout.addWidget(trends_auto_group)
@@ -1430,21 +1753,102 @@ class GPTChatUI(QWidget):
     def sleep_with_controls(self, minutes: int = 1):
         """게시물 간 대기시간 동안 일시정지/중지 상태를 반영하여 대기.
         - minutes: 분 단위 대기시간
+        - 중지 요청 시 threading.Event로 즉시 깨어남 (작업 스레드 전용)
         """
         try:
-            total_ms = max(0, int(minutes) * 60 * 1000)
+            remaining = max(0.0, float(minutes) * 60.0)
         except Exception:
-            total_ms = 60 * 1000
-        step_ms = 200  # 0.2초 단위로 체크하여 UI 반응성 확보
-        elapsed = 0
-        while elapsed < total_ms:
-            if self.should_stop:
+            remaining = 60.0
+        while remaining > 0:
+            if self._stop_event.is_set():
                 break
-            if self.is_paused:
-                time.sleep(0.1)
+            if not self._resume_event.is_set():
+                # 일시정지 중에는 대기시간을 차감하지 않음
+                self._resume_event.wait()
                 continue
-            time.sleep(step_ms / 1000.0)
-            elapsed += step_ms
+            started = time.monotonic()
+            if self._stop_event.wait(min(remaining, 0.2)):
+                break
+            remaining -= time.monotonic() - started
+
+    def wait_if_paused(self):
+        """일시정지 상태면 재개/중지될 때까지 대기.
+        Returns:
+            bool: 계속 진행해도 되면 True, 중지 요청이 있으면 False
+        """
+        self._resume_event.wait()
+        return not self._stop_event.is_set()
+
+    def start_pipeline(self, keywords, item_label="키워드", on_complete=None):
+        """키워드 목록 처리를 작업 스레드(KeywordPipelineThread)에서 시작"""
+        if self.pipeline_thread is not None and self.pipeline_thread.isRunning():
+            self.chat_log.append("⚠️ 이전 작업이 아직 종료되지 않았습니다. 잠시 후 다시 시도하세요.\n")
+            print("⚠️ 이전 작업이 아직 종료되지 않았습니다.")
+            return False
+
+        # 작업 스레드에서 위젯을 읽지 않도록 필요한 값을 미리 보관
+        self.pipeline_user_prompt = self.input_box.text().strip()
+
+        # 실행 상태 업데이트
+        self.is_running = True
+        self.is_paused = False
+        self.should_stop = False
+        self._stop_event.clear()
+        self._resume_event.set()
+        self.pause_button.setText("⏸️ 일시중지")
+        self.pause_button.setEnabled(True)
+        self.stop_button.setEnabled(True)
+        self.multi_search_button.setEnabled(False)
+        self.send_button.setEnabled(False)
+        self.pipeline_progress_bar.setRange(0, len(keywords))
+        self.pipeline_progress_bar.setValue(0)
+        self.pipeline_status_label.setText(f"진행 상태: 0/{len(keywords)}")
+
+        self._pipeline_on_complete = on_complete
+        self.pipeline_thread = KeywordPipelineThread(self, keywords, item_label)
+        self.pipeline_thread.progress_updated.connect(self.on_pipeline_progress)
+        self.pipeline_thread.pipeline_finished.connect(self.on_pipeline_finished)
+        self.pipeline_thread.start()
+        return True
+
+    def on_pipeline_progress(self, index, total, keyword):
+        """작업 스레드 진행 상황 표시"""
+        self.pipeline_progress_bar.setValue(index - 1)
+        self.pipeline_status_label.setText(f"진행 상태: {index}/{total} - {keyword[:30]}")
+
+    def on_pipeline_finished(self, stopped):
+        """작업 스레드 종료 시 UI 상태 복구 및 완료 콜백 호출"""
+        self.is_running = False
+        self.is_paused = False
+        self.pause_button.setText("⏸️ 일시중지")
+        self.pause_button.setEnabled(False)
+        self.stop_button.setEnabled(False)
+        self.multi_search_button.setEnabled(True)
+        self.send_button.setEnabled(True)
+        if stopped:
+            self.pipeline_status_label.setText("진행 상태: 중지됨")
+        else:
+            self.pipeline_progress_bar.setValue(self.pipeline_progress_bar.maximum())
+            self.pipeline_status_label.setText("진행 상태: 완료")
+
+        on_complete = self._pipeline_on_complete
+        self._pipeline_on_complete = None
+        if on_complete:
+            try:
+                on_complete(stopped)
+            except Exception as e:
+                print(f"⚠️ 파이프라인 완료 처리 중 오류: {e}")
+
+    def handle_single_keyword_send(self):
+        """입력창의 주제 하나를 작업 스레드에서 처리"""
+        keyword = self.input_box.text().strip()
+        if not keyword:
+            self.chat_log.append("❌ 키워드를 입력해주세요.\n")
+            print("❌ 키워드를 입력해주세요.")
+            return
+        self.config["content_type"] = self.content_type_combo.currentText()
+        self.save_config()
+        self.start_pipeline([keyword])
 
     def load_config(self):
         try:
@@ -1509,6 +1913,8 @@ class GPTChatUI(QWidget):
                         self.post_interval_combo.setCurrentText(str(self.config.get("post_interval_minutes", 1)))
                     except Exception:
                         self.post_interval_combo.setCurrentText("1")
+                if hasattr(self, 'batch_concurrency_spinbox'):
+                    self.batch_concurrency_spinbox.setValue(self.config.get("batch_concurrency", 1))
                 if hasattr(self, 'bo_table_combo'):
                     self.bo_table_combo.setCurrentText(self.config.get("bo_table", "free"))
                 if hasattr(self, 'ca_name_combo'):
@@ -1531,6 +1937,13 @@ class GPTChatUI(QWidget):
                 self.coupang_image_checkbox.setChecked(self.config.get("coupang_image_enabled", False))
             if hasattr(self, 'coupang_link_checkbox'):
                 self.coupang_link_checkbox.setChecked(self.config.get("coupang_link_enabled", False))
+            # 웹 페이지 본문 추출 백엔드 (selectolax/lxml/bs4)
+            set_html_extract_backend(self.config.get("html_extract_backend", "auto"))
+            # 블로그 이력 전체 기준 이미지 중복 방지 (pHash 지문 저장소)
+            configure_image_history(
+                self.config.get("image_history_dedup", True),
+                self.config.get("image_history_max_distance", 8),
+            )
         except Exception as e:
             print(f"❌ 설정 로드 실패: {e}")
             if hasattr(self, 'chat_log'):
@@ -1561,6 +1974,8 @@ class GPTChatUI(QWidget):
                     self.config["post_interval_minutes"] = int(self.post_interval_combo.currentText())
                 except Exception:
                     self.config["post_interval_minutes"] = 1
+            if hasattr(self, 'batch_concurrency_spinbox'):
+                self.config["batch_concurrency"] = self.batch_concurrency_spinbox.value()
             if hasattr(self, 'chat_model_combo'):
                 self.config["chat_model"] = self.chat_model_combo.currentText()
             
@@ -1633,65 +2048,46 @@ class GPTChatUI(QWidget):
         self.config["content_type"] = self.content_type_combo.currentText()
         self.save_config()
         
-        # 실행 상태 업데이트
-        self.is_running = True
-        self.pause_button.setEnabled(True)
-        self.stop_button.setEnabled(True)
-        self.multi_search_button.setEnabled(False)
-        
-        # 각 키워드에 대해 GPT로 글 생성
-        for i, keyword in enumerate(keywords, 1):
-            if self.should_stop:
-                break
-                
-            while self.is_paused:
-                time.sleep(0.1)
-                if self.should_stop:
-                    break
-            
-            self.chat_log.append(f"📝 [{i}/{len(keywords)}] 키워드 '{keyword}' 처리 중...\n")
-            print(f"📝 [{i}/{len(keywords)}] 키워드 '{keyword}' 처리 중...")
-            self.send_to_gpt(keyword)
-            
-            # 키워드 간 간격 (설정된 분 단위, 일시정지/중지 반영)
-            if i < len(keywords) and not self.should_stop:
-                self.sleep_with_controls(minutes=self.config.get("post_interval_minutes", 1))
-        
-        # 실행 완료
-        self.is_running = False
-        self.pause_button.setEnabled(False)
-        self.stop_button.setEnabled(False)
-        self.multi_search_button.setEnabled(True)
-        
-        if content_type == "소설":
-            self.chat_log.append("✅ 모든 소설 작성 완료!\n")
-            print("✅ 모든 소설 작성 완료!")
-        else:
-            self.chat_log.append("✅ 모든 키워드 처리 완료!\n")
-            print("✅ 모든 키워드 처리 완료!")
+        def on_complete(stopped):
+            if stopped:
+                return
+            if content_type == "소설":
+                self.chat_log.append("✅ 모든 소설 작성 완료!\n")
+                print("✅ 모든 소설 작성 완료!")
+            else:
+                self.chat_log.append("✅ 모든 키워드 처리 완료!\n")
+                print("✅ 모든 키워드 처리 완료!")
+
+        # 각 키워드에 대해 작업 스레드에서 GPT로 글 생성
+        self.start_pipeline(keywords, on_complete=on_complete)
 
     def pause_execution(self):
         """실행 일시 중지"""
         if self.is_running:
             self.is_paused = not self.is_paused
             if self.is_paused:
+                self._resume_event.clear()
                 self.pause_button.setText("▶️ 재개")
                 self.chat_log.append("⏸️ 실행이 일시 중지되었습니다.\n")
                 print("⏸️ 실행이 일시 중지되었습니다.")
             else:
+                self._resume_event.set()
                 self.pause_button.setText("⏸️ 일시중지")
                 self.chat_log.append("▶️ 실행이 재개되었습니다.\n")
                 print("▶️ 실행이 재개되었습니다.")
 
     def stop_execution(self):
-        """실행 강제 종료"""
+        """실행 강제 종료 (진행 중인 단계가 끝나는 즉시 작업 스레드 종료)"""
         self.should_stop = True
-        self.is_running = False
         self.is_paused = False
+        self._stop_event.set()
+        self._resume_event.set()  # 일시정지 대기 중인 스레드도 깨움
         self.pause_button.setEnabled(False)
         self.stop_button.setEnabled(False)
-        self.multi_search_button.setEnabled(True)
         self.pause_button.setText("⏸️ 일시중지")
+        if self.pipeline_thread is None or not self.pipeline_thread.isRunning():
+            self.is_running = False
+            self.multi_search_button.setEnabled(True)
         self.chat_log.append("🛑 실행이 강제 종료되었습니다.\n")
         print("🛑 실행이 강제 종료되었습니다.")
 
@@ -1837,7 +2233,6 @@ class GPTChatUI(QWidget):
             self.chat_log.append("🤖 GPT로 이미지 프롬프트를 생성합니다...\n")
             print("🤖 GPT로 이미지 프롬프트를 생성합니다...")
 
-            # 시스템/유저 프롬프트는 신/구 SDK 모두에서 사용하므로 먼저 구성
             system_prompt = """당신은 전문적인 이미지 프롬프트 생성 전문가입니다.
             주어진 주제와 요청사항을 바탕으로 4K 고화질, 디테일하고 자세한 이미지 프롬프트를 생성해주세요.
 
@@ -1869,10 +2264,6 @@ class GPTChatUI(QWidget):
 
             위 주제와 요청사항을 바탕으로 이미지 프롬프트를 생성해주세요."""
 
-            # 신형 SDK 우선 시도
-            from openai import OpenAI
-            client = OpenAI(api_key=openai.api_key)
-
             result = self.gpt(
                 user_content=user_prompt,
                 system_content=system_prompt,
@@ -1909,24 +2300,6 @@ class GPTChatUI(QWidget):
                 print(f"✅ 이미지 프롬프트 생성 완료!")
                 print(f"🎯 프롬프트: {result}")
             
-        except ImportError:
-            # 구버전 API 사용 (fallback)
-            # 구버전 SDK 경로에서도 gpt-5-mini만 사용, 파라미터 최소화
-            response = openai.ChatCompletion.create(
-                model=self.config.get("chat_model", "gpt-5-mini"),
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
-            
-            result = response.choices[0].message.content.strip()
-            self.image_prompt_input.setPlainText(result)
-            self.chat_log.append(f"✅ 이미지 프롬프트 생성 완료!\n")
-            self.chat_log.append(f"🎯 프롬프트: {result[:100]}...\n")
-            print(f"✅ 이미지 프롬프트 생성 완료!")
-            print(f"🎯 프롬프트: {result}")
-            
         except Exception as e:
             self.chat_log.append(f"❌ 이미지 프롬프트 생성 실패: {str(e)}\n")
             print(f"❌ 이미지 프롬프트 생성 실패: {str(e)}")
@@ -2417,6 +2790,141 @@ class GPTChatUI(QWidget):
         except Exception as e:
             raise Exception(f"섹션 내용 생성 실패: {e}")
 
+    def generate_all_sections(self, section_titles, final_title, keyword, clean_trimmed_text, on_section_done=None):
+        """섹션 스케줄러로 모든 섹션 내용을 생성하는 함수
+        - section_generation_mode: sequential(이전 섹션 누적 참고) / intro_first / parallel(개요만 참고)
+        - section_coherence_pass: 병렬 생성 후 섹션 간 연결 문장을 짧게 보강
+        Returns:
+            tuple: (section_data_list, content_parts) - 섹션 순서대로 정렬
+        """
+        from section_scheduler import (
+            SECTION_MODES, build_section_dependencies, run_section_schedule, build_outline_context
+        )
+
+        mode = self.config.get("section_generation_mode", "sequential")
+        if mode not in SECTION_MODES:
+            print(f"⚠️ 알 수 없는 섹션 생성 모드 '{mode}' → sequential 사용")
+            mode = "sequential"
+        max_workers = max(1, int(self.config.get("section_max_workers", 5)))
+        dependencies = build_section_dependencies(len(section_titles), mode)
+
+        self.chat_log.append(f"🧩 섹션 생성 모드: {mode} ({len(section_titles)}개 섹션)\n")
+        print(f"🧩 섹션 생성 모드: {mode} ({len(section_titles)}개 섹션, 최대 동시 {max_workers}개)")
+
+        def generate(i, dep_results):
+            # 의존 섹션(완료된 이전 섹션)의 본문을 순서대로 누적
+            previous_sections_content = ""
+            for j in sorted(dep_results):
+                clean_text = re.sub(r'<[^>]+>', '', dep_results[j].get("content", ""))
+                previous_sections_content += f"\n\n{clean_text}"
+            if mode != "sequential":
+                # 병렬 모드: 섹션 간 중복 방지를 위해 글 전체 개요를 함께 전달
+                outline = build_outline_context(final_title, section_titles, i)
+                previous_sections_content = f"{outline}{previous_sections_content}"
+            return self.generate_section_content(section_titles[i], final_title, keyword, clean_trimmed_text, i, previous_sections_content)
+
+        def on_done(i, section_data, error):
+            if error is not None:
+                print(f"❌ 섹션 {i+1} 내용 생성 실패: {error}")
+            else:
+                print(f"✅ 섹션 {i+1} 내용 생성 완료")
+            if on_section_done:
+                on_section_done(i, section_data, error)
+
+        results, errors = run_section_schedule(
+            len(section_titles), generate, dependencies,
+            max_workers=1 if mode == "sequential" else max_workers,
+            on_section_done=on_done,
+            should_continue=self.wait_if_paused,
+        )
+
+        section_data_list = []
+        for i, section_title in enumerate(section_titles):
+            if results[i] is not None:
+                section_data_list.append(results[i])
+            else:
+                # 기본 내용으로 대체
+                section_data_list.append({"section_title": section_title, "content": "오류 발생"})
+
+        if mode != "sequential" and self.config.get("section_coherence_pass", False):
+            self.apply_section_coherence_pass(section_data_list, final_title, errors)
+
+        content_parts = []
+        for i, section_data in enumerate(section_data_list):
+            if results[i] is not None:
+                # 섹션 HTML 생성 (이미지 없이)
+                content_parts.append(self.create_section_html_without_image(section_data))
+            else:
+                content_parts.append(f"<h2>{section_titles[i]}</h2>\n<p>이 섹션의 내용을 생성하는 중 오류가 발생했습니다.</p>")
+        return section_data_list, content_parts
+
+    def apply_section_coherence_pass(self, section_data_list, final_title, errors=None):
+        """병렬 생성된 섹션들 사이에 짧은 연결 문장을 추가하는 1회 GPT 보정 단계"""
+        try:
+            targets = [
+                i for i in range(1, len(section_data_list))
+                if not (errors and errors[i] is not None)
+            ]
+            if not targets:
+                return
+            summaries = []
+            for i, section_data in enumerate(section_data_list):
+                plain = re.sub(r'<[^>]+>', '', section_data.get("content", "")).strip()
+                summaries.append(f"{i+1}. {section_data.get('section_title', '')}: {plain[:150]}")
+
+            prompt = f"""
+'{final_title}' 블로그 글의 섹션들이 따로 작성되었습니다. 아래 섹션 요약을 보고,
+섹션 {', '.join(str(i+1) for i in targets)}의 맨 앞에 붙일 자연스러운 연결 문장을 한 문장씩 작성하세요.
+
+{chr(10).join(summaries)}
+
+- 각 문장은 60자 이내, 경어체
+- 앞 섹션 내용을 반복하지 말고 흐름만 이어주세요
+- JSON만 출력: {{"transitions": {{"섹션번호": "연결 문장"}}}}
+"""
+            response_text = self.gpt(user_content=prompt, temperature=0.3, max_tokens=400)
+            json_block = self.extract_json_from_text(response_text)
+            if not json_block:
+                print("⚠️ 섹션 연결 보정 응답에서 JSON을 찾지 못해 건너뜁니다")
+                return
+            transitions = json5.loads(json_block).get("transitions", {})
+            applied = 0
+            for i in targets:
+                sentence = str(transitions.get(str(i + 1), "")).strip()
+                if sentence:
+                    section_data_list[i]["content"] = f"<p>{sentence}</p>\n" + section_data_list[i]["content"]
+                    applied += 1
+            print(f"✅ 섹션 연결 보정 완료: {applied}개 섹션")
+        except Exception as e:
+            print(f"⚠️ 섹션 연결 보정 실패 (원문 유지): {e}")
+
+    def build_post_passage_index(self, organized_data, collected_data):
+        """글 1개 분량의 섹션 검색용 문단 인덱스 생성 (정리된 데이터 + 수집 원문, 실패 시 None)"""
+        if not organized_data and not collected_data:
+            return None
+        try:
+            index = PassageIndex.from_text(f"{organized_data or ''}\n\n{collected_data or ''}")
+            print(f"📚 섹션 검색용 문단 인덱스 생성: {len(index)}개 문단")
+            return index if len(index) else None
+        except Exception as e:
+            print(f"⚠️ 문단 인덱스 생성 실패 (정리된 데이터만 사용): {e}")
+            return None
+
+    def retrieve_section_passages(self, section_title, keyword):
+        """섹션 제목(가중치 2)과 키워드로 상위 문단 검색 (section_context_top_k개, section_context_token_budget 토큰 이내)"""
+        index = getattr(self, 'post_passage_index', None)
+        if index is None:
+            return []
+        try:
+            return index.select_texts(
+                [(section_title, 2.0), (keyword, 1.0)],
+                token_budget=self.config.get("section_context_token_budget", 120),
+                top_k=self.config.get("section_context_top_k", 2),
+            )
+        except Exception as e:
+            print(f"⚠️ 섹션 문단 검색 실패: {e}")
+            return []
+
     def collect_web_data_for_section(self, section_title, keyword, clean_trimmed_text):
         """섹션별 데이터 제공 (이미 정리된 데이터 사용)"""
         try:
@@ -2426,6 +2934,20 @@ class GPTChatUI(QWidget):
             # 이미 정리된 데이터 사용 (별도 수집 없음)
             organized_data = getattr(self, 'collected_web_data', '')
             
+            # 섹션 제목과 관련된 문단을 글 단위 인덱스에서 검색 (섹션별 토큰 예산 이내)
+            passages = self.retrieve_section_passages(section_title, keyword)
+            if passages:
+                result = {
+                    "search_keywords": keyword,  # 사용자 검색어 그대로 사용
+                    "web_contents": passages,  # 섹션 관련 문단 (예산 적용 완료)
+                    "budgeted": True,
+                    "urls": getattr(self, 'collected_urls', [f"https://www.bing.com/search?q={keyword}"]),
+                    "titles": [f"{section_title} 관련 정보"]
+                }
+                
+                print(f"✅ 섹션 데이터 준비 완료: 관련 문단 {len(passages)}개 ({sum(len(p) for p in passages)}자)")
+                return result
+            
             if organized_data:
                 # 정리된 데이터를 섹션별로 활용
                 result = {
@@ -2478,7 +3000,9 @@ class GPTChatUI(QWidget):
                 ],
                 primary_model=self.config.get("chat_model", "gpt-5-mini"),
                 temperature=0.3,
-                max_tokens=50
+                max_tokens=50,
+                cacheable=True,
+                cache_validator=lambda text: len(re.sub(r'[^\w가-힣]', '', text)) >= 2,
             )
             
             generated_keywords = response.choices[0].message.content.strip()
@@ -2509,11 +3033,44 @@ class GPTChatUI(QWidget):
             fallback_keywords = ' '.join(fallback_keywords.split()[:3])
             return fallback_keywords
 
-    def organize_collected_data_with_gpt(self, keyword, collected_data):
-        """수집된 데이터를 GPT로 정리하는 함수"""
+    def dedupe_collected_data(self, collected_data):
+        """수집 데이터에서 유사 중복 문단 제거 (실패 시 원본 그대로)"""
+        try:
+            deduped, removed = dedupe_text_blocks(collected_data)
+            if removed:
+                message = f"🧹 유사 중복 문단 {removed}개 제거: {len(collected_data)}자 → {len(deduped)}자"
+                self.chat_log.append(message + "\n")
+                print(message)
+            return deduped
+        except Exception as e:
+            print(f"⚠️ 중복 문단 제거 실패 (원본 사용): {e}")
+            return collected_data
+
+    def pack_collected_data(self, keyword, collected_data, queries=None):
+        """수집 데이터를 키워드/추가 질의와 관련 있는 문단 위주로 토큰 예산에 맞게 압축 (실패 시 앞에서부터 8000자)"""
+        try:
+            token_budget = self.config.get("organize_context_token_budget", 4000)
+            # 사용자 키워드를 가장 중요하게, 검색어/섹션 제목은 보조 질의로 사용
+            weighted_queries = [(keyword, 2.0)] + [(q, 1.0) for q in (queries or []) if q]
+            packed, stats = pack_context(collected_data, weighted_queries, token_budget=token_budget)
+            message = (f"📦 컨텍스트 압축: {stats['original_tokens']}토큰 → {stats['packed_tokens']}토큰 "
+                       f"({stats['ratio']:.0%}, 문단 {stats['selected']}/{stats['passages']}개, 관련 {stats['relevant']}개)")
+            self.chat_log.append(message + "\n")
+            print(message)
+            return packed
+        except Exception as e:
+            print(f"⚠️ 컨텍스트 압축 실패 (앞부분 사용): {e}")
+            return collected_data[:8000]
+
+    def organize_collected_data_with_gpt(self, keyword, collected_data, queries=None):
+        """수집된 데이터를 GPT로 정리하는 함수 (queries: 관련 문단 선별에 함께 쓸 검색어/섹션 제목)"""
         try:
             print(f"🤖 수집된 데이터 정리 중: {len(collected_data)}자")
             
+            # 여러 출처에 반복된 거의 같은 문단 제거 (같은 글자 수 안에 더 많은 정보가 들어가도록)
+            collected_data = self.dedupe_collected_data(collected_data)
+            packed_data = self.pack_collected_data(keyword, collected_data, queries)
+            
             prompt = f"""
                     다음은 웹에서 수집된 원본 데이터입니다. 이 데이터를 사용자 요청 사항 중심으로 정리해주세요.
 
@@ -2527,7 +3084,7 @@ class GPTChatUI(QWidget):
                     - 문단별로 구분하여 정리
 
                     📄 **수집된 원본 데이터**:
-                    {collected_data[:8000]}
+                    {packed_data}
 
                     정리된 데이터만 출력해주세요 (설명 없이):
                     """
@@ -2588,8 +3145,8 @@ class GPTChatUI(QWidget):
             # 사용자가 입력한 이미지 프롬프트 요청사항 가져오기
             image_requirements = self.config.get("image_prompt_requirements", "")
             
-            # 콘텐츠 타입 확인
-            content_type = self.content_type_combo.currentText()
+            # 콘텐츠 타입 확인 (작업 스레드에서 호출되므로 설정값 사용)
+            content_type = self.config.get("content_type", "블로그")
             
             if content_type == "소설":
                 # 소설용 이미지 프롬프트
@@ -2759,6 +3316,51 @@ class GPTChatUI(QWidget):
                 "content": image_prompt.strip()
             }
 
+    def generate_section_image_stage(self, section_data, i, section_titles):
+        """섹션 1개의 이미지 단계 (이미지 프롬프트 GPT 호출 → 이미지 검색/생성 → 업로드)
+        섹션 텍스트가 완성되는 즉시 백그라운드 스레드에서 실행됨"""
+        if not self.wait_if_paused():
+            return None
+        # 섹션 내용을 토대로 이미지 프롬프트 생성
+        image_prompt = self.generate_image_prompt_from_content(section_data)
+        if not self.wait_if_paused():
+            return None
+        # 이미지 생성 (동시 배치 시 이미지 서비스 동시 실행 수 제한)
+        with self.service_limiter.slot("image"):
+            image_url = self.generate_section_image_with_prompt(section_data, image_prompt, i, section_titles)
+        print(f"✅ 섹션 {i+1} 이미지 생성 완료 (이미지: {'있음' if image_url else '없음'})")
+        return image_url
+
+    def collect_streamed_section_images(self, image_futures, image_executor, section_data_list, section_titles):
+        """백그라운드 이미지 단계 결과를 섹션 순서대로 수집하는 함수
+        텍스트 생성에 실패한 섹션은 대체 내용 기준으로 이 시점에 이미지 단계를 시작함
+        Returns:
+            list: 섹션별 이미지 URL 리스트 (중지 요청 시 None)
+        """
+        for i, section_data in enumerate(section_data_list):
+            if i not in image_futures:
+                image_futures[i] = submit_with_context(
+                    image_executor, self.generate_section_image_stage, section_data, i, section_titles
+                )
+
+        image_urls = []
+        for i in range(len(section_data_list)):
+            future = image_futures[i]
+            # 중지 요청을 주기적으로 확인하면서 대기
+            while True:
+                if self.should_stop or self._stop_event.is_set():
+                    return None
+                try:
+                    image_urls.append(future.result(timeout=0.5))
+                    break
+                except FutureTimeoutError:
+                    continue
+                except Exception as e:
+                    print(f"❌ 섹션 {i+1} 이미지 생성 실패: {e}")
+                    image_urls.append(None)
+                    break
+        return image_urls
+
     def generate_section_image_with_prompt(self, section_data, image_prompt, i, section_titles):
         """이미지 프롬프트를 사용하여 섹션별 이미지를 생성하는 함수"""
         image_url = None
@@ -2939,6 +3541,8 @@ class GPTChatUI(QWidget):
                 primary_model=self.config.get("chat_model", "gpt-5-mini"),
                 temperature=0.0,
                 max_tokens=50,
+                cacheable=True,
+                cache_validator=lambda text: len(re.sub(r"[^\w가-힣]", "", text)) >= 2,
             )
 
             query = response.choices[0].message.content.strip()
@@ -2985,28 +3589,12 @@ class GPTChatUI(QWidget):
         print(f"🖼️ [{i+1}] 섹션 이미지 생성 중...")
         
         try:
-            from full_screenshot.full_screenshot_gpu import download_top_bing_images_grid_match, load_blip_model
+            from full_screenshot.full_screenshot_gpu import download_top_bing_images_grid_match
             import os
-            import torch
-            
-            # BLIP 모델 로딩
-            if not hasattr(self, "_blip_cached"):
-                print("📦 BLIP 모델 로딩 중 (초기 1회)...")
-                processor, model = load_blip_model()
-                # GPU 우선 설정
-                use_gpu = self.config.get("use_gpu_for_images", True) and torch.cuda.is_available()
-                if use_gpu:
-                    try:
-                        model = model.to("cuda")
-                        os.environ.setdefault("CUDA_DEVICE_ORDER", "PCI_BUS_ID")
-                        print("✅ BLIP 모델을 CUDA로 이동 완료")
-                    except Exception as move_e:
-                        print(f"⚠️ BLIP CUDA 이동 실패, CPU 사용: {move_e}")
-                # 캐시 보관
-                self._blip_cached = (processor, model)
-            else:
-                processor, model = self._blip_cached
-                print("♻️ BLIP 모델 캐시 재사용")
+            
+            # BLIP 모델: 시작 시 백그라운드에서 로드된 상주 모델 사용 (아직 로딩 중이면 완료까지 대기)
+            blip_service = self.get_blip_service()
+            processor, model = blip_service.get_model()
             
             # Bing 검색어: GPT-4o-mini로 생성한 최적 검색어 사용
             search_query = self.generate_optimal_image_search_query(section_data)
@@ -3014,18 +3602,44 @@ class GPTChatUI(QWidget):
             print(f"🔍 Bing 검색어: {search_query}")
             
             # Bing 이미지 검색 및 그리드 생성
-            result = download_top_bing_images_grid_match(
-                search_query=search_query,  # 전체 이미지 프롬프트를 검색어로 사용
-                max_images=bing_image_count,  # 설정된 Bing 이미지 개수 사용
-                target_width=1024,
-                output_filename=f"bing_grid_section_{i+1}.png",
-                processor=processor,
-                model=model,
-                used_image_urls=getattr(self, 'used_image_urls', set())
-            )
+            # 매칭마다 URL 예약 집합을 넘기고 락 없이 실행 → 동시에 매칭 중인 섹션/글의 BLIP 추론이 한 배치로 묶임
+            store = get_image_fingerprint_store()
+            result = None
+            for attempt in range(GRID_HISTORY_RETRIES + 1):
+                reserved = self.used_image_urls.view(store)
+                captured = ImageCapturingProcessor(processor)
+                try:
+                    with blip_service.session():
+                        result = download_top_bing_images_grid_match(
+                            search_query=search_query,  # 전체 이미지 프롬프트를 검색어로 사용
+                            max_images=bing_image_count,  # 설정된 Bing 이미지 개수 사용
+                            target_width=1024,
+                            output_filename=f"bing_grid_{current_post_tag()}section_{i+1}.png",
+                            processor=captured,
+                            model=model,
+                            used_image_urls=reserved
+                        )
+                except Exception:
+                    self.used_image_urls.finish(reserved)
+                    raise
+                selected = self._grid_selected_images(result, reserved, captured) if result and "grid_path" in result else []
+                # 다른 섹션이 동시에 고른 URL, 이전 글에서 쓴 이미지는 거절
+                rejected = [url for url, _ in selected if url in reserved.conflicts]
+                if not rejected and store is not None and selected:
+                    rejected = self._check_grid_history(store, selected, search_query)
+                if not rejected:
+                    self.used_image_urls.finish(reserved, used=[url for url, _ in selected])
+                    break
+                # 거절된 URL만 사용 처리해 제외하고, 나머지 예약은 해제한 뒤 다시 매칭
+                self.used_image_urls.finish(reserved, used=rejected)
+                result = None
+                if attempt < GRID_HISTORY_RETRIES:
+                    print(f"♻️ 섹션 {i+1} 중복 이미지 {len(rejected)}장 → 다시 매칭 ({attempt + 1}/{GRID_HISTORY_RETRIES})")
+                else:
+                    print(f"⚠️ 섹션 {i+1} {GRID_HISTORY_RETRIES}회 다시 매칭해도 중복 이미지 {len(rejected)}장 → 이미지 생략")
             
             if result and "grid_path" in result:
-                local_path = f"bing_grid_section_{i+1}.png"
+                local_path = f"bing_grid_{current_post_tag()}section_{i+1}.png"
                 if os.path.exists(local_path):
                     print(f"✅ 섹션 {i+1} 이미지 그리드 생성 완료: {local_path}")
                     
@@ -3042,7 +3656,7 @@ class GPTChatUI(QWidget):
                 else:
                     print(f"❌ 섹션 {i+1} 이미지 파일이 생성되지 않았습니다")
             else:
-                print(f"❌ 섹션 {i+1} 이미지 검색 결과가 없습니다")
+                print(f"❌ 섹션 {i+1} 이미지 검색 결과가 없습니다 (또는 이전 글과 겹치지 않는 이미지를 찾지 못함)")
                 
         except Exception as e:
             print(f"❌ 섹션 {i+1} 이미지 생성 중 오류: {e}")
@@ -3050,6 +3664,55 @@ class GPTChatUI(QWidget):
         
         return None
 
+    def _grid_selected_images(self, result, reserved, captured):
+        """
+        그리드에 들어간 (URL, 이미지) 목록 (URL은 결과의 images 목록, 없으면 이번 매칭에서 add()한 URL)
+        이미지는 매칭 함수가 이미 디코딩한 것을 재사용: 결과 항목의 image, 없으면 processor에 넘어온 이미지를
+        후보 확인 순서와 짝지음 (확인한 후보 수와 이미지 수가 같을 때만, 짝을 못 찾으면 None)
+        """
+        items = [item for item in result.get("images") or [] if isinstance(item, dict) and item.get("url")]
+        pairs = [(item["url"], item.get("image")) for item in items] or [(url, None) for url in reserved]
+        decoded = {}
+        if len(reserved.checked) == len(captured.images):
+            decoded = dict(zip(reserved.checked, captured.images))
+        return [
+            (url, img if hasattr(img, "convert") else decoded.get(url))
+            for url, img in pairs
+        ]
+
+    def _check_grid_history(self, store, selected, keyword):
+        """
+        그리드에 들어간 이미지의 지문을 이력과 비교 (모두 새 이미지일 때만 이력에 기록)
+        매칭 중 디코딩된 이미지가 없는 항목만 다시 받고, 그래도 못 받은 이미지는 URL만 기록
+
+        Args:
+            store (ImageFingerprintStore): 이미지 이력 저장소
+            selected (list): 그리드에 들어간 (URL, PIL.Image 또는 None) 목록
+            keyword (str): 검색어 (이력 기록용)
+
+        Returns:
+            list: 거절된 URL 목록
+        """
+        try:
+            missing = [url for url, img in selected if img is None]
+            if missing:
+                from utils import download_image_capped
+                with ThreadPoolExecutor(max_workers=min(8, len(missing)), thread_name_prefix="grid-history") as executor:
+                    downloaded = dict(zip(missing, executor.map(download_image_capped, missing)))
+                selected = [(url, img if img is not None else downloaded.get(url)) for url, img in selected]
+                unavailable = sum(1 for _, img in selected if img is None)
+                print(f"📥 그리드 이미지 {len(missing)}장 지문용 다운로드 (실패 {unavailable}장은 URL만 기록)")
+            rejected = store.check_and_add_many(selected, source="bing_grid", keyword=keyword)
+        except Exception as e:
+            # 지문을 못 구해도 URL 이력은 남겨 이후 글에서 같은 URL을 쓰지 않게 함
+            print(f"⚠️ 그리드 이미지 이력 확인 실패 (URL만 기록): {e}")
+            for url, _ in selected:
+                store.add(url=url, source="bing_grid", keyword=keyword)
+            return []
+        for url, previous in rejected:
+            print(f"⚠️ 이전 글에서 사용한 이미지와 동일 (pHash 거리 {previous.get('distance')}): {url}")
+        return [url for url, _ in rejected]
+
     def generate_bing_sora_image(self, section_data, i, bing_image_count):
         """Bing+Sora 이미지를 생성하는 함수"""
         self.chat_log.append(f"🎬 [{i+1}] 섹션 Bing+Sora 이미지 생성 중...\n")
@@ -3268,12 +3931,9 @@ class GPTChatUI(QWidget):
             print(f"   - Pinterest 이미지: {use_pinterest_image}")
             print(f"   - Bing 이미지: {use_bing_image}")
 
-            # bo_table과 ca_name 가져오기
-            bo_table = getattr(self, 'bo_table_combo', None)
-            ca_name = getattr(self, 'ca_name_combo', None)
-            
-            bo_table_value = bo_table.currentText() if bo_table else "free"
-            ca_name_value = ca_name.currentText() if ca_name else "일반"
+            # bo_table과 ca_name 가져오기 (작업 스레드에서 호출되므로 저장된 설정값 사용)
+            bo_table_value = self.config.get("bo_table", "free")
+            ca_name_value = self.config.get("ca_name", "일반")
             
             print(f"🔧 카테고리 설정:")
             print(f"   - bo_table: {bo_table_value}")
@@ -3422,16 +4082,59 @@ class GPTChatUI(QWidget):
             return False
 
     def send_to_gpt(self, keyword):
-        """메인 GPT 글 생성 함수"""
+        """메인 GPT 글 생성 함수 (글 준비 → 업로드)"""
+        with post_scope():
+            post = self.prepare_post(keyword)
+        if not post:
+            return
+        # 업로드 직전 중지/일시정지 확인
+        if not self.wait_if_paused():
+            self.chat_log.append("🛑 중지 요청으로 업로드를 건너뜁니다.\n")
+            print("🛑 중지 요청으로 업로드를 건너뜁니다.")
+            return
+        self.publish_post(post)
+
+    def reset_used_media_urls(self):
+        """새 글(또는 새 배치) 시작 시 sora_bing_handler의 사용된 미디어 URL 초기화"""
         try:
-            # 새로운 글 시작 시 사용된 미디어 URL 초기화
-            try:
-                from sora_bing_handler import reset_used_media_urls
-                reset_used_media_urls()
-                self.chat_log.append("🔄 새로운 글 시작 - 사용된 미디어 URL 초기화 완료\n")
-                print("🔄 새로운 글 시작 - 사용된 미디어 URL 초기화 완료")
-            except ImportError as e:
-                print(f"⚠️ sora_bing_handler 모듈 import 실패: {e}")
+            from sora_bing_handler import reset_used_media_urls
+            reset_used_media_urls()
+            self.chat_log.append("🔄 새로운 글 시작 - 사용된 미디어 URL 초기화 완료\n")
+            print("🔄 새로운 글 시작 - 사용된 미디어 URL 초기화 완료")
+        except ImportError as e:
+            print(f"⚠️ sora_bing_handler 모듈 import 실패: {e}")
+
+    def publish_post(self, post):
+        """prepare_post 결과를 블로그에 업로드하고 MySQL에 저장하는 함수"""
+        try:
+            # 블로그 업로드
+            if self.config["tistory_enabled"]:
+                self.chat_log.append("📝 티스토리에 업로드 중...\n")
+                print("📝 티스토리에 업로드 중...")
+                # 여기에 티스토리 업로드 로직 추가
+
+            # 네이버 업로드 (GPT 추천 카테고리 사용)
+            self.upload_to_naver(post["title"], post["content"], post["category"], post["keyword"])
+
+            # MySQL 저장 (GPT 추천 카테고리 사용)
+            self.save_to_mysql(post["title"], post["content"], post["category"], post["keyword"])
+
+            self.chat_log.append("✅ 글 생성 및 업로드 완료!\n")
+            print("✅ 글 생성 및 업로드 완료!")
+        except Exception as e:
+            self.chat_log.append(f"❌ 업로드 중 오류: {e}\n")
+            print(f"❌ 업로드 중 오류: {e}")
+
+    def prepare_post(self, keyword):
+        """글 준비 함수 (웹 수집 → 정리 → 개요 → 섹션 → 이미지), 업로드는 하지 않음
+        Returns:
+            dict: {"title", "content", "category", "keyword"} (중지/실패 시 None)
+        """
+        try:
+            # 새로운 글 시작 시 사용된 미디어 URL 초기화 (동시 배치에서는 배치 시작 시 1회)
+            state = current_post_state()
+            if not (state and state.get("batch")):
+                self.reset_used_media_urls()
             
             # 쿠팡 상품 옵션 확인 (자동 수집이 활성화되어 있으면 항상 사용)
             coupang_enabled = True  # 자동 수집 시 항상 쿠팡 상품 사용
@@ -3454,12 +4157,13 @@ class GPTChatUI(QWidget):
                     self.chat_log.append("⚠️ 쿠팡 상품을 찾을 수 없어 기본 키워드를 사용합니다.\n")
                     print("⚠️ 쿠팡 상품을 찾을 수 없어 기본 키워드를 사용합니다.")
             
-            # 콘텐츠 타입 확인
-            content_type = self.content_type_combo.currentText()
+            # 콘텐츠 타입 확인 (작업 스레드에서 위젯 대신 설정값 사용)
+            content_type = self.config.get("content_type", "블로그")
             
             # 모든 모드에서 웹 데이터 수집 수행 (블로그 모드와 동일한 구조)
             self.chat_log.append(f"🔍 {content_type} 모드 - 웹 데이터 수집을 시작합니다...\n")
             print(f"🔍 {content_type} 모드 - 웹 데이터 수집을 시작합니다...")
+            self.post_passage_index = None
             
             try:
                 import sys
@@ -3485,7 +4189,8 @@ class GPTChatUI(QWidget):
                 print(f"🔍 '{search_keywords}' 구글/빙 검색 중 (크롬 드라이버)...")
                 
                 # URL도 함께 수집
-                collected_data, urls = web_search_collect(search_keywords, max_results=10, return_urls=True)
+                with self.service_limiter.slot("web_search"):
+                    collected_data, urls = web_search_collect(search_keywords, max_results=10, return_urls=True)
                 self.collected_urls = urls
                 print(f"🔗 수집된 URL 목록: {urls}")
                 
@@ -3502,11 +4207,12 @@ class GPTChatUI(QWidget):
                 if collected_data and len(collected_data) >= 100:
                     self.chat_log.append("🤖 수집된 데이터를 GPT로 정리합니다...\n")
                     print("🤖 수집된 데이터를 GPT로 정리합니다...")
-                    organized_data = self.organize_collected_data_with_gpt(product_keyword, collected_data)
+                    organized_data = self.organize_collected_data_with_gpt(product_keyword, collected_data, queries=[search_keywords])
                     self.collected_web_data = organized_data  # 정리된 데이터 저장
                 else:
                     organized_data = collected_data
                     self.collected_web_data = organized_data
+                self.post_passage_index = self.build_post_passage_index(organized_data, collected_data)
                 
                 enhanced_keyword = product_keyword  # 상품명 사용
                 clean_trimmed_text = product_keyword  # clean_trimmed_text 정의
@@ -3524,8 +4230,9 @@ class GPTChatUI(QWidget):
                         self.collected_urls = urls
                     except:
                         self.collected_urls = []
-                    organized_data = self.organize_collected_data_with_gpt(product_keyword, collected_data)
+                    organized_data = self.organize_collected_data_with_gpt(product_keyword, collected_data, queries=[search_keywords])
                     self.collected_web_data = organized_data
+                    self.post_passage_index = self.build_post_passage_index(organized_data, collected_data)
                     enhanced_keyword = product_keyword
                     clean_trimmed_text = product_keyword
                 except:
@@ -3543,8 +4250,14 @@ class GPTChatUI(QWidget):
             self.chat_log.append("🤖 GPT에게 글 생성을 요청합니다...\n")
             print("🤖 GPT에게 글 생성을 요청합니다...")
             
-            # 사용자 입력 프롬프트 가져오기
-            user_prompt = self.input_box.text().strip()
+            # 중지/일시정지 확인 (웹 수집 단계 종료 시점)
+            if not self.wait_if_paused():
+                self.chat_log.append("🛑 중지 요청으로 글 생성을 중단합니다.\n")
+                print("🛑 중지 요청으로 글 생성을 중단합니다.")
+                return
+            
+            # 사용자 입력 프롬프트 가져오기 (파이프라인 시작 시 보관한 값)
+            user_prompt = self.pipeline_user_prompt
             
             # 콘텐츠 타입에 따른 프롬프트 생성 (프롬프트 템플릿 사용)
             try:
@@ -3780,15 +4493,17 @@ class GPTChatUI(QWidget):
 예시: GameNews
 """
                 
+                valid_ca_names = [item["ca_name"] for item in category_list]
                 recommended_category = self.gpt(
                     user_content=category_prompt,
                     system_content="블로그 포스트의 내용을 분석하여 가장 적합한 카테고리를 추천하는 전문가입니다.",
                     temperature=0.3,
                     max_tokens=50,
+                    cacheable=True,
+                    cache_validator=lambda text: text in valid_ca_names,
                 )
                 
                 # 추천된 카테고리가 유효한지 확인
-                valid_ca_names = [item["ca_name"] for item in category_list]
                 if recommended_category in valid_ca_names:
                     category = recommended_category
                     print(f"🤖 GPT 카테고리 추천: {category}")
@@ -3807,83 +4522,74 @@ class GPTChatUI(QWidget):
             print(f"📂 카테고리: {category}")
             print(f"🏷️ 키워드: {', '.join(keywords)}")
 
-            # 1단계: 모든 섹션 내용을 먼저 완성
-            content_parts = []
-            section_data_list = []  # 섹션 데이터 저장용
-            previous_sections_content = ""  # 이전 섹션들의 내용을 누적
-            
-            for i, section_title in enumerate(section_titles):
-                try:
-                    # 섹션 내용 생성 (이전 섹션 내용 포함)
-                    section_data = self.generate_section_content(section_title, final_title, keyword, clean_trimmed_text, i, previous_sections_content)
-                    section_data_list.append(section_data)
-                    
-                    # 섹션 HTML 생성 (이미지 없이)
-                    html = self.create_section_html_without_image(section_data)
-                    content_parts.append(html)
-                    
-                    # 이전 섹션 내용에 현재 섹션 내용 추가 (다음 섹션을 위해)
-                    if section_data and "content" in section_data:
-                        current_section_text = section_data["content"]
-                        # HTML 태그 제거하여 순수 텍스트만 추출
-                        import re
-                        clean_text = re.sub(r'<[^>]+>', '', current_section_text)
-                        previous_sections_content += f"\n\n{clean_text}"
-                    
-                    print(f"✅ 섹션 {i+1} 내용 생성 완료")
-                    print(f"📝 누적된 이전 내용 길이: {len(previous_sections_content)}자")
-                except Exception as e:
-                    print(f"❌ 섹션 {i+1} 내용 생성 실패: {e}")
-                    # 기본 내용으로 대체
-                    content_parts.append(f"<h2>{section_titles[i]}</h2>\n<p>이 섹션의 내용을 생성하는 중 오류가 발생했습니다.</p>")
-                    section_data_list.append({"section_title": section_titles[i], "content": "오류 발생"})
-            
-            # 2단계: 섹션 내용을 토대로 이미지 프롬프트 생성 및 이미지 생성
+            # 이미지 모드 확인 (bing/sora 등은 섹션 텍스트 완성 즉시 이미지 단계를 백그라운드로 시작)
             image_mode = self.config.get("image_source", "bing")
-            if image_mode == "none":
-                self.chat_log.append("🚫 이미지 생성 건너뜀 (옵션: none)\n")
-                print("🚫 이미지 생성 건너뜀 (옵션: none)")
-                image_urls = [None] * len(section_data_list)
-            elif image_mode == "coupang":
-                # 쿠팡 이미지 모드: 쿠팡 상품 이미지 사용 (첫 번째 섹션에만 1개)
-                self.chat_log.append("🛒 쿠팡 상품 이미지 사용 모드 (첫 번째 섹션에만 1개)\n")
-                print("🛒 쿠팡 상품 이미지 사용 모드 (첫 번째 섹션에만 1개)")
-                image_urls = []
-                if coupang_product:
-                    product_image = coupang_product.get("image", coupang_product.get("image_url", coupang_product.get("thumbnail", "")))
-                    # 첫 번째 섹션에만 쿠팡 상품 이미지 사용
-                    for i in range(len(section_data_list)):
-                        if i == 0:
-                            # 첫 번째 섹션에만 이미지 사용
-                            image_urls.append(product_image if product_image else None)
-                            print(f"✅ 섹션 {i+1} 쿠팡 상품 이미지 적용")
-                        else:
-                            # 나머지 섹션은 이미지 없음
-                            image_urls.append(None)
-                else:
-                    # 쿠팡 상품이 없으면 모든 섹션에 None
+            stream_images = image_mode not in ["none", "coupang"]
+            image_executor = None
+            image_futures = {}
+            on_section_done = None
+            if stream_images:
+                self.chat_log.append("🖼️ 섹션별 이미지 생성 시작 (텍스트 생성과 동시 진행)...\n")
+                print("🖼️ 섹션별 이미지 생성 시작 (텍스트 생성과 동시 진행)...")
+                image_executor = ThreadPoolExecutor(
+                    max_workers=max(1, int(self.config.get("image_pipeline_workers", 1))),
+                    thread_name_prefix="section-image",
+                )
+
+                def on_section_done(i, section_data, error):
+                    if error is None and section_data:
+                        image_futures[i] = submit_with_context(
+                            image_executor, self.generate_section_image_stage, section_data, i, section_titles
+                        )
+
+            # 1단계: 모든 섹션 내용 완성 (섹션 스케줄러: 순차/병렬 모드) + 완료된 섹션부터 이미지 단계 시작
+            try:
+                section_data_list, content_parts = self.generate_all_sections(
+                    section_titles, final_title, keyword, clean_trimmed_text, on_section_done=on_section_done
+                )
+                if not self.wait_if_paused():
+                    self.chat_log.append("🛑 중지 요청으로 글 생성을 중단합니다.\n")
+                    print("🛑 중지 요청으로 글 생성을 중단합니다.")
+                    return
+                
+                # 2단계: 이미지 준비 (스트리밍 이미지 단계는 결과만 순서대로 수집)
+                if image_mode == "none":
+                    self.chat_log.append("🚫 이미지 생성 건너뜀 (옵션: none)\n")
+                    print("🚫 이미지 생성 건너뜀 (옵션: none)")
                     image_urls = [None] * len(section_data_list)
-                    self.chat_log.append("⚠️ 쿠팡 상품 정보가 없어 이미지를 사용할 수 없습니다.\n")
-                    print("⚠️ 쿠팡 상품 정보가 없어 이미지를 사용할 수 없습니다.")
-            else:
-                self.chat_log.append("🖼️ 섹션별 이미지 생성 시작...\n")
-                print("🖼️ 섹션별 이미지 생성 시작...")
-            
-            if image_mode not in ["none", "coupang"]:
-                image_urls = []
-                for i, section_data in enumerate(section_data_list):
-                    try:
-                        # 섹션 내용을 토대로 이미지 프롬프트 생성
-                        image_prompt = self.generate_image_prompt_from_content(section_data)
-                        
-                        # 이미지 생성
-                        image_url = self.generate_section_image_with_prompt(section_data, image_prompt, i, section_titles)
-                        image_urls.append(image_url)
-                        
-                        print(f"✅ 섹션 {i+1} 이미지 생성 완료 (이미지: {'있음' if image_url else '없음'})")
-                    except Exception as e:
-                        print(f"❌ 섹션 {i+1} 이미지 생성 실패: {e}")
-                        image_urls.append(None)
+                elif image_mode == "coupang":
+                    # 쿠팡 이미지 모드: 쿠팡 상품 이미지 사용 (첫 번째 섹션에만 1개)
+                    self.chat_log.append("🛒 쿠팡 상품 이미지 사용 모드 (첫 번째 섹션에만 1개)\n")
+                    print("🛒 쿠팡 상품 이미지 사용 모드 (첫 번째 섹션에만 1개)")
+                    image_urls = []
+                    if coupang_product:
+                        product_image = coupang_product.get("image", coupang_product.get("image_url", coupang_product.get("thumbnail", "")))
+                        # 첫 번째 섹션에만 쿠팡 상품 이미지 사용
+                        for i in range(len(section_data_list)):
+                            if i == 0:
+                                # 첫 번째 섹션에만 이미지 사용
+                                image_urls.append(product_image if product_image else None)
+                                print(f"✅ 섹션 {i+1} 쿠팡 상품 이미지 적용")
+                            else:
+                                # 나머지 섹션은 이미지 없음
+                                image_urls.append(None)
+                    else:
+                        # 쿠팡 상품이 없으면 모든 섹션에 None
+                        image_urls = [None] * len(section_data_list)
+                        self.chat_log.append("⚠️ 쿠팡 상품 정보가 없어 이미지를 사용할 수 없습니다.\n")
+                        print("⚠️ 쿠팡 상품 정보가 없어 이미지를 사용할 수 없습니다.")
+                else:
+                    image_urls = self.collect_streamed_section_images(
+                        image_futures, image_executor, section_data_list, section_titles
+                    )
+                    if image_urls is None:
+                        self.chat_log.append("🛑 중지 요청으로 글 생성을 중단합니다.\n")
+                        print("🛑 중지 요청으로 글 생성을 중단합니다.")
+                        return
+            finally:
+                if image_executor is not None:
+                    # 중지 시 아직 시작하지 않은 이미지 작업은 취소
+                    image_executor.shutdown(wait=False, cancel_futures=True)
             
             # 3단계: 이미지를 섹션 제목 옆에 삽입 (none 모드일 땐 그대로 사용)
             final_content_parts = []
@@ -3947,29 +4653,21 @@ class GPTChatUI(QWidget):
                 self.chat_log.append(f"🖼️ 이미지 생성 완료: {image_count}/{total_sections} 섹션\n")
                 print(f"🖼️ 이미지 생성 완료: {image_count}/{total_sections} 섹션")
             
-            # 블로그 업로드
-            if self.config["tistory_enabled"]:
-                self.chat_log.append("📝 티스토리에 업로드 중...\n")
-                print("📝 티스토리에 업로드 중...")
-                # 여기에 티스토리 업로드 로직 추가
-            
+            # LLM/페이지 캐시 적중/미스 현황
+            self.log_llm_cache_stats()
+            self.log_page_cache_stats()
+
             # 네이버 업로드 및 MySQL 저장 시 keyword를 100자 내외로 제한
             safe_keyword = (keyword or "").strip()
             if len(safe_keyword) > 100:
                 safe_keyword = safe_keyword[:100]
 
-            # 네이버 업로드 (GPT 추천 카테고리 사용)
-            self.upload_to_naver(title, content, category, safe_keyword)
-            
-            # MySQL 저장 (GPT 추천 카테고리 사용)
-            self.save_to_mysql(title, content, category, safe_keyword)
-            
-            self.chat_log.append("✅ 글 생성 및 업로드 완료!\n")
-            print("✅ 글 생성 및 업로드 완료!")
+            return {"title": title, "content": content, "category": category, "keyword": safe_keyword}
             
         except Exception as e:
             self.chat_log.append(f"❌ JSON 파싱 오류: {e}\n")
             print(f"❌ JSON 파싱 오류: {e}")
+            return None
 
     def toggle_auto_trends(self, state):
         """자동 트렌드 수집 토글"""
@@ -4163,45 +4861,22 @@ class GPTChatUI(QWidget):
             self.config["ad_link"] = self.ad_link_input.text().strip()
             self.save_config()
             
-            # 실행 상태 업데이트
-            self.is_running = True
-            self.pause_button.setEnabled(True)
-            self.stop_button.setEnabled(True)
-            self.multi_search_button.setEnabled(False)
-            
-            # 각 키워드에 대해 GPT로 글 생성
-            for i, keyword in enumerate(keywords, 1):
-                if self.should_stop:
-                    break
-                    
-                while self.is_paused:
-                    time.sleep(0.1)
-                    if self.should_stop:
-                        break
-                
-                self.chat_log.append(f"📝 [{i}/{len(keywords)}] 키워드 '{keyword}' 처리 중...\n")
-                print(f"📝 [{i}/{len(keywords)}] 키워드 '{keyword}' 처리 중...")
-                self.send_to_gpt(keyword)
-                
-                # 키워드 간 간격 (설정된 분 단위, 일시정지/중지 반영)
-                if i < len(keywords) and not self.should_stop:
-                    self.sleep_with_controls(minutes=self.config.get("post_interval_minutes", 1))
-            
-            # 실행 완료
-            self.is_running = False
-            self.pause_button.setEnabled(False)
-            self.stop_button.setEnabled(False)
-            self.multi_search_button.setEnabled(True)
-            self.chat_log.append("✅ 자동 멀티 검색 완료!\n")
-            print("✅ 자동 멀티 검색 완료!")
-            # 다음 수집 시간은 '멀티검색 완료' 시점부터 카운트다운 시작
-            try:
-                if self.auto_trends_thread:
-                    self.auto_trends_thread.schedule_next_after_completion()
-                    # 카운트다운 라벨 즉시 업데이트
-                    QTimer.singleShot(100, self.update_next_collection_time)
-            except Exception as sched_e:
-                print(f"⚠️ 다음 수집 예약 실패: {sched_e}")
+            def on_complete(stopped):
+                if stopped:
+                    return
+                self.chat_log.append("✅ 자동 멀티 검색 완료!\n")
+                print("✅ 자동 멀티 검색 완료!")
+                # 다음 수집 시간은 '멀티검색 완료' 시점부터 카운트다운 시작
+                try:
+                    if self.auto_trends_thread:
+                        self.auto_trends_thread.schedule_next_after_completion()
+                        # 카운트다운 라벨 즉시 업데이트
+                        QTimer.singleShot(100, self.update_next_collection_time)
+                except Exception as sched_e:
+                    print(f"⚠️ 다음 수집 예약 실패: {sched_e}")
+
+            # 각 키워드에 대해 작업 스레드에서 GPT로 글 생성
+            self.start_pipeline(keywords, on_complete=on_complete)
             
         except Exception as e:
             self.chat_log.append(f"❌ 자동 멀티 검색 중 오류: {str(e)}\n")
@@ -4400,46 +5075,22 @@ class GPTChatUI(QWidget):
             # 쿠팡 상품 이미지 및 링크 설정은 이미 저장됨
             self.save_config()
             
-            # 실행 상태 업데이트
-            self.is_running = True
-            self.pause_button.setEnabled(True)
-            self.stop_button.setEnabled(True)
-            self.multi_search_button.setEnabled(False)
-            
-            # 각 상품(키워드)에 대해 GPT로 글 생성
-            for i, keyword in enumerate(keywords, 1):
-                if self.should_stop:
-                    break
-                    
-                while self.is_paused:
-                    time.sleep(0.1)
-                    if self.should_stop:
-                        break
-                
-                self.chat_log.append(f"📝 [{i}/{len(keywords)}] 상품 '{keyword}' 글 작성 중...\n")
-                print(f"📝 [{i}/{len(keywords)}] 상품 '{keyword}' 글 작성 중...")
-                self.send_to_gpt(keyword)
-                
-                # 상품 간 간격 (설정된 분 단위, 일시정지/중지 반영)
-                if i < len(keywords) and not self.should_stop:
-                    self.sleep_with_controls(minutes=self.config.get("post_interval_minutes", 1))
-            
-            # 실행 완료
-            self.is_running = False
-            self.pause_button.setEnabled(False)
-            self.stop_button.setEnabled(False)
-            self.multi_search_button.setEnabled(True)
-            self.chat_log.append("✅ 쿠팡 상품 기반 글 작성 완료!\n")
-            print("✅ 쿠팡 상품 기반 글 작성 완료!")
-            
-            # 다음 수집 시간은 '글 작성 완료' 시점부터 카운트다운 시작
-            try:
-                if self.auto_coupang_thread:
-                    self.auto_coupang_thread.schedule_next_after_completion()
-                    # 카운트다운 라벨 즉시 업데이트
-                    QTimer.singleShot(100, self.update_next_coupang_collection_time)
-            except Exception as sched_e:
-                print(f"⚠️ 다음 수집 예약 실패: {sched_e}")
+            def on_complete(stopped):
+                if stopped:
+                    return
+                self.chat_log.append("✅ 쿠팡 상품 기반 글 작성 완료!\n")
+                print("✅ 쿠팡 상품 기반 글 작성 완료!")
+                # 다음 수집 시간은 '글 작성 완료' 시점부터 카운트다운 시작
+                try:
+                    if self.auto_coupang_thread:
+                        self.auto_coupang_thread.schedule_next_after_completion()
+                        # 카운트다운 라벨 즉시 업데이트
+                        QTimer.singleShot(100, self.update_next_coupang_collection_time)
+                except Exception as sched_e:
+                    print(f"⚠️ 다음 수집 예약 실패: {sched_e}")
+
+            # 각 상품(키워드)에 대해 작업 스레드에서 GPT로 글 생성
+            self.start_pipeline(keywords, item_label="상품", on_complete=on_complete)
             
         except Exception as e:
             self.chat_log.append(f"❌ 쿠팡 상품 기반 자동 글 작성 중 오류: {str(e)}\n")
@@ -4521,10 +5172,15 @@ class GPTChatUI(QWidget):
         web_data_section = ""
         if collected_data["web_contents"]:
             web_data_section = "참고할 웹 정보:\n"
-            for i, content in enumerate(collected_data["web_contents"][:2], 1):  # 상위 2개만 사용
-                # 각 내용을 100자로 제한
-                limited_content = content[:100] + "..." if len(content) > 100 else content
-                web_data_section += f"{i}. {limited_content}\n"
+            if collected_data.get("budgeted"):
+                # 섹션 관련 문단 검색 결과 (이미 섹션별 토큰 예산에 맞춰 선택됨)
+                for i, content in enumerate(collected_data["web_contents"], 1):
+                    web_data_section += f"{i}. {content}\n"
+            else:
+                for i, content in enumerate(collected_data["web_contents"][:2], 1):  # 상위 2개만 사용
+                    # 각 내용을 100자로 제한
+                    limited_content = content[:100] + "..." if len(content) > 100 else content
+                    web_data_section += f"{i}. {limited_content}\n"
         
         # 핵심 단어 링크 생성 (GPT가 본문에서 자동으로 링크 걸도록)
         url_section = ""
@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""
+HTML → 본문 텍스트 추출 엔진
+C 기반 파서(selectolax → lxml)를 우선 사용하고, 둘 다 없으면 BeautifulSoup(html.parser)로 동작한다.
+- 문서를 한 번만 순회하며 불필요한 요소(script/style/nav 등)는 건너뛰고,
+  본문 후보(article/main/.content 등) 중 가장 바깥 후보의 텍스트만 모아 가장 긴 것을 본문으로 선택
+  (중첩 후보는 바깥 후보 텍스트에 포함되므로 다시 get_text 하지 않음)
+- 백엔드는 register_backend()/set_default_backend()로 교체 가능
+- 정적 HTTP 응답은 extract_main_text_from_stream()으로 조각 단위로 파싱하여,
+  본문 텍스트가 max_length만큼 모이면 나머지 본문은 내려받지 않음 (다운로드 바이트 상한 포함)
+"""
+
+import os
+import re
+import codecs
+from html.parser import HTMLParser
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+try:
+    from lxml import etree as lxml_etree
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_etree = None
+    lxml_html = None
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+
+# 본문 영역 선택자 (앞에 있을수록 일반적인 본문 컨테이너)
+CONTENT_SELECTORS = [
+    'article', 'main', '.content', '.post-content', '.entry-content',
+    '.article-content', '.post-body', '.entry-body', '.main-content'
+]
+
+# 텍스트 추출에서 통째로 제외할 요소
+BOILERPLATE_TAGS = ('script', 'style', 'nav', 'header', 'footer', 'aside', 'noscript', 'template')
+
+_CONTENT_TAGS = frozenset(s for s in CONTENT_SELECTORS if not s.startswith('.'))
+_CONTENT_CLASSES = frozenset(s[1:] for s in CONTENT_SELECTORS if s.startswith('.'))
+_BOILERPLATE_SET = frozenset(BOILERPLATE_TAGS)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 스트리밍 추출: 응답 조각 크기 / 페이지당 최대 다운로드 바이트
+STREAM_CHUNK_SIZE = 16 * 1024
+DEFAULT_MAX_STREAM_BYTES = 2 * 1024 * 1024
+
+_HEADER_CHARSET_RE = re.compile(r'charset=["\']?([\w-]+)', re.I)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+
+
+def _finish(text, max_length):
+    """공백 정리 및 길이 제한 (기존 추출 결과와 같은 형식)"""
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    if len(text) > max_length:
+        text = text[:max_length] + "..."
+    return text
+
+
+def _is_content_candidate(tag, class_attr):
+    if tag in _CONTENT_TAGS:
+        return True
+    if class_attr and _CONTENT_CLASSES:
+        return any(name in _CONTENT_CLASSES for name in class_attr.split())
+    return False
+
+
+# ----------------------------------------------------------------------
+# selectolax (lexbor/modest, C)
+# ----------------------------------------------------------------------
+def _extract_selectolax(html, max_length):
+    tree = SelectolaxParser(html)
+    tree.strip_tags(list(BOILERPLATE_TAGS))
+
+    matches = tree.css(", ".join(CONTENT_SELECTORS))
+    match_ids = {node.mem_id for node in matches}
+    best = ""
+    for node in matches:
+        # 다른 후보 안에 들어 있는 후보는 바깥 후보보다 길 수 없으므로 건너뜀
+        parent = node.parent
+        nested = False
+        while parent is not None:
+            if parent.mem_id in match_ids:
+                nested = True
+                break
+            parent = parent.parent
+        if nested:
+            continue
+        text = node.text(deep=True, separator=' ', strip=True)
+        if len(text) > len(best):
+            best = text
+
+    if not best:
+        root = tree.body or tree.root
+        best = root.text(deep=True, separator=' ', strip=True) if root is not None else ""
+    return _finish(best, max_length)
+
+
+# ----------------------------------------------------------------------
+# lxml (libxml2, C) - iterwalk 한 번으로 전체 텍스트와 후보 텍스트를 함께 수집
+# ----------------------------------------------------------------------
+def _extract_lxml(html, max_length):
+    if isinstance(html, str) and html.lstrip().startswith('<?xml'):
+        # 인코딩 선언이 있는 str은 lxml이 거부하므로 바이트로 전달
+        html = html.encode('utf-8')
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (lxml_etree.ParserError, ValueError):
+        return ""
+
+    doc_parts = []
+    candidate = None
+    candidate_parts = None
+    best = ""
+    walker = lxml_etree.iterwalk(root, events=("start", "end"))
+    for event, element in walker:
+        tag = element.tag
+        is_element = isinstance(tag, str)
+        if event == "start":
+            if not is_element or tag.lower() in _BOILERPLATE_SET:
+                # 주석/처리 명령/불필요 요소는 하위 텍스트를 읽지 않음 (tail은 end에서 처리)
+                walker.skip_subtree()
+                continue
+            if candidate is None and _is_content_candidate(tag.lower(), element.get('class')):
+                candidate = element
+                candidate_parts = []
+            if element.text:
+                doc_parts.append(element.text)
+                if candidate is not None:
+                    candidate_parts.append(element.text)
+        else:
+            if element is candidate:
+                text = ' '.join(candidate_parts)
+                if len(text) > len(best):
+                    best = text
+                candidate = None
+                candidate_parts = None
+            if element.tail and element is not root:
+                doc_parts.append(element.tail)
+                if candidate is not None:
+                    candidate_parts.append(element.tail)
+
+    if not best.strip():
+        best = ' '.join(doc_parts)
+    return _finish(best, max_length)
+
+
+# ----------------------------------------------------------------------
+# BeautifulSoup (html.parser, 순수 Python) - 기존 구현
+# ----------------------------------------------------------------------
+def _extract_bs4(html, max_length):
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 불필요한 요소 제거
+    for element in soup(list(BOILERPLATE_TAGS)):
+        element.decompose()
+
+    # 주요 콘텐츠 영역 찾기
+    content_text = ""
+    for selector in CONTENT_SELECTORS:
+        for element in soup.select(selector):
+            text = element.get_text(separator=' ', strip=True)
+            if len(text) > len(content_text):
+                content_text = text
+
+    # 주요 콘텐츠를 찾지 못한 경우 전체 텍스트 사용
+    if not content_text:
+        content_text = soup.get_text(separator=' ', strip=True)
+    return _finish(content_text, max_length)
+
+
+_BACKENDS = {}
+if SelectolaxParser is not None:
+    _BACKENDS["selectolax"] = _extract_selectolax
+if lxml_html is not None:
+    _BACKENDS["lxml"] = _extract_lxml
+if BeautifulSoup is not None:
+    _BACKENDS["bs4"] = _extract_bs4
+
+if not _BACKENDS:
+    print("⚠️ HTML 파서(selectolax/lxml/bs4)가 없습니다. 웹 페이지 본문 추출을 사용할 수 없습니다.")
+
+_default_backend = os.environ.get("HTML_EXTRACT_BACKEND", "auto")
+
+
+def available_backends():
+    """사용 가능한 백엔드 이름 (우선순위 순)"""
+    return list(_BACKENDS)
+
+
+def register_backend(name, extract_fn):
+    """
+    추출 백엔드 등록
+
+    Args:
+        name (str): 백엔드 이름
+        extract_fn (callable): extract_fn(html, max_length) -> str
+    """
+    _BACKENDS[name] = extract_fn
+
+
+def set_default_backend(name):
+    """기본 백엔드 지정 ("auto"면 사용 가능한 가장 빠른 백엔드)"""
+    global _default_backend
+    name = (name or "auto").lower()
+    if name != "auto" and name not in _BACKENDS:
+        print(f"⚠️ HTML 추출 백엔드 '{name}' 사용 불가 - 자동 선택 ({', '.join(_BACKENDS) or '없음'})")
+        name = "auto"
+    _default_backend = name
+
+
+def resolve_backend(name=None):
+    """실제로 사용할 백엔드 이름"""
+    name = (name or _default_backend or "auto").lower()
+    if name in _BACKENDS:
+        return name
+    if not _BACKENDS:
+        raise ImportError("selectolax, lxml, beautifulsoup4 중 하나가 필요합니다")
+    return next(iter(_BACKENDS))
+
+
+def extract_main_text(html, max_length=1000, backend=None):
+    """
+    HTML에서 본문 텍스트 추출 (본문 영역 선택자 우선, 없으면 전체 텍스트)
+
+    Args:
+        html (str | bytes): HTML 문서
+        max_length (int): 최대 추출 길이 (초과 시 잘라내고 "..." 추가)
+        backend (str): 사용할 백엔드 (None이면 기본 백엔드)
+
+    Returns:
+        str: 본문 텍스트
+    """
+    if not html:
+        return ""
+    return _BACKENDS[resolve_backend(backend)](html, max_length)
+
+
+# ----------------------------------------------------------------------
+# 스트리밍 추출 (표준 라이브러리 HTMLParser, 조각 단위 feed)
+# ----------------------------------------------------------------------
+class StreamingTextExtractor(HTMLParser):
+    """
+    HTML 조각을 받는 대로 파싱하며 본문 텍스트 수집
+    - 불필요 요소(script/style/nav 등) 안의 텍스트는 무시
+    - 가장 바깥 본문 후보의 텍스트를 모으다가 max_length에 도달하면 done=True (이후 입력 무시)
+    - 본문 후보가 없을 때를 대비해 전체 텍스트도 max_length까지만 보관
+    - feed() 경계에서 텍스트가 나뉘어 들어와도 단어가 갈라지지 않도록, 연속된 텍스트는 이어붙였다가
+      태그 경계에서만 공백으로 구분
+    """
+
+    def __init__(self, max_length=1000):
+        super().__init__(convert_charrefs=True)
+        self.max_length = max_length
+        self.done = False
+        self.best = ""
+        self._skip_tag = None
+        self._skip_depth = 0
+        self._candidate_tag = None
+        self._candidate_depth = 0
+        self._candidate_parts = []
+        self._candidate_length = 0
+        self._doc_parts = []
+        self._doc_length = 0
+        self._pending = []
+        self._pending_length = 0
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if self.done:
+            return
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag in _BOILERPLATE_SET:
+            self._skip_tag = tag
+            self._skip_depth = 1
+            return
+        if self._candidate_tag is not None:
+            if tag == self._candidate_tag:
+                self._candidate_depth += 1
+            return
+        if _is_content_candidate(tag, dict(attrs).get('class')):
+            self._candidate_tag = tag
+            self._candidate_depth = 1
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if self.done:
+            return
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth <= 0:
+                    self._skip_tag = None
+            return
+        if self._candidate_tag is not None and tag == self._candidate_tag:
+            self._candidate_depth -= 1
+            if self._candidate_depth <= 0:
+                self._close_candidate()
+
+    def handle_data(self, data):
+        if self.done or self._skip_tag is not None:
+            return
+        # 같은 텍스트 노드가 여러 번에 나뉘어 들어올 수 있으므로 태그 경계까지 모아 둠
+        self._pending.append(data)
+        self._pending_length += len(data)
+        if self._pending_length > self.max_length * 2:
+            # 태그 없이 아주 긴 텍스트: 결과 길이를 넘었으므로 여기서 반영 (잘리는 위치는 결과 밖)
+            self._flush_text()
+
+    def _flush_text(self):
+        """모아 둔 연속 텍스트를 하나의 조각으로 반영"""
+        if not self._pending:
+            return
+        text = ''.join(self._pending).strip()
+        self._pending = []
+        self._pending_length = 0
+        if not text or self.done:
+            return
+        if self._doc_length <= self.max_length:
+            self._doc_parts.append(text)
+            self._doc_length += len(text) + 1
+        if self._candidate_tag is not None:
+            self._candidate_parts.append(text)
+            self._candidate_length += len(text) + 1
+            if self._candidate_length > self.max_length:
+                # 결과는 어차피 max_length로 잘리므로 더 읽을 필요 없음
+                self._close_candidate()
+                self.done = True
+
+    def _close_candidate(self):
+        text = ' '.join(self._candidate_parts)
+        if len(text) > len(self.best):
+            self.best = text
+        self._candidate_tag = None
+        self._candidate_depth = 0
+        self._candidate_parts = []
+        self._candidate_length = 0
+
+    def result(self):
+        """지금까지 모은 본문 텍스트 (후보가 없으면 전체 텍스트)"""
+        self._flush_text()
+        if self._candidate_tag is not None:
+            self._close_candidate()
+        return _finish(self.best or ' '.join(self._doc_parts), self.max_length)
+
+
+def charset_from_content_type(content_type):
+    """Content-Type 헤더에 명시된 문자셋 (없으면 None)"""
+    match = _HEADER_CHARSET_RE.search(content_type or "")
+    return match.group(1) if match else None
+
+
+def _make_decoder(encoding, head):
+    """헤더 문자셋 → <meta charset> → UTF-8 순으로 증분 디코더 생성"""
+    if not encoding:
+        match = _META_CHARSET_RE.search(head[:4096])
+        encoding = match.group(1).decode('ascii', 'ignore') if match else 'utf-8'
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+
+def extract_main_text_from_stream(chunks, max_length=1000, max_bytes=DEFAULT_MAX_STREAM_BYTES, encoding=None):
+    """
+    HTML 바이트 조각을 순서대로 파싱하며 본문 텍스트 추출 (충분히 모이거나 바이트 상한에 도달하면 중단)
+
+    Args:
+        chunks (iterable): HTML 바이트 조각 (예: response.iter_content(STREAM_CHUNK_SIZE))
+        max_length (int): 최대 추출 길이
+        max_bytes (int): 최대 읽기 바이트 수
+        encoding (str): 응답 헤더의 문자셋 (None이면 <meta charset> 또는 UTF-8)
+
+    Returns:
+        str: 본문 텍스트
+    """
+    parser = StreamingTextExtractor(max_length)
+    decoder = None
+    received = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if decoder is None:
+            decoder = _make_decoder(encoding, chunk)
+        received += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or received >= max_bytes:
+            # 중간에 멈춘 경우 잘린 태그 조각이 텍스트로 섞이지 않도록 close()하지 않음
+            break
+    else:
+        if decoder is not None:
+            parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    return parser.result()
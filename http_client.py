@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+공용 HTTP 클라이언트
+프로세스 전체에서 requests.Session 하나를 공유하여 호스트별 keep-alive 연결을 재사용한다.
+(요청마다 Session을 만들고 닫으면 매번 TCP/TLS 핸드셰이크가 새로 발생함)
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+    'Connection': 'keep-alive',
+}
+
+# 연결 풀 크기: 동시에 접속하는 호스트 수 / 호스트당 유지할 연결 수
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 16
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    # 연결 실패/일시적인 게이트웨이 오류만 짧게 재시도 (GET/HEAD 한정)
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=1,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_http_session():
+    """
+    프로세스 공용 requests.Session 반환
+    - 호스트별 keep-alive 연결 풀 (urllib3 PoolManager, 스레드 안전)
+    - 공통 기본 헤더 (요청별 헤더는 session.get(..., headers=...)로 덮어쓰기)
+    - 호출부에서 close()하지 말 것
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_http_session():
+    """공용 세션 종료 (프로그램 종료 시)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+"""
+이미지 지문(perceptual hash) 저장소 (SQLite 다중 색인 해싱)
+블로그 전체 이력에서 같은 스톡 사진이 다시 쓰이지 않도록, 사용한 이미지의 pHash/aHash와 URL을 디스크에 남긴다.
+- 이미지마다 해시를 한 번만 계산해 64비트 정수로 저장 (비교는 정수 XOR 비트 수)
+- 해밍 거리 검색은 다중 색인 해싱: 64비트 pHash를 9개 조각(8/7비트)으로 나눠 조각별로 색인하고,
+  거리 8 이하인 두 해시는 적어도 한 조각이 정확히 같다는 점(비둘기집 원리)을 이용해
+  색인으로 후보만 찾은 뒤 전체 거리를 확인 (무작위 해시 기준 후보는 전체의 약 7%)
+- 이미지를 받기 전에 URL만으로도 이력 조회 가능 (정규화 URL 색인)
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from itertools import combinations
+
+from page_cache import normalize_url
+
+
+DEFAULT_FINGERPRINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "image_fingerprints.sqlite3")
+DEFAULT_MAX_DISTANCE = 8   # pHash(64비트) 해밍 거리 이하이면 같은 사진으로 판단 (재압축/리사이즈 허용)
+CHUNK_BITS = (8, 7, 7, 7, 7, 7, 7, 7, 7)   # 다중 색인 조각 너비 (합 64비트, 9조각 → 거리 8까지 정확 일치 조각 보장)
+
+_history_enabled = True
+_history_max_distance = DEFAULT_MAX_DISTANCE
+
+
+def configure_image_history(enabled=True, max_distance=DEFAULT_MAX_DISTANCE):
+    """이력 기반 이미지 중복 방지 사용 여부와 거리 기준 설정 (설정 파일 로드 시 호출)"""
+    global _history_enabled, _history_max_distance
+    _history_enabled = bool(enabled)
+    _history_max_distance = int(max_distance)
+
+
+def _to_int(image_hash):
+    """imagehash 결과(8x8 bool 배열)를 64비트 정수로 변환"""
+    value = 0
+    for bit in image_hash.hash.flatten():
+        value = (value << 1) | int(bool(bit))
+    return value
+
+
+def _to_signed(value):
+    """SQLite INTEGER(부호 있는 64비트) 저장용"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def compute_fingerprint(img):
+    """
+    이미지 지문 계산
+
+    Returns:
+        tuple: (pHash 정수, aHash 정수)
+    """
+    import imagehash
+    return _to_int(imagehash.phash(img)), _to_int(imagehash.average_hash(img))
+
+
+def _chunk_values(value):
+    """64비트 해시를 CHUNK_BITS 너비 조각 값 목록으로 분리"""
+    chunks = []
+    shift = 64
+    for width in CHUNK_BITS:
+        shift -= width
+        chunks.append((value >> shift) & ((1 << width) - 1))
+    return chunks
+
+
+def _chunk_neighbors(chunk, width, radius):
+    """조각 값에서 비트를 radius개 이하로 뒤집은 값 전체"""
+    values = [chunk]
+    for count in range(1, radius + 1):
+        for bits in combinations(range(width), count):
+            flipped = chunk
+            for bit in bits:
+                flipped ^= 1 << bit
+            values.append(flipped)
+    return values
+
+
+class ImageFingerprintStore:
+    """사용한 이미지 지문/URL 이력 저장소 (스레드 안전)"""
+
+    def __init__(self, path=DEFAULT_FINGERPRINT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.candidates_checked = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS image_fingerprints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT,
+                phash INTEGER,
+                ahash INTEGER,
+                source TEXT,
+                keyword TEXT,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_image_fingerprints_url ON image_fingerprints(url)")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS image_hash_chunks (
+                chunk_no INTEGER NOT NULL,
+                chunk_value INTEGER NOT NULL,
+                image_id INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_image_hash_chunks ON image_hash_chunks(chunk_no, chunk_value)"
+        )
+        self._backfill_chunks()
+        self._conn.commit()
+
+    def _backfill_chunks(self):
+        """조각 색인이 없는 기존 지문(이전 버전 저장분)의 색인 생성"""
+        rows = self._conn.execute(
+            """SELECT id, phash FROM image_fingerprints
+               WHERE phash IS NOT NULL AND id NOT IN (SELECT DISTINCT image_id FROM image_hash_chunks)"""
+        ).fetchall()
+        for item_id, phash in rows:
+            self._insert_chunks(item_id, _to_unsigned(phash))
+
+    def _insert_chunks(self, item_id, phash):
+        self._conn.executemany(
+            "INSERT INTO image_hash_chunks (chunk_no, chunk_value, image_id) VALUES (?, ?, ?)",
+            [(chunk_no, value, item_id) for chunk_no, value in enumerate(_chunk_values(phash))],
+        )
+
+    def _insert_locked(self, key, fingerprint, source, keyword):
+        phash, ahash = fingerprint if fingerprint else (None, None)
+        cursor = self._conn.execute(
+            "INSERT INTO image_fingerprints (url, phash, ahash, source, keyword, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (key,
+             _to_signed(phash) if phash is not None else None,
+             _to_signed(ahash) if ahash is not None else None,
+             source, keyword, time.time()),
+        )
+        if phash is not None:
+            self._insert_chunks(cursor.lastrowid, phash)
+        return cursor.lastrowid
+
+    def _url_known_locked(self, key):
+        return self._conn.execute(
+            "SELECT 1 FROM image_fingerprints WHERE url = ? LIMIT 1", (key,)
+        ).fetchone() is not None
+
+    def _search_locked(self, phash, radius):
+        """
+        반경 이내 이력 [(거리, id)] (가까운 순)
+        조각 수가 radius + 1 이상이면 한 조각은 정확히 같아야 하므로 조각별 정확 일치로 후보를 찾고,
+        radius가 더 크면 조각마다 radius // 조각 수 비트까지 뒤집은 값으로 찾는다 (일반화된 비둘기집 원리)
+        """
+        sub_radius = radius // len(CHUNK_BITS)
+        clauses = []
+        params = []
+        for chunk_no, (chunk, width) in enumerate(zip(_chunk_values(phash), CHUNK_BITS)):
+            values = _chunk_neighbors(chunk, width, sub_radius)
+            clauses.append(f"(c.chunk_no = ? AND c.chunk_value IN ({','.join('?' * len(values))}))")
+            params.append(chunk_no)
+            params.extend(values)
+        rows = self._conn.execute(
+            f"""SELECT DISTINCT f.id, f.phash FROM image_hash_chunks c
+                JOIN image_fingerprints f ON f.id = c.image_id
+                WHERE {' OR '.join(clauses)}""",
+            params,
+        ).fetchall()
+        self.lookups += 1
+        self.candidates_checked += len(rows)
+        found = []
+        for item_id, stored in rows:
+            distance = hamming_distance(phash, _to_unsigned(stored))
+            if distance <= radius:
+                found.append((distance, item_id))
+        found.sort()
+        return found
+
+    def contains_url(self, url):
+        """이미 사용한 이미지 URL인지 (정규화 URL 기준)"""
+        if not url:
+            return False
+        key = normalize_url(url)
+        with self._lock:
+            return self._url_known_locked(key)
+
+    def find_similar(self, fingerprint, max_distance=None):
+        """
+        비슷한 이미지 이력 조회
+
+        Args:
+            fingerprint (tuple): compute_fingerprint() 결과
+            max_distance (int): pHash 해밍 거리 기준 (None이면 설정값)
+
+        Returns:
+            dict: 가장 가까운 이력 {"id", "url", "distance", "keyword", "created_at"} (없으면 None)
+        """
+        radius = _history_max_distance if max_distance is None else int(max_distance)
+        with self._lock:
+            matches = self._search_locked(fingerprint[0], radius)
+            if not matches:
+                return None
+            distance, item_id = matches[0]
+            row = self._conn.execute(
+                "SELECT url, keyword, created_at FROM image_fingerprints WHERE id = ?", (item_id,)
+            ).fetchone()
+        return {
+            "id": item_id,
+            "url": row[0] if row else None,
+            "distance": distance,
+            "keyword": row[1] if row else None,
+            "created_at": row[2] if row else None,
+        }
+
+    def add(self, url=None, fingerprint=None, source=None, keyword=None):
+        """사용한 이미지 기록 (URL만 또는 지문만 기록할 수도 있음)"""
+        key = normalize_url(url) if url else None
+        with self._lock:
+            if fingerprint is None and (key is None or self._url_known_locked(key)):
+                return
+            self._insert_locked(key, fingerprint, source, keyword)
+            self._conn.commit()
+
+    def check_and_add(self, img, url=None, source=None, keyword=None, max_distance=None):
+        """
+        이력에 없는 이미지면 기록하고 채택 (확인과 기록을 한 번에 처리해 동시 실행 시에도 중복 채택 방지)
+
+        Returns:
+            tuple: (채택 여부, 가장 비슷한 이력 또는 None)
+        """
+        fingerprint = compute_fingerprint(img)
+        radius = _history_max_distance if max_distance is None else int(max_distance)
+        with self._lock:
+            key = normalize_url(url) if url else None
+            if key and self._url_known_locked(key):
+                return False, {"url": key, "distance": None}
+            matches = self._search_locked(fingerprint[0], radius)
+            if matches:
+                distance, item_id = matches[0]
+                return False, {"id": item_id, "distance": distance}
+            self._insert_locked(key, fingerprint, source, keyword)
+            self._conn.commit()
+        return True, None
+
+    def check_and_add_many(self, entries, source=None, keyword=None, max_distance=None):
+        """
+        여러 이미지를 한 번에 확인하고, 모두 이력에 없을 때만 전부 기록 (그리드처럼 묶음 단위로 채택할 때)
+
+        Args:
+            entries (list): (url, PIL.Image) 목록 (이미지를 구하지 못한 항목은 None → URL만 확인/기록)
+
+        Returns:
+            list: 거절된 (url, 가장 비슷한 이력) 목록 (비어 있으면 전부 기록됨)
+        """
+        radius = _history_max_distance if max_distance is None else int(max_distance)
+        fingerprints = [(url, compute_fingerprint(img) if img is not None else None) for url, img in entries]
+        rejected = []
+        with self._lock:
+            accepted = []
+            for url, fingerprint in fingerprints:
+                key = normalize_url(url) if url else None
+                if key and self._url_known_locked(key):
+                    rejected.append((url, {"url": key, "distance": None}))
+                    continue
+                if fingerprint is None:
+                    accepted.append((url, (key, None)))
+                    continue
+                matches = self._search_locked(fingerprint[0], radius)
+                if matches:
+                    distance, item_id = matches[0]
+                    rejected.append((url, {"id": item_id, "distance": distance}))
+                    continue
+                # 같은 묶음 안의 거의 같은 이미지도 중복으로 처리
+                twin = next((other for other, (_, other_fp) in accepted
+                             if other_fp is not None and hamming_distance(fingerprint[0], other_fp[0]) <= radius),
+                            None)
+                if twin is not None:
+                    rejected.append((url, {"url": twin, "distance": None}))
+                    continue
+                accepted.append((url, (key, fingerprint)))
+            if not rejected:
+                for _, (key, fingerprint) in accepted:
+                    self._insert_locked(key, fingerprint, source, keyword)
+                self._conn.commit()
+        return rejected
+
+    def stats(self):
+        with self._lock:
+            images = self._conn.execute(
+                "SELECT COUNT(*) FROM image_fingerprints WHERE phash IS NOT NULL"
+            ).fetchone()[0]
+            urls = self._conn.execute(
+                "SELECT COUNT(DISTINCT url) FROM image_fingerprints WHERE url IS NOT NULL"
+            ).fetchone()[0]
+        return {
+            "images": images,
+            "urls": urls,
+            "lookups": self.lookups,
+            "avg_candidates": self.candidates_checked / self.lookups if self.lookups else 0.0,
+        }
+
+
+class ImageUrlReservations:
+    """
+    이미지 URL 사용/예약 목록 (여러 섹션·글이 동시에 Bing 매칭을 실행해도 같은 URL을 고르지 않도록)
+    매칭 1회마다 view()로 예약 집합을 받아 외부 매칭 함수의 used_image_urls로 넘기고,
+    끝나면 finish()로 선택을 사용 확정하고 나머지 예약은 해제한다.
+    락은 예약 목록 갱신에만 잡으므로 BLIP 매칭은 섹션/글끼리 동시에 실행된다 (BLIP 서비스에서 한 배치로 묶임)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._used = set()
+        self._owners = {}   # 예약 중인 URL → 예약한 view
+
+    def view(self, store=None):
+        """매칭 1회용 예약 집합 (store가 있으면 이전 글에서 쓴 URL도 제외)"""
+        return ReservedUrlSet(self, store)
+
+    def reserve(self, url, view):
+        """URL 예약 (이미 사용 확정됐거나 다른 매칭이 예약한 URL이면 False)"""
+        with self._lock:
+            owner = self._owners.get(url)
+            if url in self._used or (owner is not None and owner is not view):
+                return False
+            self._owners[url] = view
+            return True
+
+    def finish(self, view, used=()):
+        """view의 예약을 모두 해제하고, used에 있는 URL은 사용 확정 (이후 모든 매칭에서 제외)"""
+        with self._lock:
+            for url in view.reserved:
+                if self._owners.get(url) is view:
+                    del self._owners[url]
+            self._used.update(url for url in used if url)
+
+    def __contains__(self, url):
+        with self._lock:
+            return url in self._used
+
+    def __len__(self):
+        with self._lock:
+            return len(self._used)
+
+
+class ReservedUrlSet(set):
+    """
+    매칭 1회용 used_image_urls (집합 내용은 이번 매칭이 add()한 선택 URL)
+    매칭 함수가 `url in urls`로 후보를 확인하는 순간 그 URL을 예약해, 동시에 매칭 중인 다른 섹션은
+    같은 후보를 건너뛴다. 이미 확정/다른 매칭이 예약했거나 이력 저장소에 있는 URL이면 True.
+    확인 없이 add()한 URL이 다른 매칭과 겹치면 conflicts에 기록 (호출 측에서 다시 매칭)
+    """
+
+    def __init__(self, reservations, store=None):
+        super().__init__()
+        self._reservations = reservations
+        self._store = store
+        self.reserved = set()
+        self.checked = []    # 이번 매칭이 확인해 예약한 후보 URL (확인 순서)
+        self.conflicts = set()
+
+    def __contains__(self, url):
+        if set.__contains__(self, url):
+            return True
+        if not self._reservations.reserve(url, self):
+            return True
+        self.reserved.add(url)
+        if self._store is not None and self._store.contains_url(url):
+            return True
+        self.checked.append(url)
+        return False
+
+    def add(self, url):
+        if self._reservations.reserve(url, self):
+            self.reserved.add(url)
+        else:
+            self.conflicts.add(url)
+        set.add(self, url)
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_image_fingerprint_store(path=None):
+    """프로세스 공용 이미지 지문 저장소 (이력 중복 방지 비활성화 또는 생성 실패 시 None)"""
+    global _shared_store
+    if not _history_enabled:
+        return None
+    with _shared_lock:
+        if _shared_store is None:
+            try:
+                _shared_store = ImageFingerprintStore(path or DEFAULT_FINGERPRINT_PATH)
+                print(f"✅ 이미지 이력 저장소 로드 ({_shared_store.stats()['images']}개 지문)")
+            except Exception as e:
+                print(f"⚠️ 이미지 이력 저장소 사용 불가: {e}")
+                return None
+        return _shared_store
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+무거운 선택 모듈 지연 로딩 레지스트리
+- register()로 등록만 해 두고, 처음 사용할 때(load/flag 평가) import
+- prewarm()으로 창이 뜬 뒤 백그라운드 스레드에서 여러 모듈을 병렬로 미리 import
+- 모듈별 import 소요 시간(ms)/성공 여부를 기록해 시작 시간 리포트로 출력
+- 같은 모듈을 여러 스레드가 동시에 요청해도 import는 한 번만 수행 (나머지는 완료를 기다림)
+"""
+
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class _LazyEntry:
+    def __init__(self, name, module_path, attrs=(), warmup=None):
+        self.name = name
+        self.module_path = module_path
+        self.attrs = tuple(attrs)
+        self.warmup = warmup
+        self.module = None
+        self.loaded = False
+        self.error = None
+        self.elapsed_ms = None
+        self.thread_name = None
+        self.lock = threading.Lock()
+
+
+class LazyFlag:
+    """
+    모듈 사용 가능 여부 플래그 (bool 평가 시 처음 한 번 import)
+    기존 `'name' in globals() and name` 형태의 검사를 그대로 쓰기 위한 용도
+    """
+
+    def __init__(self, registry, name):
+        self._registry = registry
+        self._name = name
+
+    def __bool__(self):
+        return self._registry.load(self._name) is not None
+
+    def __repr__(self):
+        return f"<LazyFlag {self._name}: {self._registry.status(self._name)}>"
+
+
+class LazyImportRegistry:
+    """지연 import 대상 모듈 목록과 import 시간 기록"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._startup = []   # (이름, ms) - 시작 시 즉시 import한 모듈 기록
+        self.prewarm_ms = None
+
+    def register(self, name, module_path=None, attrs=(), warmup=None):
+        """
+        지연 로딩 모듈 등록
+
+        Args:
+            name (str): 레지스트리 이름
+            module_path (str): import 경로 (None이면 name과 같음)
+            attrs (tuple): 반드시 있어야 하는 속성 (하나라도 없으면 사용 불가로 처리)
+            warmup (callable): import 직후 호출할 준비 작업 (모델/인코딩 미리 로드 등, 모듈을 인자로 받음)
+        """
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _LazyEntry(name, module_path or name, attrs, warmup)
+        return self.flag(name)
+
+    def flag(self, name):
+        return LazyFlag(self, name)
+
+    def names(self):
+        with self._lock:
+            return list(self._entries)
+
+    def load(self, name):
+        """
+        모듈 반환 (처음 호출 시 import, 실패하면 None)
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"등록되지 않은 지연 로딩 모듈: {name}")
+        if entry.loaded:
+            return entry.module
+        with entry.lock:
+            if entry.loaded:
+                return entry.module
+            started = time.perf_counter()
+            try:
+                module = importlib.import_module(entry.module_path)
+                missing = [attr for attr in entry.attrs if not hasattr(module, attr)]
+                if missing:
+                    raise ImportError(f"{entry.module_path}에 {', '.join(missing)} 없음")
+                if entry.warmup is not None:
+                    entry.warmup(module)
+                entry.module = module
+                print(f"✅ {name} 모듈 로드 완료")
+            except Exception as e:
+                entry.module = None
+                entry.error = e
+                print(f"⚠️ {name} 모듈 로드 실패: {e}")
+            entry.elapsed_ms = (time.perf_counter() - started) * 1000
+            entry.thread_name = threading.current_thread().name
+            entry.loaded = True
+        return entry.module
+
+    def is_available(self, name):
+        return self.load(name) is not None
+
+    def status(self, name):
+        entry = self._entries.get(name)
+        if entry is None or not entry.loaded:
+            return "대기"
+        return "성공" if entry.module is not None else "실패"
+
+    def prewarm(self, names=None, max_workers=4, on_done=None):
+        """
+        백그라운드 스레드에서 모듈들을 병렬로 미리 import (호출 즉시 반환)
+
+        Args:
+            names (list): 대상 이름 (None이면 등록된 전체)
+            max_workers (int): 동시에 import할 모듈 수
+            on_done (callable): 전체 완료 후 호출 (레지스트리를 인자로 받음, 백그라운드 스레드에서 실행됨)
+
+        Returns:
+            threading.Thread: 예열 스레드
+        """
+        targets = list(names) if names is not None else self.names()
+
+        def _run():
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="prewarm") as executor:
+                list(executor.map(self.load, targets))
+            self.prewarm_ms = (time.perf_counter() - started) * 1000
+            if on_done is not None:
+                try:
+                    on_done(self)
+                except Exception as e:
+                    print(f"⚠️ 모듈 예열 완료 처리 실패: {e}")
+
+        thread = threading.Thread(target=_run, name="module-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def record_startup(self, name, elapsed_ms):
+        """시작 시 즉시 import한 모듈 시간 기록 (리포트에 함께 표시)"""
+        with self._lock:
+            self._startup.append((name, elapsed_ms))
+
+    def import_report(self):
+        """
+        모듈별 import 기록
+
+        Returns:
+            list: {"name", "ms", "status", "thread", "error"} 목록 (시작 시 import → 지연 로딩 순)
+        """
+        with self._lock:
+            rows = [
+                {"name": name, "ms": ms, "status": "시작", "thread": "main", "error": None}
+                for name, ms in self._startup
+            ]
+            entries = list(self._entries.values())
+        for entry in entries:
+            rows.append({
+                "name": entry.name,
+                "ms": entry.elapsed_ms,
+                "status": self.status(entry.name),
+                "thread": entry.thread_name,
+                "error": str(entry.error) if entry.error else None,
+            })
+        return rows
+
+    def format_import_report(self):
+        lines = ["⏱️ 모듈 import 시간"]
+        for row in self.import_report():
+            ms = f"{row['ms']:8.1f}ms" if row["ms"] is not None else "       --"
+            line = f"   {row['name']:<24}{ms}  {row['status']}"
+            if row["error"]:
+                line += f" ({row['error']})"
+            lines.append(line)
+        if self.prewarm_ms is not None:
+            lines.append(f"   백그라운드 예열 전체: {self.prewarm_ms:.1f}ms")
+        return "\n".join(lines)
+
+    def print_import_report(self):
+        print(self.format_import_report())
+
+
+_shared_registry = LazyImportRegistry()
+
+
+def get_lazy_registry():
+    """프로세스 공용 지연 로딩 레지스트리"""
+    return _shared_registry
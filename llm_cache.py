@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 응답 디스크 캐시 (SQLite)
+(model, messages, temperature, max_tokens)를 정규화한 키로 응답 텍스트를 저장하여
+같은 키워드/제목/상품명에 대한 반복 호출을 API 없이 처리한다.
+- TTL 만료 + 최대 항목 수 초과 시 LRU(마지막 사용 시각) 순으로 삭제
+- 적중/미스 카운터 제공 (stats())
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from types import SimpleNamespace
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.sqlite3")
+
+
+def _normalize_text(text):
+    """공백 차이만 있는 프롬프트가 같은 키가 되도록 정규화"""
+    return " ".join(str(text or "").split())
+
+
+def make_cache_key(model, messages, temperature, max_tokens):
+    """정규화된 (model, messages, temperature, max_tokens) 튜플의 sha256 키"""
+    normalized_messages = [
+        {"role": m.get("role", ""), "content": _normalize_text(m.get("content", ""))}
+        for m in messages
+    ]
+    payload = {
+        "model": model,
+        "messages": normalized_messages,
+        "temperature": None if temperature is None else round(float(temperature), 3),
+        "max_tokens": max_tokens,
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def make_cached_response(content, model=""):
+    """캐시된 텍스트를 chat.completions 응답처럼 사용할 수 있게 감싼 객체
+    (호출부는 response.choices[0].message.content만 사용)"""
+    message = SimpleNamespace(role="assistant", content=content)
+    choice = SimpleNamespace(index=0, message=message, finish_reason="stop")
+    return SimpleNamespace(choices=[choice], model=model, usage=None, cached=True)
+
+
+class LLMCache:
+    """SQLite 기반 LLM 응답 캐시 (스레드 안전)"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_hours=72, max_entries=5000):
+        self.path = path
+        self.ttl_seconds = float(ttl_hours) * 3600
+        self.max_entries = int(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access)")
+        self._conn.commit()
+
+    def configure(self, ttl_hours=None, max_entries=None):
+        """TTL/최대 항목 수 변경 (설정 변경 반영용)"""
+        if ttl_hours is not None:
+            self.ttl_seconds = float(ttl_hours) * 3600
+        if max_entries is not None:
+            self.max_entries = int(max_entries)
+
+    def get(self, model, messages, temperature, max_tokens):
+        """캐시 조회. 적중 시 응답 객체, 없거나 만료되면 None"""
+        key = make_cache_key(model, messages, temperature, max_tokens)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return make_cached_response(row[0], model)
+
+    def put(self, model, messages, temperature, max_tokens, content):
+        """응답 텍스트 저장 (빈 응답은 저장하지 않음)"""
+        if not content or not str(content).strip():
+            return
+        key = make_cache_key(model, messages, temperature, max_tokens)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, content, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, now, now),
+            )
+            self.stores += 1
+            self._puts_since_evict += 1
+            # 저장할 때마다 정리하면 느리므로 일정 횟수마다 만료/LRU 정리
+            if self._puts_since_evict >= 50:
+                self._evict_locked(now)
+            self._conn.commit()
+
+    def _evict_locked(self, now):
+        """TTL 만료 항목 삭제 후 최대 항목 수를 넘는 만큼 오래 사용하지 않은 항목 삭제"""
+        self._puts_since_evict = 0
+        if self.ttl_seconds > 0:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def evict(self):
+        """수동 정리"""
+        with self._lock:
+            self._evict_locked(time.time())
+            self._conn.commit()
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self):
+        """적중/미스 카운터 및 저장 항목 수"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "entries": entries,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache(ttl_hours=None, max_entries=None, path=None):
+    """프로세스 공용 LLM 캐시 (GPTChatUI와 BlogGeneratorGPTStyle이 함께 사용)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMCache(
+                path=path or DEFAULT_CACHE_PATH,
+                ttl_hours=72 if ttl_hours is None else ttl_hours,
+                max_entries=5000 if max_entries is None else max_entries,
+            )
+        else:
+            _shared_cache.configure(ttl_hours=ttl_hours, max_entries=max_entries)
+        return _shared_cache
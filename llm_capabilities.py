@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+모델별 파라미터 호환성 기록 (JSON 파일에 영구 저장)
+call_chat_with_fallback에서 성공한 토큰 파라미터/temperature 모드를 모델별로 기억해
+다음 호출부터는 실패 왕복 없이 바로 동작하는 조합으로 요청한다.
+"""
+
+import os
+import json
+import threading
+
+
+DEFAULT_CAPABILITIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_capabilities.json")
+
+
+class CapabilityRegistry:
+    """모델명 → {"token_param": ..., "temperature_mode": ...} 기록"""
+
+    def __init__(self, path=DEFAULT_CAPABILITIES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._models = {}
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._models = data
+        except Exception as e:
+            print(f"⚠️ 모델 호환성 기록 로드 실패 (새로 기록): {e}")
+            self._models = {}
+
+    def _save_locked(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._models, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ 모델 호환성 기록 저장 실패: {e}")
+
+    def get(self, model):
+        """기록된 조합 (없으면 None)"""
+        with self._lock:
+            entry = self._models.get(model)
+            return dict(entry) if entry else None
+
+    def record(self, model, token_param, temperature_mode, temperature=None):
+        """성공한 조합 기록 (기존 기록과 다를 때만 파일에 저장)
+        요청 temperature가 1이면 "given" 성공만으로는 임의 값 지원 여부를 알 수 없으므로
+        기존 temperature 모드 기록을 유지한다."""
+        with self._lock:
+            existing = self._models.get(model)
+            if existing and temperature_mode == "given" and temperature == 1:
+                temperature_mode = existing.get("temperature_mode", temperature_mode)
+            entry = {"token_param": token_param, "temperature_mode": temperature_mode}
+            if self._models.get(model) == entry:
+                return
+            self._models[model] = entry
+            self._save_locked()
+        print(f"📝 모델 '{model}' 호환 파라미터 기록: 토큰={token_param}, temperature={temperature_mode}")
+
+    def forget(self, model):
+        """기록 삭제 (모델 정책이 바뀐 경우 등)"""
+        with self._lock:
+            if self._models.pop(model, None) is not None:
+                self._save_locked()
+
+    def order_candidates(self, model, token_param_candidates, temperature_modes):
+        """
+        기록된 조합을 맨 앞으로 옮긴 후보 목록 반환
+
+        Args:
+            model (str): 모델명
+            token_param_candidates (list): 토큰 파라미터 후보 (None/"max_tokens"/"max_completion_tokens")
+            temperature_modes (list): (모드명, 값) 튜플 리스트
+
+        Returns:
+            tuple: (토큰 파라미터 후보, temperature 모드 후보)
+        """
+        entry = self.get(model)
+        if not entry:
+            return list(token_param_candidates), list(temperature_modes)
+        known_token = entry.get("token_param")
+        known_mode = entry.get("temperature_mode")
+        tokens = list(token_param_candidates)
+        if known_token in tokens:
+            tokens.remove(known_token)
+            tokens.insert(0, known_token)
+        modes = list(temperature_modes)
+        for idx, (mode_name, _) in enumerate(modes):
+            if mode_name == known_mode:
+                modes.insert(0, modes.pop(idx))
+                break
+        return tokens, modes
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_capability_registry(path=None):
+    """프로세스 공용 모델 호환성 기록"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = CapabilityRegistry(path or DEFAULT_CAPABILITIES_PATH)
+        return _shared_registry
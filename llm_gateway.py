@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+비동기 LLM 게이트웨이
+AsyncOpenAI 클라이언트 하나를 전용 이벤트 루프 스레드에서 공유하여
+- HTTP 연결 풀 재사용
+- 동시 요청 수 제한 (세마포어)
+- 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷 제한 (요청 전 토큰 추정, 응답 usage로 보정)
+- 429/5xx/타임아웃 재시도 (Retry-After 우선, 지터를 준 지수 백오프)
+를 한 곳에서 처리한다. 작업 스레드(동기 코드)는 create()로, 비동기 코드는 acreate()로 호출한다.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+# openai/httpx/tiktoken은 import 비용이 커서(수백 ms) 처음 사용할 때 로드
+_openai_modules = None
+_token_encoding = None
+_token_encoding_loaded = False
+_import_lock = threading.Lock()
+
+
+def _load_openai_modules():
+    """(httpx, AsyncOpenAI) 반환, 설치되지 않았으면 (None, None)"""
+    global _openai_modules
+    if _openai_modules is None:
+        with _import_lock:
+            if _openai_modules is None:
+                try:
+                    import httpx
+                    from openai import AsyncOpenAI
+                    _openai_modules = (httpx, AsyncOpenAI)
+                except ImportError:
+                    _openai_modules = (None, None)
+                    print("⚠️ AsyncOpenAI/httpx 로드 실패 - LLM 게이트웨이 비활성화 (동기 클라이언트 사용)")
+    return _openai_modules
+
+
+def _get_token_encoding():
+    global _token_encoding, _token_encoding_loaded
+    if not _token_encoding_loaded:
+        with _import_lock:
+            if not _token_encoding_loaded:
+                try:
+                    import tiktoken
+                    _token_encoding = tiktoken.get_encoding("o200k_base")
+                except Exception:
+                    _token_encoding = None
+                _token_encoding_loaded = True
+    return _token_encoding
+
+
+def warm_up_llm_gateway(module=None):
+    """openai SDK와 토큰 인코딩을 미리 로드 (시작 후 백그라운드 예열용)"""
+    _load_openai_modules()
+    _get_token_encoding()
+
+
+# 응답 최대 토큰을 지정하지 않은 요청의 응답 토큰 추정치
+DEFAULT_COMPLETION_TOKENS = 1000
+
+
+def count_text_tokens(text):
+    """텍스트 토큰 수 (tiktoken이 있으면 정확히, 없으면 한글/영문 혼합 기준 추정)"""
+    text = str(text or "")
+    encoding = _get_token_encoding()
+    if encoding is not None:
+        try:
+            return len(encoding.encode(text))
+        except Exception:
+            pass
+    # 한글은 대략 1자당 1토큰, 그 외(영문/숫자/공백)는 약 4자당 1토큰
+    hangul = sum(1 for ch in text if "\uac00" <= ch <= "\ud7a3")
+    return hangul + (len(text) - hangul) // 4 + 1
+
+
+def estimate_message_tokens(messages, max_tokens=None):
+    """요청 1건이 TPM 한도에서 차지할 토큰 수 추정 (프롬프트 + 응답 최대 토큰)"""
+    prompt_tokens = sum(count_text_tokens(m.get("content")) + 4 for m in messages)
+    return prompt_tokens + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def _retry_after_seconds(error):
+    """오류 응답의 Retry-After(-ms) 헤더 값 (초), 없으면 None"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers.get("retry-after-ms")) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def is_retryable_error(error):
+    """재시도 대상 오류인지 판단 (429 속도 제한, 5xx, 타임아웃/연결 오류)
+    할당량 소진(insufficient_quota)은 기다려도 풀리지 않으므로 제외"""
+    if getattr(error, "code", None) == "insufficient_quota" or "insufficient_quota" in str(error):
+        return False
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status == 408 or status >= 500
+    name = type(error).__name__
+    return name in ("APITimeoutError", "APIConnectionError") or isinstance(error, asyncio.TimeoutError)
+
+
+class TokenBucket:
+    """분 단위 한도를 초 단위로 채워 넣는 토큰 버킷 (이벤트 루프 스레드 전용)"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def refund(self, amount):
+        """추정보다 적게 사용한 만큼 돌려받기 (음수면 추가 차감)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + float(amount))
+
+    async def acquire(self, amount=1.0):
+        """
+        amount만큼 토큰이 찰 때까지 대기 후 차감 (한도보다 큰 요청은 한도만큼만 요구)
+
+        Returns:
+            float: 실제로 차감한 양 (refund 기준)
+        """
+        if self.capacity <= 0:
+            return 0.0
+        amount = min(float(amount), self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return amount
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class LLMGateway:
+    """AsyncOpenAI 기반 공용 LLM 호출 창구"""
+
+    def __init__(self, api_key, max_in_flight=8, rpm_limit=500, tpm_limit=200000, timeout=120.0,
+                 max_retries=5, backoff_base=1.0, backoff_max=60.0):
+        httpx, AsyncOpenAI = _load_openai_modules()
+        if AsyncOpenAI is None:
+            raise ImportError("openai(AsyncOpenAI)/httpx 패키지가 필요합니다")
+        self.max_in_flight = int(max_in_flight)
+        self.max_retries = int(max_retries)
+        self.backoff_base = float(backoff_base)
+        self.backoff_max = float(backoff_max)
+        # 429 발생 시 모든 요청이 함께 쉬어가도록 하는 공용 대기 종료 시각
+        self._cooldown_until = 0.0
+        self.retry_count = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="llm-gateway", daemon=True)
+        self._thread.start()
+
+        async def _setup():
+            # 연결 풀: 동시 요청 수만큼 keep-alive 연결 유지
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight * 2,
+                    max_keepalive_connections=self.max_in_flight,
+                ),
+                timeout=timeout,
+            )
+            # 재시도는 게이트웨이에서 직접 처리 (SDK 자체 재시도는 끔)
+            self._client = AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._rpm_bucket = TokenBucket(rpm_limit)
+            self._tpm_bucket = TokenBucket(tpm_limit)
+
+        self._submit(_setup()).result()
+        print(f"✅ LLM 게이트웨이 시작 (동시 {self.max_in_flight}개, RPM {rpm_limit}, TPM {tpm_limit})")
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def configure(self, rpm_limit=None, tpm_limit=None, max_retries=None):
+        """RPM/TPM 한도/재시도 횟수 변경 (설정 변경 반영용, 값이 같으면 아무것도 하지 않음)"""
+        if max_retries is not None:
+            self.max_retries = int(max_retries)
+        if (rpm_limit is None or float(rpm_limit) == self._rpm_bucket.capacity) and \
+                (tpm_limit is None or float(tpm_limit) == self._tpm_bucket.capacity):
+            return
+
+        async def _apply():
+            if rpm_limit is not None and float(rpm_limit) != self._rpm_bucket.capacity:
+                self._rpm_bucket = TokenBucket(rpm_limit)
+            if tpm_limit is not None and float(tpm_limit) != self._tpm_bucket.capacity:
+                self._tpm_bucket = TokenBucket(tpm_limit)
+        self._submit(_apply()).result()
+
+    async def acreate(self, **params):
+        """chat.completions.create 비동기 호출
+        - RPM/TPM 버킷에서 예상 토큰만큼 확보 후 전송, 응답 usage로 실제 사용량 보정
+        - 429/5xx/타임아웃은 Retry-After 또는 지터 지수 백오프 후 재시도
+        """
+        estimated = estimate_message_tokens(
+            params.get("messages", []),
+            params.get("max_tokens") or params.get("max_completion_tokens"),
+        )
+        attempt = 0
+        while True:
+            # 다른 요청이 429를 받았다면 공용 대기 시간 동안 함께 대기
+            cooldown = self._cooldown_until - time.monotonic()
+            if cooldown > 0:
+                await asyncio.sleep(cooldown)
+            await self._rpm_bucket.acquire(1)
+            # 한도 변경으로 버킷이 교체돼도 확보한 버킷에 돌려주도록 참조를 유지
+            tpm_bucket = self._tpm_bucket
+            reserved = await tpm_bucket.acquire(estimated)
+            try:
+                async with self._semaphore:
+                    response = await self._client.chat.completions.create(**params)
+            except Exception as e:
+                # 실패한 요청은 토큰이 과금되지 않으므로 확보한 만큼 반환 (재시도 폭주 시 다른 호출자까지 막지 않도록)
+                tpm_bucket.refund(reserved)
+                if attempt >= self.max_retries or not is_retryable_error(e):
+                    raise
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    # full jitter: 0 ~ min(최대, 기본 * 2^시도)
+                    delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                    delay = max(delay, self.backoff_base / 2)
+                if getattr(e, "status_code", None) == 429:
+                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+                attempt += 1
+                self.retry_count += 1
+                print(f"⚠️ LLM 요청 재시도 {attempt}/{self.max_retries} ({type(e).__name__}, {delay:.1f}초 후)")
+                await asyncio.sleep(delay)
+                continue
+
+            # 실제 사용량으로 TPM 버킷 보정
+            usage = getattr(response, "usage", None)
+            total_tokens = getattr(usage, "total_tokens", None) if usage is not None else None
+            if total_tokens and reserved:
+                tpm_bucket.refund(reserved - total_tokens)
+            return response
+
+    def create(self, **params):
+        """동기 호출 (작업 스레드용). 이벤트 루프 스레드에서 실행 후 결과를 기다림"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("이벤트 루프 스레드에서는 acreate()를 await 하세요")
+        return self._submit(self.acreate(**params)).result()
+
+    async def agather(self, param_list):
+        """여러 요청을 동시에 실행 (각 결과 또는 예외를 순서대로 반환)"""
+        return await asyncio.gather(*(self.acreate(**params) for params in param_list), return_exceptions=True)
+
+    def create_many(self, param_list):
+        """여러 요청을 동시에 실행하는 동기 진입점 (섹션/이미지 프롬프트/카테고리 등 독립 호출용)"""
+        return self._submit(self.agather(list(param_list))).result()
+
+    def close(self):
+        """클라이언트 종료 및 이벤트 루프 정지"""
+        async def _close():
+            await self._client.close()
+        try:
+            self._submit(_close()).result(timeout=5)
+        except Exception as e:
+            print(f"⚠️ LLM 게이트웨이 종료 중 오류: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_shared_gateway = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_gateway(api_key, max_in_flight=8, rpm_limit=500, tpm_limit=200000, max_retries=5):
+    """
+    프로세스 공용 LLM 게이트웨이 (GPTChatUI, BlogGeneratorGPTStyle 공유)
+
+    Returns:
+        LLMGateway: 게이트웨이 (AsyncOpenAI 사용 불가 또는 API 키가 없으면 None)
+    """
+    global _shared_gateway
+    if not api_key or _load_openai_modules()[1] is None:
+        return None
+    with _shared_lock:
+        if _shared_gateway is None:
+            try:
+                _shared_gateway = LLMGateway(api_key, max_in_flight, rpm_limit, tpm_limit, max_retries=max_retries)
+            except Exception as e:
+                print(f"⚠️ LLM 게이트웨이 생성 실패 - 동기 클라이언트 사용: {e}")
+                return None
+        else:
+            _shared_gateway.configure(rpm_limit=rpm_limit, tpm_limit=tpm_limit, max_retries=max_retries)
+        return _shared_gateway
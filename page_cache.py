@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+웹 페이지/검색 결과 디스크 캐시 (SQLite)
+정규화된 URL을 키로 추출된 텍스트와 ETag/Last-Modified를 저장한다.
+- 소스 유형별 TTL (검색 결과는 짧게, 블로그 글은 길게)
+- TTL이 지난 항목은 조건부 GET(If-None-Match / If-Modified-Since)으로 재검증, 304면 그대로 재사용
+- 전체 크기 상한을 넘으면 마지막 사용 시각이 오래된 항목부터 삭제 (LRU)
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+DEFAULT_PAGE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "page_cache.sqlite3")
+
+# 소스 유형별 TTL (초)
+SOURCE_TTLS = {
+    "search": 30 * 60,       # 검색 결과 목록
+    "news": 6 * 3600,        # 뉴스 기사
+    "blog": 24 * 3600,       # 블로그/포스트
+    "default": 6 * 3600,
+}
+
+# 전체 캐시 크기 상한 (바이트)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# 캐시 키에서 제외할 추적용 쿼리 파라미터
+TRACKING_PARAMS_PREFIXES = ("utm_", "fbclid", "gclid", "ref_src", "mc_cid", "mc_eid")
+
+NEWS_HOST_KEYWORDS = ("news", "yna.co.kr", "chosun.com", "joongang.co.kr", "donga.com", "hani.co.kr",
+                      "khan.co.kr", "mk.co.kr", "hankyung.com", "ytn.co.kr", "sbs.co.kr", "kbs.co.kr")
+BLOG_HOST_KEYWORDS = ("blog", "post.naver.com", "tistory.com", "brunch.co.kr", "velog.io", "medium.com")
+
+
+def normalize_url(url):
+    """캐시 키용 URL 정규화 (스킴/호스트 소문자, 프래그먼트·추적 파라미터 제거, 쿼리 정렬)"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.endswith(":80") and parts.scheme == "http":
+        host = host[:-3]
+    if host.endswith(":443") and parts.scheme == "https":
+        host = host[:-4]
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS_PREFIXES)
+    ]
+    query.sort()
+    path = parts.path or "/"
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query, doseq=True), ""))
+
+
+def classify_source(url):
+    """URL의 소스 유형 (news/blog/default)"""
+    host = urlsplit(url).netloc.lower()
+    if any(keyword in host for keyword in BLOG_HOST_KEYWORDS):
+        return "blog"
+    if any(keyword in host for keyword in NEWS_HOST_KEYWORDS):
+        return "news"
+    return "default"
+
+
+class PageCacheEntry:
+    """캐시 조회 결과"""
+
+    def __init__(self, text, etag, last_modified, fetched_at, ttl, max_length):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+        self.max_length = max_length
+
+    @property
+    def is_fresh(self):
+        return time.time() - self.fetched_at <= self.ttl
+
+    @property
+    def can_revalidate(self):
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self):
+        """재검증용 조건부 요청 헤더"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """SQLite 기반 페이지 캐시 (스레드 안전)"""
+
+    def __init__(self, path=DEFAULT_PAGE_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS page_cache (
+                url TEXT PRIMARY KEY,
+                source_type TEXT,
+                text TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                max_length INTEGER,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_page_cache_access ON page_cache(last_access)")
+        self._conn.commit()
+
+    def get(self, url, source_type=None, max_length=None):
+        """
+        캐시 조회 (만료 여부와 관계없이 항목 반환, 신선도는 entry.is_fresh로 판단)
+
+        Args:
+            url (str): 원본 URL
+            source_type (str): TTL을 정할 소스 유형 (None이면 URL로 분류)
+            max_length (int): 요청 추출 길이 (저장된 길이가 더 짧으면 미스로 처리)
+
+        Returns:
+            PageCacheEntry: 캐시 항목 (없으면 None)
+        """
+        key = normalize_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, etag, last_modified, fetched_at, source_type, max_length FROM page_cache WHERE url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if max_length is not None and row[5] is not None and row[5] < max_length:
+                return None
+            self._conn.execute("UPDATE page_cache SET last_access = ? WHERE url = ?", (time.time(), key))
+            self._conn.commit()
+        ttl = SOURCE_TTLS.get(source_type or row[4] or classify_source(url), SOURCE_TTLS["default"])
+        return PageCacheEntry(row[0], row[1], row[2], row[3], ttl, row[5])
+
+    def put(self, url, text, source_type=None, etag=None, last_modified=None, max_length=None):
+        """추출 결과 저장 (빈 텍스트는 저장하지 않음)"""
+        if not text:
+            return
+        key = normalize_url(url)
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO page_cache
+                   (url, source_type, text, etag, last_modified, max_length, size, fetched_at, last_access)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (key, source_type or classify_source(url), text, etag, last_modified, max_length, size, now, now),
+            )
+            self._puts_since_evict += 1
+            if self._puts_since_evict >= 20:
+                self._evict_locked()
+            self._conn.commit()
+
+    def touch(self, url):
+        """304 재검증 성공 시 저장 시각 갱신 (TTL 연장)"""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE page_cache SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, key))
+            self._conn.commit()
+
+    def _evict_locked(self):
+        """크기 상한을 넘으면 오래 사용하지 않은 항목부터 삭제"""
+        self._puts_since_evict = 0
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM page_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for url, size in self._conn.execute("SELECT url, size FROM page_cache ORDER BY last_access ASC"):
+            doomed.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM page_cache WHERE url = ?", doomed)
+        print(f"🧹 페이지 캐시 정리: {len(doomed)}개 항목 삭제 ({freed / 1024:.0f}KB)")
+
+    def record(self, outcome):
+        """조회 결과 카운트 (hit / revalidated / miss)"""
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "revalidated":
+                self.revalidated += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """적중/재검증/미스 카운터와 저장 크기"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM page_cache"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": total,
+        }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_page_cache(path=None, max_bytes=None):
+    """프로세스 공용 페이지 캐시 (생성 실패 시 None)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = PageCache(path or DEFAULT_PAGE_CACHE_PATH, max_bytes or DEFAULT_MAX_BYTES)
+            except Exception as e:
+                print(f"⚠️ 페이지 캐시 사용 불가: {e}")
+                return None
+        return _shared_cache
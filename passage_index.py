@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+수집 텍스트 문단 검색/압축 (로컬 BM25, 네트워크 사용 없음)
+- 수집 텍스트를 최대 600자 안팎의 문단(passage)으로 나누고 역색인(BM25)을 만든다
+- 키워드/섹션 제목과 관련도가 높은 문단부터 토큰 예산을 채워 GPT 입력을 만든다
+  (앞에서부터 잘라 쓰는 대신 관련 있는 내용만 보냄)
+- 한글은 형태소 분석기 없이 음절 bigram, 영문/숫자는 단어 단위로 색인
+"""
+
+import re
+import math
+
+from llm_gateway import count_text_tokens
+from text_dedup import dedupe_texts
+
+
+PASSAGE_MIN_CHARS = 80       # 이보다 짧은 문단(제목/짧은 줄)은 다음 문단과 이어붙임
+PASSAGE_TARGET_CHARS = 400   # 이어붙일 때 최대 길이
+PASSAGE_MAX_CHARS = 600      # 이보다 긴 문단은 문장 단위로 나눔
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TERM_RE = re.compile(r'[가-힣]+|[a-z0-9]+')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?。])\s+')
+
+
+def tokenize(text):
+    """색인용 토큰 (한글: 음절 bigram, 한 글자 단어는 그대로 / 영문·숫자: 소문자 단어)"""
+    terms = []
+    for word in _TERM_RE.findall((text or '').lower()):
+        if '가' <= word[0] <= '힣':
+            if len(word) == 1:
+                terms.append(word)
+            else:
+                terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            terms.append(word)
+    return terms
+
+
+def split_passages(text, min_chars=PASSAGE_MIN_CHARS, target_chars=PASSAGE_TARGET_CHARS, max_chars=PASSAGE_MAX_CHARS):
+    """
+    텍스트를 검색 단위 문단으로 분할
+
+    Returns:
+        list: 문단 문자열 목록 (원문 순서)
+    """
+    pieces = []
+    for paragraph in re.split(r'\n+', text or ''):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        # 긴 문단은 문장 경계에서 max_chars 이내로 나눔
+        chunk = ""
+        for sentence in _SENTENCE_SPLIT_RE.split(paragraph):
+            if chunk and len(chunk) + len(sentence) + 1 > max_chars:
+                pieces.append(chunk)
+                chunk = ""
+            while len(sentence) > max_chars:
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            chunk = f"{chunk} {sentence}".strip()
+        if chunk:
+            pieces.append(chunk)
+
+    # 제목/짧은 줄은 다음 내용과 이어붙여 문맥 유지
+    passages = []
+    buffer = ""
+    for piece in pieces:
+        if buffer and (len(buffer) >= min_chars or len(buffer) + len(piece) + 1 > target_chars):
+            passages.append(buffer)
+            buffer = ""
+        buffer = f"{buffer}\n{piece}" if buffer else piece
+    if buffer:
+        passages.append(buffer)
+    return passages
+
+
+class PassageIndex:
+    """문단 BM25 역색인"""
+
+    def __init__(self, passages):
+        self.passages = list(passages)
+        self._postings = {}
+        self._lengths = []
+        for doc_id, passage in enumerate(self.passages):
+            terms = tokenize(passage)
+            self._lengths.append(len(terms))
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                self._postings.setdefault(term, []).append((doc_id, tf))
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+    @classmethod
+    def from_text(cls, text, dedupe=True):
+        """수집 텍스트에서 인덱스 생성 (dedupe=True면 거의 같은 문단은 하나만 색인)"""
+        passages = split_passages(text)
+        if dedupe and len(passages) > 1:
+            passages = [passages[i] for i in sorted(dedupe_texts(passages))]
+        return cls(passages)
+
+    def __len__(self):
+        return len(self.passages)
+
+    def scores(self, query):
+        """문단별 BM25 점수 목록"""
+        result = [0.0] * len(self.passages)
+        if not self.passages:
+            return result
+        total = len(self.passages)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc_id] / (self._avg_length or 1))
+                result[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return result
+
+    def combined_scores(self, queries):
+        """여러 질의 점수 합산 (queries: 문자열 또는 (문자열, 가중치) 목록)"""
+        total = [0.0] * len(self.passages)
+        for query in queries:
+            text, weight = query if isinstance(query, tuple) else (query, 1.0)
+            if not text:
+                continue
+            for doc_id, score in enumerate(self.scores(text)):
+                total[doc_id] += weight * score
+        return total
+
+    def select(self, queries, token_budget, top_k=None, min_score=0.0):
+        """
+        관련도 높은 문단부터 토큰 예산 안에서 선택
+
+        Args:
+            queries (list): 질의 목록 (문자열 또는 (문자열, 가중치))
+            token_budget (int): 선택할 문단 전체 토큰 상한
+            top_k (int): 최대 문단 수 (None이면 제한 없음)
+            min_score (float): 이 점수 이하 문단은 제외 (0.0이면 무관한 문단 제외)
+
+        Returns:
+            list: 선택된 문단 번호 (원문 순서)
+        """
+        scores = self.combined_scores(queries)
+        ranked = sorted(range(len(self.passages)), key=lambda i: (-scores[i], i))
+        chosen = []
+        used = 0
+        for doc_id in ranked:
+            if scores[doc_id] <= min_score:
+                break
+            if top_k is not None and len(chosen) >= top_k:
+                break
+            cost = count_text_tokens(self.passages[doc_id])
+            if used + cost > token_budget:
+                continue
+            chosen.append(doc_id)
+            used += cost
+        return sorted(chosen)
+
+    def select_texts(self, queries, token_budget, top_k=None):
+        """
+        select()로 고른 문단 텍스트 목록
+        예산 안에 들어가는 문단이 없으면 가장 관련 있는 문단을 예산만큼 잘라 반환 (작은 예산에서도 빈 결과 방지)
+        """
+        chosen = self.select(queries, token_budget, top_k=top_k)
+        if chosen:
+            return [self.passages[i] for i in chosen]
+        scores = self.combined_scores(queries)
+        if not scores or max(scores) <= 0.0:
+            return []
+        best = max(range(len(self.passages)), key=lambda i: (scores[i], -i))
+        return [_trim_to_tokens(self.passages[best], token_budget)]
+
+
+def _trim_to_tokens(passage, token_budget):
+    """문단을 토큰 예산 비율만큼 앞에서 자름"""
+    return passage[:max(1, len(passage) * token_budget // max(1, count_text_tokens(passage)))]
+
+
+def pack_context(text, queries, token_budget=4000):
+    """
+    수집 텍스트를 관련 문단 위주로 토큰 예산에 맞게 압축
+    관련 문단을 먼저 채우고, 예산이 남으면 나머지 문단을 원문 순서로 채운다.
+
+    Args:
+        text (str): 수집 텍스트
+        queries (list): 질의 목록 (키워드, 섹션 제목, 검색어 등 / (문자열, 가중치) 가능)
+        token_budget (int): 결과 텍스트 토큰 상한
+
+    Returns:
+        tuple: (압축 텍스트, 통계 dict: original_tokens/packed_tokens/ratio/passages/selected)
+    """
+    original_tokens = count_text_tokens(text)
+    index = PassageIndex.from_text(text)
+    chosen = index.select(queries, token_budget)
+    used = sum(count_text_tokens(index.passages[i]) for i in chosen)
+    chosen_set = set(chosen)
+    for doc_id, passage in enumerate(index.passages):
+        if doc_id in chosen_set:
+            continue
+        cost = count_text_tokens(passage)
+        if used + cost <= token_budget:
+            chosen_set.add(doc_id)
+            used += cost
+    packed = "\n\n".join(index.passages[i] for i in sorted(chosen_set))
+    if not packed and len(index):
+        # 문단 하나가 예산보다 큰 경우: 가장 관련 있는 문단을 예산 비율만큼 잘라 사용
+        scores = index.combined_scores(queries)
+        best = max(range(len(index)), key=lambda i: (scores[i], -i))
+        packed = _trim_to_tokens(index.passages[best], token_budget)
+        chosen_set = {best}
+    packed_tokens = count_text_tokens(packed)
+    stats = {
+        "original_tokens": original_tokens,
+        "packed_tokens": packed_tokens,
+        "ratio": packed_tokens / original_tokens if original_tokens else 1.0,
+        "passages": len(index),
+        "selected": len(chosen_set),
+        "relevant": len(chosen),
+    }
+    return packed, stats
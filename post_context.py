@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+글(포스트) 단위 실행 상태 관리 모듈
+여러 키워드의 글을 동시에 준비할 때 collected_web_data 같은 글별 상태가
+서로 섞이지 않도록 contextvars로 현재 글의 상태를 분리한다.
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+
+
+_current_post = contextvars.ContextVar("current_post", default=None)
+
+
+@contextmanager
+def post_scope(tag="", batch=False):
+    """
+    새 글 상태를 현재 컨텍스트에 설정하는 컨텍스트 매니저
+
+    Args:
+        tag (str): 글별 임시 파일명 등에 붙일 접두어 (동시 실행 시 파일 충돌 방지)
+        batch (bool): 동시 배치 실행 중인지 여부
+
+    Yields:
+        dict: 현재 글 상태
+    """
+    state = {"tag": tag, "batch": batch}
+    token = _current_post.set(state)
+    try:
+        yield state
+    finally:
+        _current_post.reset(token)
+
+
+def current_post_state():
+    """현재 컨텍스트의 글 상태 (post_scope 밖이면 None)"""
+    return _current_post.get()
+
+
+def current_post_tag():
+    """현재 글의 파일명 접두어 (post_scope 밖이면 빈 문자열)"""
+    state = _current_post.get()
+    return state.get("tag", "") if state else ""
+
+
+def submit_with_context(executor, fn, *args, **kwargs):
+    """현재 컨텍스트(글 상태 포함)를 유지한 채 executor에 작업 제출"""
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+class PostStateAttribute:
+    """
+    글 단위 상태를 인스턴스 속성처럼 다루는 디스크립터
+    - post_scope 안: 현재 글 상태 dict에 저장/조회
+    - post_scope 밖: 기존처럼 인스턴스별 저장소 사용
+    값이 없으면 AttributeError를 발생시켜 getattr(obj, name, 기본값) 패턴이 그대로 동작한다.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _store(self, obj):
+        state = _current_post.get()
+        if state is not None:
+            return state
+        return obj.__dict__.setdefault("_post_state_fallback", {})
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return self._store(obj)[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+    def __set__(self, obj, value):
+        self._store(obj)[self.name] = value
+
+    def __delete__(self, obj):
+        self._store(obj).pop(self.name, None)
+
+
+class ServiceLimiter:
+    """서비스별(웹 검색, 이미지 등) 동시 실행 수 제한"""
+
+    def __init__(self, limits=None):
+        self._limits = dict(limits or {})
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def update_limits(self, limits):
+        """제한값 갱신 (이미 생성된 세마포어는 다음 배치부터 반영)"""
+        with self._lock:
+            self._limits = dict(limits or {})
+            self._semaphores = {}
+
+    @contextmanager
+    def slot(self, service):
+        """service의 동시 실행 슬롯 하나를 점유 (제한이 없으면 그대로 통과)"""
+        with self._lock:
+            semaphore = self._semaphores.get(service)
+            if semaphore is None:
+                limit = self._limits.get(service)
+                if not limit or int(limit) <= 0:
+                    semaphore = None
+                else:
+                    semaphore = threading.BoundedSemaphore(int(limit))
+                    self._semaphores[service] = semaphore
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
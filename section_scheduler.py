@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+섹션 생성 스케줄러
+섹션 간 의존 관계(이전 섹션 내용 참조 여부)에 따라 섹션 생성 작업을
+순차/병렬로 실행하는 모듈
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+# 지원하는 섹션 생성 모드
+# - sequential : 모든 이전 섹션 내용을 참고하며 한 섹션씩 생성 (기존 방식)
+# - intro_first: 첫 섹션만 먼저 생성하고, 나머지는 첫 섹션 + 개요를 참고해 병렬 생성
+# - parallel   : 모든 섹션을 개요(final_title + section_titles)만 참고해 동시에 생성
+SECTION_MODES = ("sequential", "intro_first", "parallel")
+
+
+def build_section_dependencies(count, mode="sequential"):
+    """
+    섹션 생성 모드에 따른 의존성 목록 생성
+
+    Args:
+        count (int): 섹션 개수
+        mode (str): 섹션 생성 모드 (SECTION_MODES 중 하나)
+
+    Returns:
+        list: 각 섹션이 먼저 완료되어야 하는 섹션 인덱스 집합의 리스트
+    """
+    if mode == "parallel":
+        return [set() for _ in range(count)]
+    if mode == "intro_first":
+        return [set()] + [{0} for _ in range(count - 1)] if count else []
+    # sequential (기본값)
+    return [set() if i == 0 else {i - 1} for i in range(count)]
+
+
+def _dependency_closure(index, dependencies):
+    """index 섹션이 (간접적으로) 의존하는 모든 섹션 인덱스"""
+    closure = set()
+    stack = list(dependencies[index])
+    while stack:
+        dep = stack.pop()
+        if dep in closure:
+            continue
+        closure.add(dep)
+        stack.extend(dependencies[dep])
+    return closure
+
+
+def run_section_schedule(count, generate_fn, dependencies, max_workers=4,
+                         on_section_done=None, should_continue=None):
+    """
+    의존성을 만족하는 섹션부터 스레드 풀에서 생성하는 스케줄러
+
+    Args:
+        count (int): 섹션 개수
+        generate_fn (callable): generate_fn(i, dep_results) -> 섹션 결과.
+            dep_results는 {섹션 인덱스: 결과} 형태로 의존 섹션의 완료 결과만 담김
+        dependencies (list): build_section_dependencies() 결과
+        max_workers (int): 동시에 생성할 최대 섹션 수
+        on_section_done (callable): on_section_done(i, result, error) - 각 섹션 완료 시
+            호출 스레드에서 완료 순서대로 호출됨
+        should_continue (callable): False를 반환하면 새 섹션 작업을 더 이상 시작하지 않음
+
+    Returns:
+        tuple: (results, errors) - 섹션 순서대로 정렬된 결과/예외 리스트 (미실행 섹션은 None)
+    """
+    results = [None] * count
+    errors = [None] * count
+    finished = set()
+    pending = set(range(count))
+    running = {}
+    closures = [_dependency_closure(i, dependencies) for i in range(count)]
+
+    if count == 0:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, count))) as executor:
+        while pending or running:
+            stopped = should_continue is not None and not should_continue()
+
+            # 의존 섹션이 모두 끝난 섹션부터 순서대로 제출
+            if not stopped:
+                for i in sorted(pending):
+                    if len(running) >= max_workers:
+                        break
+                    if not dependencies[i] <= finished:
+                        continue
+                    dep_results = {j: results[j] for j in sorted(closures[i]) if results[j] is not None}
+                    # 호출 스레드의 컨텍스트(글별 상태 등)를 섹션 작업 스레드에도 전달
+                    ctx = contextvars.copy_context()
+                    running[executor.submit(ctx.run, generate_fn, i, dep_results)] = i
+                    pending.discard(i)
+            else:
+                pending.clear()
+
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    errors[i] = e
+                # 실패한 섹션도 완료로 처리하여 의존 섹션이 멈추지 않도록 함
+                finished.add(i)
+                if on_section_done:
+                    try:
+                        on_section_done(i, results[i], errors[i])
+                    except Exception as cb_e:
+                        print(f"⚠️ 섹션 완료 콜백 오류: {cb_e}")
+
+    return results, errors
+
+
+def build_outline_context(final_title, section_titles, current_index):
+    """병렬 생성 시 이전 섹션 내용 대신 전달할 글 전체 개요 문자열"""
+    lines = [
+        f"전체 글 제목: {final_title}",
+        "전체 섹션 구성 (다른 섹션이 다룰 내용은 쓰지 말고 현재 섹션 주제에만 집중):",
+    ]
+    for j, title in enumerate(section_titles):
+        marker = "  ← 현재 작성할 섹션" if j == current_index else ""
+        lines.append(f"{j + 1}. {title}{marker}")
+    return "\n".join(lines)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_extract import extract_main_text_from_stream
+
+
+PAGE = (
+    "<html><head><title>제목</title><script>var x = '무시';</script></head><body>"
+    "<nav>메뉴 항목</nav>"
+    "<article><h1>한글 단어가 여기에 있습니다.</h1>"
+    "<p>첫 번째 문단은 <b>굵은 글씨</b>와 링크 <a href='#'>여기</a>를 포함합니다 &amp; 엔티티도 있습니다.</p>"
+    "<p>Second paragraph with English words split across chunk boundaries.</p>"
+    "</article><footer>바닥글</footer></body></html>"
+)
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16, 64])
+def test_chunked_stream_matches_unchunked(chunk_size):
+    raw = PAGE.encode("utf-8")
+    expected = extract_main_text_from_stream([raw], max_length=1000)
+    assert extract_main_text_from_stream(_chunks(raw, chunk_size), max_length=1000) == expected
+
+
+def test_words_are_not_split_at_chunk_boundaries():
+    text = extract_main_text_from_stream(_chunks(PAGE.encode("utf-8"), 7), max_length=1000)
+    assert "한글 단어가 여기에 있습니다." in text
+    assert "& 엔티티도" in text
+    assert "chunk boundaries." in text
+    assert "메뉴" not in text and "무시" not in text
@@ -0,0 +1,68 @@
+import threading
+
+from image_fingerprint import ImageFingerprintStore, ImageUrlReservations
+
+
+def test_checked_candidate_is_reserved_for_other_matches():
+    reservations = ImageUrlReservations()
+    first, second = reservations.view(), reservations.view()
+    assert "https://img/1.jpg" not in first
+    assert "https://img/1.jpg" in second
+    reservations.finish(first)
+    assert "https://img/1.jpg" not in reservations.view()
+
+
+def test_finish_keeps_only_used_urls():
+    reservations = ImageUrlReservations()
+    view = reservations.view()
+    for url in ("a", "b", "c"):
+        assert url not in view
+    view.add("a")
+    reservations.finish(view, used=list(view))
+    assert "a" in reservations and "b" not in reservations
+    assert "a" in reservations.view() and "b" not in reservations.view()
+
+
+def test_add_without_check_reports_conflict():
+    reservations = ImageUrlReservations()
+    first, second = reservations.view(), reservations.view()
+    first.add("a")
+    second.add("a")
+    assert not first.conflicts
+    assert second.conflicts == {"a"}
+
+
+def test_concurrent_matches_pick_distinct_urls():
+    reservations = ImageUrlReservations()
+    candidates = [f"https://img/{n}.jpg" for n in range(50)]
+    picked = []
+    barrier = threading.Barrier(8)
+
+    def match():
+        view = reservations.view()
+        barrier.wait()
+        chosen = []
+        for url in candidates:
+            if url not in view:
+                chosen.append(url)
+                view.add(url)
+            if len(chosen) == 5:
+                break
+        assert not view.conflicts
+        reservations.finish(view, used=chosen)
+        picked.extend(chosen)
+
+    threads = [threading.Thread(target=match) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(picked) == 40 and len(set(picked)) == 40
+
+
+def test_check_and_add_many_records_url_when_image_missing(tmp_path):
+    store = ImageFingerprintStore(str(tmp_path / "fingerprints.sqlite3"))
+    assert store.check_and_add_many([("https://img/1.jpg", None)]) == []
+    assert store.contains_url("https://img/1.jpg")
+    rejected = store.check_and_add_many([("https://img/1.jpg", None)])
+    assert [url for url, _ in rejected] == ["https://img/1.jpg"]
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+유사 중복 텍스트 제거 (shingle + MinHash LSH)
+URL은 다르지만 본문이 거의 같은 기사(통신사 기사 재전송 등)를 찾아 하나만 남긴다.
+- 공백/문장부호를 제거한 문자 n-gram(shingle) 집합 사용 (한글은 단어 단위보다 문자 단위가 안정적)
+- 64칸 MinHash 서명을 4개씩 16개 밴드로 나눠, 한 밴드라도 같은 문서만 후보로 비교
+- 후보는 실제 shingle 자카드 유사도로 확인 (기본 0.6 이상이면 중복)
+- 중복 묶음에서는 고유 shingle이 가장 많은(정보량이 많은) 변형을 첫 등장 위치에 남김
+"""
+
+import re
+import hashlib
+
+
+SHINGLE_SIZE = 4                # 문자 n-gram 길이
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16                  # 밴드 수 (밴드당 4개 해시)
+NEAR_DUPLICATE_JACCARD = 0.6    # 이 자카드 유사도 이상이면 중복으로 판단
+MIN_DEDUP_LENGTH = 80           # 이보다 짧은 텍스트는 비교하지 않음 (제목/URL 줄 등)
+
+_NORMALIZE_RE = re.compile(r'[\s\W_]+', re.UNICODE)
+_EMPTY_BIN = 1 << 64
+_ROWS_PER_BAND = MINHASH_PERMUTATIONS // LSH_BANDS
+
+
+def _normalize(text):
+    return _NORMALIZE_RE.sub('', (text or '').lower())
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """정규화된 텍스트의 문자 n-gram 집합"""
+    normalized = _normalize(text)
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def minhash_signature(shingle_set):
+    """
+    shingle 집합의 MinHash 서명 (one-permutation hashing)
+    해시 하나를 MINHASH_PERMUTATIONS개 구간으로 나눠 구간별 최솟값을 사용하므로 shingle 수에 선형
+    (빈 구간은 같은 값으로 채워지지만, 후보는 실제 자카드 유사도로 다시 확인하므로 오탐이 남지 않음)
+    """
+    signature = [_EMPTY_BIN] * MINHASH_PERMUTATIONS
+    for shingle in shingle_set:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        bin_index = value % MINHASH_PERMUTATIONS
+        value //= MINHASH_PERMUTATIONS
+        if value < signature[bin_index]:
+            signature[bin_index] = value
+    return tuple(signature)
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """MinHash 밴드 LSH 인덱스 (추가한 순서대로 항목 번호를 돌려줌)"""
+
+    def __init__(self, threshold=NEAR_DUPLICATE_JACCARD):
+        self.threshold = threshold
+        self._shingle_sets = []
+        self._bands = [{} for _ in range(LSH_BANDS)]
+
+    @staticmethod
+    def _band_keys(signature):
+        return [
+            signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND]
+            for band in range(LSH_BANDS)
+        ]
+
+    def find(self, shingle_set, signature):
+        """이미 추가된 유사 항목 번호 (없으면 None)"""
+        checked = set()
+        for table, key in zip(self._bands, self._band_keys(signature)):
+            for index in table.get(key, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                if jaccard(shingle_set, self._shingle_sets[index]) >= self.threshold:
+                    return index
+        return None
+
+    def add(self, shingle_set, signature):
+        """항목 추가 후 번호 반환"""
+        index = len(self._shingle_sets)
+        self._shingle_sets.append(shingle_set)
+        for table, key in zip(self._bands, self._band_keys(signature)):
+            table.setdefault(key, []).append(index)
+        return index
+
+
+def dedupe_texts(texts, threshold=NEAR_DUPLICATE_JACCARD, min_length=MIN_DEDUP_LENGTH):
+    """
+    유사 중복 텍스트 묶기
+
+    Args:
+        texts (list): 텍스트 목록
+        threshold (float): 중복으로 볼 최소 자카드 유사도
+        min_length (int): 비교 대상 최소 길이 (짧은 텍스트는 항상 유지)
+
+    Returns:
+        list: 남길 원본 인덱스 목록 (첫 등장 순서, 각 묶음에서 정보량이 가장 많은 변형)
+    """
+    index = NearDuplicateIndex(threshold)
+    kept = []            # 결과 자리별 원본 인덱스
+    richness = []        # 결과 자리별 고유 shingle 수
+    slot_of_group = {}   # LSH 항목 번호 → 결과 자리
+    for i, text in enumerate(texts):
+        if len(_normalize(text)) < min_length:
+            kept.append(i)
+            richness.append(None)
+            continue
+        shingle_set = shingles(text)
+        signature = minhash_signature(shingle_set)
+        group = index.find(shingle_set, signature)
+        if group is None:
+            slot_of_group[index.add(shingle_set, signature)] = len(kept)
+            kept.append(i)
+            richness.append(len(shingle_set))
+            continue
+        slot = slot_of_group[group]
+        if len(shingle_set) > richness[slot]:
+            kept[slot] = i
+            richness[slot] = len(shingle_set)
+    return kept
+
+
+def dedupe_results(results, field='content', threshold=NEAR_DUPLICATE_JACCARD):
+    """
+    검색 결과(dict 목록)에서 본문이 거의 같은 항목 제거
+
+    Returns:
+        list: 중복 제거된 결과 목록
+    """
+    if len(results) < 2:
+        return list(results)
+    kept = dedupe_texts([r.get(field) or '' for r in results], threshold)
+    removed = len(results) - len(kept)
+    if removed:
+        print(f"🧹 유사 중복 본문 {removed}건 제거 (MinHash)")
+    return [results[i] for i in kept]
+
+
+def dedupe_text_blocks(text, threshold=NEAR_DUPLICATE_JACCARD):
+    """
+    여러 출처를 이어붙인 수집 텍스트에서 거의 같은 문단 제거 (빈 줄 기준, 없으면 줄 기준)
+
+    Returns:
+        tuple: (중복 제거된 텍스트, 제거된 문단 수)
+    """
+    if not text:
+        return text, 0
+    separator = '\n\n'
+    blocks = [b for b in re.split(r'\n\s*\n', text) if b.strip()]
+    if len(blocks) < 2:
+        separator = '\n'
+        blocks = [b for b in text.split('\n') if b.strip()]
+    if len(blocks) < 2:
+        return text, 0
+    kept = dedupe_texts(blocks, threshold)
+    removed = len(blocks) - len(kept)
+    if not removed:
+        return text, 0
+    return separator.join(blocks[i] for i in kept), removed
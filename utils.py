@@ -9,25 +9,61 @@ import xml.etree.ElementTree as ET
 from datetime import datetime
 import os
 import re
-from bs4 import BeautifulSoup
-from urllib.parse import quote_plus
-
-# moviepy는 조건부로 import
-try:
-    from moviepy.editor import VideoFileClip
-    MOVIEPY_AVAILABLE = True
-except ImportError:
-    MOVIEPY_AVAILABLE = False
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import quote_plus, urlparse
+from importlib.util import find_spec
+
+# moviepy/playwright/bs4는 import 비용이 커서 설치 여부만 확인하고 실제 import는 사용할 때 수행
+MOVIEPY_AVAILABLE = find_spec("moviepy") is not None
+if not MOVIEPY_AVAILABLE:
     print("⚠️ moviepy 모듈이 없습니다. 비디오 변환 기능이 제한됩니다.")
 
-# Playwright는 조건부로 import
-try:
-    from playwright.sync_api import sync_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+PLAYWRIGHT_AVAILABLE = find_spec("playwright") is not None
+if not PLAYWRIGHT_AVAILABLE:
     print("⚠️ playwright 모듈이 없습니다. 웹 수집 기능이 제한됩니다.")
 
+# 장기 실행 브라우저 풀 (URL마다 Chromium을 새로 실행하지 않음)
+from browser_pool import get_browser_pool
+
+# 공용 HTTP 세션 (호스트별 keep-alive 연결 재사용)
+from http_client import get_http_session
+
+# 도메인별 추출 전략 (정적 추출 우선, 필요한 도메인만 브라우저)
+from extraction_strategy import get_strategy_table, is_static_text_sufficient, MIN_STATIC_TEXT_LENGTH
+
+# 페이지/검색 결과 디스크 캐시 (조건부 GET 재검증)
+from page_cache import get_page_cache
+
+# HTML 본문 추출 엔진 (selectolax/lxml 우선, 없으면 BeautifulSoup)
+from html_extract import (
+    CONTENT_SELECTORS, STREAM_CHUNK_SIZE, charset_from_content_type,
+    extract_main_text, extract_main_text_from_stream,
+)
+
+# 유사 중복 본문 제거 (MinHash LSH)
+from text_dedup import dedupe_results
+
+# 블로그 이력 전체 기준 이미지 중복 방지 (pHash 지문 저장소)
+from image_fingerprint import get_image_fingerprint_store
+
+# 검색 결과 페이지 동시 추출 설정
+FETCH_MAX_WORKERS = 8       # 전체 동시 추출 수
+FETCH_PER_HOST_LIMIT = 2    # 같은 호스트 동시 요청 수
+SEARCH_DEADLINE_SECONDS = 25  # 웹 검색 1회 전체 제한 시간 (초과 시 끝난 결과만 사용)
+STATIC_FETCH_MAX_BYTES = 2 * 1024 * 1024  # 정적 추출 시 페이지당 최대 다운로드 바이트
+
+# Sora 참고 이미지 동시 다운로드 설정
+IMAGE_DOWNLOAD_WORKERS = 6
+IMAGE_DOWNLOAD_MAX_BYTES = 8 * 1024 * 1024   # 이미지당 최대 다운로드 바이트 (초과 시 건너뜀)
+IMAGE_DECODE_DRAFT_SIZE = (1024, 1024)       # JPEG은 이 크기 이상을 유지하는 가장 작은 배율로 디코딩
+
+_fetch_executor = None
+_fetch_executor_lock = threading.Lock()
+_host_semaphores = {}
+
 
 def collect_google_trends():
     """
@@ -48,12 +84,11 @@ def collect_google_trends():
         
         print("🔍 구글 트렌드 수집 시작...")
         
-        # 연결 풀 사용으로 성능 향상
-        session = requests.Session()
-        session.headers.update(headers)
+        # 공용 세션의 연결 풀 사용으로 성능 향상
+        session = get_http_session()
         
         # 타임아웃 단축 (5초)
-        response = session.get(url, timeout=5)
+        response = session.get(url, headers=headers, timeout=5)
         response.raise_for_status()
         
         # 응답 크기 체크 (너무 큰 응답 방지)
@@ -101,36 +136,101 @@ def collect_google_trends():
     except Exception as e:
         print(f"❌ 구글 트렌드 수집 중 오류: {e}")
         return ""
-    finally:
-        # 세션 정리
-        if 'session' in locals():
-            session.close()
 
 
-def search_web_content(search_keywords, max_results=3):
+def _get_fetch_executor():
+    """페이지 추출용 공용 스레드 풀"""
+    global _fetch_executor
+    with _fetch_executor_lock:
+        if _fetch_executor is None:
+            _fetch_executor = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix="page-fetch")
+        return _fetch_executor
+
+
+def _host_semaphore(url):
+    """호스트별 동시 요청 제한 세마포어"""
+    host = urlparse(url).netloc.lower()
+    with _fetch_executor_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(FETCH_PER_HOST_LIMIT)
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+
+def _extract_with_host_limit(url, max_length, deadline):
+    """호스트 동시 요청 제한을 지키며 페이지 추출 (마감 시간이 지났으면 건너뜀)"""
+    with _host_semaphore(url):
+        if deadline is not None and time.monotonic() >= deadline:
+            return ""
+        return extract_web_content(url, max_length)
+
+
+def fetch_contents_concurrently(urls, max_length=1000, deadline=None):
+    """
+    여러 페이지 내용을 동시에 추출하는 함수
+    
+    Args:
+        urls (list): 페이지 URL 리스트
+        max_length (int): 페이지별 최대 추출 길이
+        deadline (float): time.monotonic() 기준 마감 시각 (지나면 끝난 결과만 반환)
+    
+    Returns:
+        dict: {url: 추출된 텍스트} (마감 전에 끝나지 않은 페이지는 빈 문자열)
+    """
+    unique_urls = [u for u in dict.fromkeys(urls) if u]
+    if not unique_urls:
+        return {}
+    executor = _get_fetch_executor()
+    futures = {executor.submit(_extract_with_host_limit, url, max_length, deadline): url for url in unique_urls}
+    timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+    done, not_done = wait(futures, timeout=timeout)
+    
+    contents = {}
+    for future in done:
+        try:
+            contents[futures[future]] = future.result()
+        except Exception as e:
+            print(f"❌ 페이지 추출 실패 ({futures[future]}): {e}")
+            contents[futures[future]] = ""
+    for future in not_done:
+        # 아직 시작하지 않은 작업은 취소, 실행 중인 작업은 결과를 기다리지 않음
+        future.cancel()
+        contents[futures[future]] = ""
+    if not_done:
+        print(f"⏱️ 마감 시간 초과로 {len(not_done)}개 페이지 추출 결과 제외")
+    return contents
+
+
+def search_web_content(search_keywords, max_results=3, deadline_seconds=SEARCH_DEADLINE_SECONDS):
     """
     웹 검색을 통해 관련 내용을 수집하는 함수
+    Bing/Naver 검색과 결과 페이지 추출을 모두 동시에 진행하고,
+    deadline_seconds가 지나면 그때까지 끝난 결과만 사용한다.
     
     Args:
         search_keywords (str): 검색 키워드
         max_results (int): 최대 결과 수 (기본값: 3)
+        deadline_seconds (float): 전체 제한 시간 (초)
     
     Returns:
         list: 수집된 웹 콘텐츠 리스트 (dict 형태)
     """
     try:
         print(f"🔍 웹 검색 시작: {search_keywords}")
+        started = time.monotonic()
+        deadline = started + deadline_seconds if deadline_seconds else None
         
-        # 검색 결과 수집
+        # 검색 결과 수집 (Bing/Naver 동시 실행, 결과 순서는 Bing → Naver 유지)
         search_results = []
-        
-        # 1. Bing 검색 결과 수집
-        bing_results = search_bing(search_keywords, max_results)
-        search_results.extend(bing_results)
-        
-        # 2. Naver 검색 결과 수집
-        naver_results = search_naver(search_keywords, max_results)
-        search_results.extend(naver_results)
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-engine") as engine_executor:
+            bing_future = engine_executor.submit(search_bing, search_keywords, max_results, deadline)
+            naver_future = engine_executor.submit(search_naver, search_keywords, max_results, deadline)
+            # 1. Bing 검색 결과 수집
+            search_results.extend(bing_future.result())
+            # 2. Naver 검색 결과 수집
+            search_results.extend(naver_future.result())
+        print(f"⏱️ 검색 + 페이지 추출 소요: {time.monotonic() - started:.1f}초")
         
         # 중복 제거 및 정렬
         unique_results = remove_duplicate_results(search_results)
@@ -146,30 +246,58 @@ def search_web_content(search_keywords, max_results=3):
         return []
 
 
-def search_bing(search_keywords, max_results=3):
-    """Bing 검색 결과 수집"""
+def _load_cached_search_results(cache_key):
+    """캐시된 검색 결과 목록 (TTL 내인 경우만, 내용은 페이지 캐시에서 따로 조회)"""
+    cache = get_page_cache()
+    entry = cache.get(cache_key, source_type="search") if cache else None
+    if entry is None or not entry.is_fresh:
+        return None
+    try:
+        results = json.loads(entry.text)
+    except ValueError:
+        return None
+    cache.record("hit")
+    print(f"📦 검색 결과 캐시 사용: {len(results)}개")
+    return results
+
+
+def _store_search_results(cache_key, results):
+    """검색 결과 목록 저장 (본문 내용 제외)"""
+    cache = get_page_cache()
+    if cache is None or not results:
+        return
+    cache.record("miss")
+    listing = [{k: v for k, v in r.items() if k != 'content'} for r in results]
+    cache.put(cache_key, json.dumps(listing, ensure_ascii=False), source_type="search")
+
+
+def search_bing(search_keywords, max_results=3, deadline=None):
+    """Bing 검색 결과 수집 (결과 페이지 내용은 동시 추출, deadline은 time.monotonic() 기준 마감 시각)"""
     try:
         # Bing 검색 URL 생성
         encoded_keywords = quote_plus(search_keywords)
         search_url = f"https://www.bing.com/search?q={encoded_keywords}&format=rss"
+        cache_key = f"{search_url}&_max={max_results}"
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/rss+xml, application/xml, text/xml, */*',
-            'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8'
-        }
-        
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        response = session.get(search_url, timeout=10)
-        response.raise_for_status()
-        
-        # RSS 파싱
-        root = ET.fromstring(response.content)
-        results = []
+        results = _load_cached_search_results(cache_key)
+        items = []
+        if results is None:
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept': 'application/rss+xml, application/xml, text/xml, */*',
+                'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8'
+            }
+            
+            session = get_http_session()
+            
+            response = session.get(search_url, headers=headers, timeout=10)
+            response.raise_for_status()
+            
+            # RSS 파싱
+            root = ET.fromstring(response.content)
+            results = []
+            items = root.findall('.//item')[:max_results]
         
-        items = root.findall('.//item')[:max_results]
         for item in items:
             title_elem = item.find('title')
             link_elem = item.find('link')
@@ -180,18 +308,20 @@ def search_bing(search_keywords, max_results=3):
                 url = link_elem.text.strip() if link_elem.text else ""
                 description = description_elem.text.strip() if description_elem and description_elem.text else ""
                 
-                # 웹 페이지 내용 수집
-                content = extract_web_content(url)
-                
                 results.append({
                     'title': title,
                     'url': url,
                     'description': description,
-                    'content': content,
+                    'content': "",
                     'source': 'bing'
                 })
+        if items:
+            _store_search_results(cache_key, results)
         
-        session.close()
+        # 웹 페이지 내용 수집 (결과 페이지 동시 추출)
+        contents = fetch_contents_concurrently([r['url'] for r in results], deadline=deadline)
+        for result in results:
+            result['content'] = contents.get(result['url'], "")
         return results
         
     except Exception as e:
@@ -199,31 +329,35 @@ def search_bing(search_keywords, max_results=3):
         return []
 
 
-def search_naver(search_keywords, max_results=3):
-    """Naver 검색 결과 수집"""
+def search_naver(search_keywords, max_results=3, deadline=None):
+    """Naver 검색 결과 수집 (결과 페이지 내용은 동시 추출, deadline은 time.monotonic() 기준 마감 시각)"""
     try:
         # Naver 검색 URL 생성
         encoded_keywords = quote_plus(search_keywords)
         search_url = f"https://search.naver.com/search.naver?where=news&query={encoded_keywords}"
+        cache_key = f"{search_url}&_max={max_results}"
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8'
-        }
-        
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        response = session.get(search_url, timeout=10)
-        response.raise_for_status()
-        
-        # HTML 파싱
-        soup = BeautifulSoup(response.content, 'html.parser')
-        results = []
-        
-        # 뉴스 결과 추출
-        news_items = soup.find_all('div', class_='news_wrap')[:max_results]
+        results = _load_cached_search_results(cache_key)
+        news_items = []
+        if results is None:
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8'
+            }
+            
+            session = get_http_session()
+            
+            response = session.get(search_url, headers=headers, timeout=10)
+            response.raise_for_status()
+            
+            # HTML 파싱
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(response.content, 'html.parser')
+            results = []
+            
+            # 뉴스 결과 추출
+            news_items = soup.find_all('div', class_='news_wrap')[:max_results]
         
         for item in news_items:
             title_elem = item.find('a', class_='news_tit')
@@ -235,18 +369,20 @@ def search_naver(search_keywords, max_results=3):
                 url = link_elem.get('href', '')
                 description = description_elem.get_text(strip=True) if description_elem else ""
                 
-                # 웹 페이지 내용 수집
-                content = extract_web_content(url)
-                
                 results.append({
                     'title': title,
                     'url': url,
                     'description': description,
-                    'content': content,
+                    'content': "",
                     'source': 'naver'
                 })
+        if news_items:
+            _store_search_results(cache_key, results)
         
-        session.close()
+        # 웹 페이지 내용 수집 (결과 페이지 동시 추출)
+        contents = fetch_contents_concurrently([r['url'] for r in results], deadline=deadline)
+        for result in results:
+            result['content'] = contents.get(result['url'], "")
         return results
         
     except Exception as e:
@@ -256,7 +392,10 @@ def search_naver(search_keywords, max_results=3):
 
 def extract_web_content(url, max_length=1000):
     """
-    웹 페이지에서 주요 내용을 추출하는 함수
+    웹 페이지에서 주요 내용을 추출하는 함수 (단계별 추출)
+    1) 정적 HTTP 요청 + 파싱 (빠름)
+    2) 본문이 부족하거나 JS가 필요한 도메인이면 헤드리스 브라우저로 재시도
+    도메인별 결과는 기록해 두었다가 다음부터 실패할 단계를 건너뜀
     
     Args:
         url (str): 웹 페이지 URL
@@ -269,80 +408,90 @@ def extract_web_content(url, max_length=1000):
         if not url or not url.startswith('http'):
             return ""
         
-        # Playwright 사용 (가능한 경우)
-        if PLAYWRIGHT_AVAILABLE:
-            return extract_content_with_playwright(url, max_length)
-        else:
-            return extract_content_with_requests(url, max_length)
+        # 페이지 캐시: TTL 안이면 그대로 사용, 지났으면 조건부 GET으로 재검증
+        cache = get_page_cache()
+        entry = cache.get(url, max_length=max_length) if cache else None
+        if entry is not None and entry.is_fresh:
+            cache.record("hit")
+            return _limit_text(entry.text, max_length)
+        conditional_headers = entry.conditional_headers() if entry is not None and entry.can_revalidate else None
+        
+        text, etag, last_modified, not_modified = _extract_tiered(url, max_length, conditional_headers)
+        if not_modified:
+            cache.touch(url)
+            cache.record("revalidated")
+            return _limit_text(entry.text, max_length)
+        
+        if cache is not None:
+            cache.record("miss")
+            cache.put(url, text, etag=etag, last_modified=last_modified, max_length=max_length)
+        return text
             
     except Exception as e:
         print(f"❌ 웹 페이지 내용 추출 중 오류: {e}")
         return ""
 
 
+def _limit_text(text, max_length):
+    """캐시된 텍스트를 요청 길이에 맞게 자르기"""
+    if text.endswith("...") and len(text) - 3 <= max_length:
+        return text
+    if len(text) > max_length:
+        return text[:max_length] + "..."
+    return text
+
+
+def _extract_tiered(url, max_length, conditional_headers=None):
+    """
+    정적 추출 → (필요 시) 브라우저 추출
+    
+    Returns:
+        tuple: (텍스트, ETag, Last-Modified, 304 여부)
+    """
+    # Playwright가 없으면 정적 추출만 사용
+    if not PLAYWRIGHT_AVAILABLE:
+        return _fetch_static_page(url, max_length, conditional_headers)
+    
+    strategy = get_strategy_table()
+    if strategy.preferred_tier(url) == "static":
+        text, etag, last_modified, not_modified = _fetch_static_page(url, max_length, conditional_headers)
+        if not_modified:
+            return text, etag, last_modified, True
+        if is_static_text_sufficient(text):
+            strategy.record(url, "static", True)
+            return text, etag, last_modified, False
+        strategy.record(url, "static", False)
+        print(f"🔁 정적 추출 본문 부족({len(text)}자) → 브라우저로 재시도: {url}")
+    
+    text = extract_content_with_playwright(url, max_length)
+    strategy.record(url, "browser", bool(text))
+    return text, None, None, False
+
+
+def extract_text_from_html(html, max_length=1000):
+    """HTML에서 본문 텍스트 추출 (본문 영역 선택자 우선, 없으면 전체 텍스트)"""
+    return extract_main_text(html, max_length)
+
+
 def extract_content_with_playwright(url, max_length=1000):
-    """Playwright를 사용한 웹 페이지 내용 추출"""
+    """Playwright를 사용한 웹 페이지 내용 추출 (공용 브라우저 풀의 페이지 재사용)"""
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            
-            # 페이지 로드
-            page.goto(url, timeout=15000)
-            page.wait_for_timeout(2000)
-            
-            # 네이버 블로그인 경우 iframe 처리
-            if "blog.naver.com" in url:
-                try:
-                    page.wait_for_selector("iframe#mainFrame", timeout=5000)
-                    frame = page.frame(name="mainFrame")
-                    if frame:
-                        html = frame.content()
-                    else:
-                        html = page.content()
-                except:
-                    html = page.content()
-            else:
-                html = page.content()
-            
-            browser.close()
-            
-            # HTML 파싱 및 텍스트 추출
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # 불필요한 요소 제거
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            # 주요 콘텐츠 영역 찾기
-            content_selectors = [
-                'article', 'main', '.content', '.post-content', '.entry-content',
-                '.article-content', '.post-body', '.entry-body', '.main-content'
-            ]
-            
-            content_text = ""
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    for element in elements:
-                        text = element.get_text(separator=' ', strip=True)
-                        if len(text) > len(content_text):
-                            content_text = text
-            
-            # 주요 콘텐츠를 찾지 못한 경우 전체 텍스트 사용
-            if not content_text:
-                content_text = soup.get_text(separator=' ', strip=True)
-            
-            # 텍스트 정리
-            content_text = re.sub(r'\s+', ' ', content_text)
-            content_text = content_text.strip()
-            
-            # 길이 제한
-            if len(content_text) > max_length:
-                content_text = content_text[:max_length] + "..."
-            
-            return content_text
-            
+        pool = get_browser_pool()
+        if pool is None:
+            return extract_content_with_requests(url, max_length)
+        
+        # 네이버 블로그인 경우 iframe 처리
+        if "blog.naver.com" in url:
+            html = pool.fetch_html(url, timeout=30, timeout_ms=15000, frame_selector="iframe#mainFrame", frame_name="mainFrame",
+                                   ready_min_text=MIN_STATIC_TEXT_LENGTH)
+        else:
+            # 본문 영역에 정적 추출 기준만큼 텍스트가 채워지는 즉시 반환 (빈 틀이면 network-idle 상한까지 대기)
+            html = pool.fetch_html(url, timeout=30, timeout_ms=15000, ready_selectors=CONTENT_SELECTORS,
+                                   ready_min_text=MIN_STATIC_TEXT_LENGTH)
+        
+        # HTML 파싱 및 텍스트 추출
+        return extract_text_from_html(html, max_length)
+        
     except Exception as e:
         print(f"❌ Playwright 내용 추출 중 오류: {e}")
         return ""
@@ -350,45 +499,58 @@ def extract_content_with_playwright(url, max_length=1000):
 
 def extract_content_with_requests(url, max_length=1000):
     """Requests를 사용한 웹 페이지 내용 추출"""
+    text, _, _, _ = _fetch_static_page(url, max_length)
+    return text
+
+
+def _fetch_static_page(url, max_length=1000, conditional_headers=None):
+    """
+    정적 HTTP 요청으로 페이지 본문 추출
+    
+    Args:
+        url (str): 페이지 URL
+        max_length (int): 최대 추출 길이
+        conditional_headers (dict): 캐시 재검증용 If-None-Match/If-Modified-Since 헤더
+    
+    Returns:
+        tuple: (텍스트, ETag, Last-Modified, 304 여부)
+    """
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8'
         }
+        if conditional_headers:
+            headers.update(conditional_headers)
         
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        response = session.get(url, timeout=10)
-        response.raise_for_status()
-        
-        # HTML 파싱
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 불필요한 요소 제거
-        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-            element.decompose()
-        
-        # 텍스트 추출
-        text = soup.get_text(separator=' ', strip=True)
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
-        # 길이 제한
-        if len(text) > max_length:
-            text = text[:max_length] + "..."
+        session = get_http_session()
         
-        session.close()
-        return text
+        # 본문을 조각 단위로 받아 파싱, 충분한 본문이 모이거나 상한에 도달하면 나머지는 받지 않음
+        response = session.get(url, headers=headers, timeout=10, stream=True)
+        try:
+            if response.status_code == 304:
+                return "", None, None, True
+            response.raise_for_status()
+            
+            # HTML 파싱 및 텍스트 추출 (브라우저 추출과 같은 본문 선택 규칙)
+            text = extract_main_text_from_stream(
+                response.iter_content(STREAM_CHUNK_SIZE),
+                max_length,
+                max_bytes=STATIC_FETCH_MAX_BYTES,
+                encoding=charset_from_content_type(response.headers.get('Content-Type')),
+            )
+            return text, response.headers.get('ETag'), response.headers.get('Last-Modified'), False
+        finally:
+            response.close()
         
     except Exception as e:
         print(f"❌ Requests 내용 추출 중 오류: {e}")
-        return ""
+        return "", None, None, False
 
 
 def remove_duplicate_results(results):
-    """중복된 검색 결과 제거"""
+    """중복된 검색 결과 제거 (같은 URL + 본문이 거의 같은 다른 URL)"""
     seen_urls = set()
     unique_results = []
     
@@ -398,7 +560,8 @@ def remove_duplicate_results(results):
             seen_urls.add(url)
             unique_results.append(result)
     
-    return unique_results
+    # 재전송 기사처럼 URL만 다른 유사 본문은 정보량이 많은 쪽 하나만 유지
+    return dedupe_results(unique_results, field='content')
 
 
 def convert_video_to_mp4_and_upload(video_path, max_duration=8, fps=10, width=800):
@@ -420,6 +583,7 @@ def convert_video_to_mp4_and_upload(video_path, max_duration=8, fps=10, width=80
     
     try:
         import tempfile
+        from moviepy.editor import VideoFileClip
         
         print(f"🎬 MP4 → GIF 변환 시작: {video_path}")
         print(f"   설정: 최대 {max_duration}초, {fps}fps, 너비 {width}px")
@@ -589,6 +753,55 @@ def is_image_similar(img1, img2, threshold=0.8):
     return similarity >= threshold
 
 
+def _image_hash_similarity(hash1, hash2):
+    """is_image_similar와 같은 기준의 해시 유사도 (0~1)"""
+    return 1 - (hash1 - hash2) / len(hash1.hash) ** 2
+
+
+def download_image_capped(url, max_bytes=IMAGE_DOWNLOAD_MAX_BYTES, draft_size=IMAGE_DECODE_DRAFT_SIZE,
+                          cancel_event=None, timeout=10):
+    """
+    이미지 1장 다운로드 + 축소 디코딩
+    - Content-Length 또는 실제 수신량이 max_bytes를 넘으면 중단
+    - cancel_event가 설정되면 수신 도중 중단 (필요한 수량이 이미 모였을 때)
+    - JPEG은 PIL draft()로 draft_size 이상을 유지하는 1/2~1/8 배율로 바로 디코딩 (원본 전체 디코딩 생략)
+
+    Returns:
+        PIL.Image: RGB 이미지 (실패/초과/취소 시 None)
+    """
+    from io import BytesIO
+    from PIL import Image
+
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+    response = None
+    try:
+        response = get_http_session().get(url, timeout=timeout, stream=True)
+        response.raise_for_status()
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            print(f"⚠️ 이미지 용량 초과로 건너뜀 ({int(declared) / 1024 / 1024:.1f}MB): {url}")
+            return None
+        buffer = BytesIO()
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            buffer.write(chunk)
+            if buffer.tell() > max_bytes:
+                print(f"⚠️ 이미지 용량 초과로 중단 (>{max_bytes / 1024 / 1024:.0f}MB): {url}")
+                return None
+        buffer.seek(0)
+        img = Image.open(buffer)
+        if draft_size:
+            img.draft('RGB', draft_size)
+        return img.convert("RGB")
+    except Exception:
+        return None
+    finally:
+        if response is not None:
+            response.close()
+
+
 def count_text_characters_in_image(image):
     """이미지에서 텍스트 문자 수를 세는 함수"""
     # 간단한 구현 - 실제로는 OCR이 필요
@@ -663,52 +876,89 @@ def download_bing_images_for_sora(search_query, max_images=5, output_filename="b
 
     valid_imgs = []
     valid_info = []
+    accepted_hashes = []
 
-    for item in images_downloaded:
-        src = item["src"]
-        title = item["title"]
-        source = item.get("source", "unknown")
-
-        if src in used_image_urls:
-            print(f"⚠️ 중복 이미지 URL 건너뜀: {src}")
-            continue
-
-        try:
-            resp = requests.get(src, timeout=10)
-            img = Image.open(BytesIO(resp.content)).convert("RGB")
-        except Exception:
+    history = get_image_fingerprint_store()
+    candidates = []
+    for rank, item in enumerate(images_downloaded):
+        if item["src"] in used_image_urls:
+            print(f"⚠️ 중복 이미지 URL 건너뜀: {item['src']}")
             continue
-
-        if any(is_image_similar(img, used_img, threshold=0.8) for used_img in used_images):
-            print("⚠️ 이미지 자체 유사도 80% 이상 → 중복 처리됨")
+        if history is not None and history.contains_url(item["src"]):
+            print(f"⚠️ 이전 글에서 사용한 이미지 URL 건너뜀: {item['src']}")
             continue
+        used_image_urls.add(item["src"])
+        candidates.append((rank, item))
 
-        print("🔍 이미지 분석 중...")
-        count, raw_text = count_text_characters_in_image(img)
-
-        print("✅ 이미지 분석 완료")
-        caption = ''
-        print("📝 이미지 제목:", title)
-        print("📝 이미지 출처:", source)
-        print(f"📝 이미지 URL: {src}")
-
-        # Sora 모드: 모든 이미지를 수집 (주제 일치 검사 없음)
-        valid_imgs.append(img)
-        valid_info.append({
-            "img": img,
-            "url": src,
-            "title": title,
-            "caption": caption,
-            "match_result": {"result": "sora_mode", "reason": "Sora 모드로 자동 수집"},
-            "source": source
-        })
-        used_image_urls.add(src)
-        used_images.append(img)
-        print(f"✅ [{source}] Sora 모드로 이미지 추가됨: {title}")
+    # 후보 이미지를 동시에 다운로드하고, 먼저 도착한 유효 이미지부터 채택 (grid_num개가 모이면 나머지는 취소)
+    import imagehash
+    cancel_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(IMAGE_DOWNLOAD_WORKERS, len(candidates))),
+                                  thread_name_prefix="image-download")
+    futures = {executor.submit(download_image_capped, item["src"], cancel_event=cancel_event): (rank, item)
+               for rank, item in candidates}
+    started = time.monotonic()
+    try:
+        pending = set(futures)
+        while pending and len(valid_imgs) < grid_num:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if len(valid_imgs) >= grid_num:
+                    break
+                rank, item = futures[future]
+                img = future.result()
+                if img is None:
+                    continue
+                src = item["src"]
+                title = item["title"]
+                source = item.get("source", "unknown")
+
+                # 채택된 이미지 해시는 한 번만 계산해 두고 비교
+                img_hash = imagehash.average_hash(img)
+                if any(_image_hash_similarity(img_hash, used_hash) >= 0.8 for used_hash in accepted_hashes):
+                    print("⚠️ 이미지 자체 유사도 80% 이상 → 중복 처리됨")
+                    continue
+
+                # 이전 글에서 쓴 사진(다른 URL의 같은 스톡 사진 포함)이면 제외, 아니면 이력에 기록
+                if history is not None:
+                    accepted, previous = history.check_and_add(img, src, source=source, keyword=search_query)
+                    if not accepted:
+                        print(f"⚠️ 이전 글에서 사용한 이미지와 동일 (pHash 거리 {previous.get('distance')}) → 건너뜀")
+                        continue
+
+                print("🔍 이미지 분석 중...")
+                count, raw_text = count_text_characters_in_image(img)
+
+                print("✅ 이미지 분석 완료")
+                caption = ''
+                print("📝 이미지 제목:", title)
+                print("📝 이미지 출처:", source)
+                print(f"📝 이미지 URL: {src}")
+
+                # Sora 모드: 모든 이미지를 수집 (주제 일치 검사 없음)
+                valid_imgs.append(img)
+                valid_info.append({
+                    "img": img,
+                    "url": src,
+                    "title": title,
+                    "caption": caption,
+                    "match_result": {"result": "sora_mode", "reason": "Sora 모드로 자동 수집"},
+                    "source": source,
+                    "rank": rank
+                })
+                accepted_hashes.append(img_hash)
+                used_images.append(img)
+                print(f"✅ [{source}] Sora 모드로 이미지 추가됨: {title}")
 
         if len(valid_imgs) >= grid_num:
-            print("✅ Sora용 이미지 수량 충족 → 중단")
-            break
+            print(f"✅ Sora용 이미지 수량 충족 → 나머지 다운로드 취소 ({time.monotonic() - started:.1f}초)")
+    finally:
+        cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # 도착 순서와 관계없이 검색 순위 순으로 배치
+    valid_info.sort(key=lambda info: info["rank"])
+    valid_imgs = [info["img"] for info in valid_info]
 
     if not valid_info:
         print("❌ 수집된 이미지가 없습니다.")